@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Compare installer backends on real presets.
+
+Every available backend (or those given with --backends) installs the
+preset into its own fresh virtualenv; the per-phase timings of each run
+are printed side by side, fastest first. "link" compares venv
+materialization from the package store (core.materialize) as well.
+
+    PYTHONPATH=. python benchmarks/bench_installers.py lightweight
+    PYTHONPATH=. python benchmarks/bench_installers.py research --backends pip uv link
+    PYTHONPATH=. python benchmarks/bench_installers.py research --wheelhouse /nfs/wheels
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from missionimpossible.core.backends import PHASES, available_backends, get_backend
+from missionimpossible.core.installer import stack_requirements, venv_python
+from missionimpossible.core.materialize import materialize
+from missionimpossible.utils.preset_manager import get_preset
+
+
+def bench(preset: str, backends, wheelhouse=None):
+    requirements = stack_requirements(get_preset(preset))
+
+    results = []
+    for name in backends:
+        with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+            venv = Path(tmp) / "venv"
+            if name == "link":
+                result = materialize(requirements, str(venv), wheelhouse=wheelhouse)
+            else:
+                subprocess.check_call([sys.executable, "-m", "venv", str(venv)])
+                installer = get_backend(name)
+                with installer.wheelhouse_args(wheelhouse) as extra_args:
+                    result = installer.install(venv_python(venv), requirements, extra_args)
+        results.append(result)
+
+    print(f"\npreset {preset}: {len(requirements)} requirements")
+    print(f"{'backend':<8} {'status':<7} {'total':>8} " + " ".join(f"{p:>9}" for p in PHASES))
+    for result in sorted(results, key=lambda r: (r["returncode"] != 0, r["total"])):
+        phases = " ".join(
+            f"{'-' if s is None else f'{s:.1f}s':>9}" for s in result["phases"].values()
+        )
+        status = "ok" if result["returncode"] == 0 else "failed"
+        print(f"{result['backend']:<8} {status:<7} {result['total']:>7.1f}s {phases}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("preset")
+    parser.add_argument("--backends", nargs="+", default=None,
+                        help="backends to compare (default: all available)")
+    parser.add_argument("--wheelhouse", help="install offline from this wheelhouse")
+    args = parser.parse_args()
+    bench(args.preset, args.backends or available_backends(), args.wheelhouse)
+
+
+if __name__ == "__main__":
+    main()
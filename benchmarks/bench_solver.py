@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark the backtracking solver on preset-sized inputs.
+
+Synthetic mode builds an in-memory index shaped like our largest presets
+(N root packages, each with a fan-out of transitive requirements and many
+releases, some of them mutually incompatible) and times solve_stack.
+Live mode solves a real preset against the configured package index.
+
+    PYTHONPATH=. python benchmarks/bench_solver.py               # synthetic, default sizes
+    PYTHONPATH=. python benchmarks/bench_solver.py --roots 40 --releases 60
+    PYTHONPATH=. python benchmarks/bench_solver.py --live research
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from missionimpossible.resolvers.dependency_solver import (
+    BacktrackingSolver,
+    IndexProvider,
+    ResolutionTooDeep,
+    solve_stack,
+    spec_to_requirement,
+)
+
+
+class SyntheticProvider:
+    def __init__(self, roots: int, releases: int, fanout: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.libs = [f"lib{i}" for i in range(roots * fanout)]
+        self.index = {}
+        for name in self.libs:
+            self.index[name] = {f"{v}.0.0": [] for v in range(1, releases + 1)}
+        self.roots = [f"root{i}" for i in range(roots)]
+        for name in self.roots:
+            versions = {}
+            for v in range(1, releases + 1):
+                deps = []
+                for lib in rng.sample(self.libs, fanout):
+                    low = rng.randint(1, releases)
+                    deps.append(f"{lib}>={low}.0.0,<{min(releases, low + releases // 3) + 1}.0.0")
+                versions[f"{v}.0.0"] = deps
+            self.index[name] = versions
+
+    def get_versions(self, name):
+        return list(self.index[name])
+
+    def get_dependencies(self, name, version):
+        return self.index[name][version]
+
+
+def bench_synthetic(roots: int, releases: int, fanout: int, repeat: int) -> None:
+    provider = SyntheticProvider(roots, releases, fanout)
+    roots_reqs = [(spec_to_requirement(name, ">=1.0.0"), "preset:synthetic") for name in provider.roots]
+    timings = []
+    for _ in range(repeat):
+        solver = BacktrackingSolver(provider)
+        start = time.perf_counter()
+        try:
+            pins = solver.solve(roots_reqs)
+        except ResolutionTooDeep as exc:
+            print(f"synthetic roots={roots} releases={releases} fanout={fanout}: {exc} "
+                  f"after {time.perf_counter() - start:.2f} s")
+            return
+        timings.append(time.perf_counter() - start)
+    print(f"synthetic roots={roots} releases={releases} fanout={fanout}: "
+          f"{len(pins)} pins, {solver.rounds} rounds, "
+          f"best {min(timings) * 1000:.1f} ms / worst {max(timings) * 1000:.1f} ms")
+
+
+def bench_live(preset: str) -> None:
+    from missionimpossible.utils.preset_manager import get_preset
+
+    provider = IndexProvider()
+    start = time.perf_counter()
+    pins = solve_stack([(f"preset:{preset}", get_preset(preset))], provider=provider)
+    elapsed = time.perf_counter() - start
+    print(f"live preset={preset}: {len(pins)} pins in {elapsed:.2f} s")
+    if provider.missing_metadata:
+        print(f"  no dependency metadata for: {', '.join(provider.missing_metadata)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roots", type=int, default=12, help="root requirements (research preset: 12)")
+    parser.add_argument("--releases", type=int, default=40)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live", metavar="PRESET")
+    args = parser.parse_args()
+    if args.live:
+        bench_live(args.live)
+    else:
+        bench_synthetic(args.roots, args.releases, args.fanout, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
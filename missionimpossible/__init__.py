@@ -1,16 +1,29 @@
 """
 MissionImPossible - Universal ML Dependency Resolver
 Dynamic YOLOv8/v10/v11 + CNN/NLP stack resolution.
+
+The public functions are loaded lazily on first access, so importing the
+package (e.g. for the CLI) does not pull in requests, packaging or the
+detectors.
 """
 
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "0.1.0"
 
-from .core.detector import detect_all_conflicts
-from .core.resolver import resolve_universal_stack
-from .core.installer import install_stack, validate_environment
-from .resolvers.yolo_resolver import resolve_yolo_stack
+# public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "detect_all_conflicts": ".core.detector",
+    "resolve_universal_stack": ".core.resolver",
+    "install_stack": ".core.installer",
+    "validate_environment": ".core.installer",
+    "resolve_yolo_stack": ".resolvers.yolo_resolver",
+    "ResolutionContext": ".resolvers.context",
+    "resolve_matrix": ".core.matrix",
+}
 
 __all__ = [
     "detect_all_conflicts",
@@ -18,4 +31,26 @@ __all__ = [
     "install_stack",
     "validate_environment",
     "resolve_yolo_stack",
+    "ResolutionContext",
+    "resolve_matrix",
 ]
+
+if TYPE_CHECKING:
+    from .core.detector import detect_all_conflicts
+    from .core.resolver import resolve_universal_stack
+    from .core.installer import install_stack, validate_environment
+    from .resolvers.yolo_resolver import resolve_yolo_stack
+    from .resolvers.context import ResolutionContext
+    from .core.matrix import resolve_matrix
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+MissionImPossible CLI - One command ML environments
+
+Only argparse is imported up front; each action imports the subsystems it
+needs, so `missionimpossible --help` stays fast.
+"""
+import argparse
+import sys
+
+def main():
+    parser = argparse.ArgumentParser(description="MissionImPossible ML Resolver")
+    parser.add_argument("action", choices=["detect", "resolve", "install", "fix", "prefetch",
+                                             "profile-imports", "footprint", "daemon"])
+    parser.add_argument("--preset", default="research",
+                       help="preset name (bundled: research, production, lightweight; "
+                            "more from $MISSIONIMPOSSIBLE_PRESETS and the user config dir)")
+    parser.add_argument("--yolo", default="latest", 
+                       choices=["latest", "v8", "v10", "v11"])
+    parser.add_argument("--gpu", action="store_true")
+    parser.add_argument("--framework", choices=["auto", "tensorflow", "pytorch"])
+    parser.add_argument("--import-frameworks", action="store_true",
+                       help="import TensorFlow/PyTorch in-process for GPU detection")
+    parser.add_argument("--no-daemon", action="store_true",
+                       help="detect in-process even if a `missionimpossible daemon` is running")
+    parser.add_argument("--offline", action="store_true",
+                       help="serve PyPI metadata only from the local cache")
+    parser.add_argument("--solve", action="store_true",
+                       help="solve all constraints (incl. transitive) into one pinned set")
+    parser.add_argument("--matrix", metavar="SPEC",
+                       help="resolve many combinations: JSON grid/list inline, a file, "
+                            "or '-' for stdin; prints one JSON line per combination")
+    parser.add_argument("--lock", nargs="?", const="missionimpossible.lock.json", metavar="FILE",
+                       help="resolve: also write a hash-pinned lockfile of the full closure "
+                            "(default file: missionimpossible.lock.json)")
+    parser.add_argument("--lock-target", action="append", default=[], metavar="PY:PLATFORM",
+                       help="lock an extra environment too, e.g. 3.10:manylinux2014_x86_64 "
+                            "(repeatable)")
+    parser.add_argument("--dockerfile", nargs="?", const="Dockerfile", metavar="PATH",
+                       help="resolve: also write a layered, BuildKit-cached Dockerfile "
+                            "for the stack (default path: Dockerfile)")
+    parser.add_argument("--from-lock", metavar="FILE",
+                       help="install: install exactly the locked files, skipping resolution")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="ignore memoized resolutions and resolve from scratch")
+    parser.add_argument("--index-url",
+                       help="Simple API index to query (default: https://pypi.org/simple)")
+    parser.add_argument("--wheelhouse",
+                       help="wheel store for prefetch / offline install "
+                            "(prefetch default: $MISSIONIMPOSSIBLE_WHEELHOUSE or the cache)")
+    parser.add_argument("--max-size",
+                       help="wheelhouse size limit for prefetch, e.g. 50G")
+    parser.add_argument("--installer", default=None,
+                       help="installer backend: auto (default), pip, uv")
+    parser.add_argument("--venv",
+                       help="install into this virtualenv (created if missing)")
+    parser.add_argument("--link", action="store_true",
+                       help="with --venv: hardlink packages from the local store instead of installing")
+    parser.add_argument("--format", default="text", choices=["text", "json", "trace"],
+                       help="profile-imports / footprint output: table, JSON "
+                            "or Chrome trace (profile-imports only)")
+    parser.add_argument("--output", help="write the profile-imports / footprint report to this file")
+    
+    args = parser.parse_args()
+    if args.matrix and (args.lock or args.dockerfile):
+        parser.error("--lock and --dockerfile take a single stack; they cannot be combined with --matrix")
+
+    if args.offline or args.index_url:
+        from missionimpossible.utils import pypi_api
+        if args.offline:
+            pypi_api.set_offline(True)
+        if args.index_url:
+            pypi_api.set_index_url(args.index_url)
+    
+    if args.action not in ("detect", "fix", "daemon") and not args.from_lock:
+        from missionimpossible.utils.preset_manager import list_presets
+        available = list_presets()
+        if args.preset not in available:
+            parser.error(f"unknown preset {args.preset!r}; available: {', '.join(sorted(available))}")
+
+    if args.action == "daemon":
+        if args.import_frameworks:
+            parser.error("the daemon serves the static GPU probe; --import-frameworks is per call")
+        from missionimpossible.core.daemon import run_daemon
+        try:
+            run_daemon()
+        except RuntimeError as exc:
+            print(f"[MissionImPossible] {exc}", file=sys.stderr)
+            sys.exit(1)
+    elif args.action == "detect":
+        diagnostics = _daemon_diagnostics(args)
+        if diagnostics is None:
+            from missionimpossible import detect_all_conflicts
+            diagnostics = detect_all_conflicts(import_frameworks=args.import_frameworks)
+        print(diagnostics)
+    elif args.action == "resolve" and args.matrix:
+        import json
+        from missionimpossible import resolve_matrix
+        if args.matrix == "-":
+            spec = json.load(sys.stdin)
+        elif args.matrix.lstrip()[:1] in ("{", "["):
+            spec = json.loads(args.matrix)
+        else:
+            with open(args.matrix, encoding="utf-8") as f:
+                spec = json.load(f)
+        failed = False
+        for line in resolve_matrix(spec, solve=args.solve, use_cache=not args.no_cache,
+                                   context=_daemon_context(args)):
+            if line["status"] == "ok":
+                line["result"].pop("diagnostics", None)  # identical for every line
+            failed = failed or line["status"] != "ok"
+            print(json.dumps(line), flush=True)
+        if failed:
+            sys.exit(1)
+    elif args.action == "resolve":
+        result = _resolve_stack(args, framework=args.framework, solve=args.solve)
+        print(result["install_command"])
+        if args.dockerfile:
+            from missionimpossible.utils.environment import write_dockerfile
+            path = write_dockerfile(result.get("pinned", result["preset"]), args.dockerfile)
+            print(f"[MissionImPossible] Wrote {path}")
+        if args.lock:
+            from missionimpossible.core.lockfile import lock_stack, parse_target, write_lockfile
+            try:
+                targets = [parse_target(t) for t in args.lock_target]
+            except ValueError as exc:
+                parser.error(str(exc))
+            try:
+                lock = lock_stack(result.get("pinned", result["preset"]), targets=targets)
+            except RuntimeError as exc:
+                print(f"[MissionImPossible] {exc}", file=sys.stderr)
+                sys.exit(1)
+            path = write_lockfile(lock, args.lock)
+            counts = ", ".join(
+                f"{env['implementation']}{env['python_version']}-{env['platform']}: "
+                f"{len(env['packages'])} packages"
+                for env in lock["environments"]
+            )
+            print(f"[MissionImPossible] Wrote {path} ({counts})")
+    elif args.action == "install" and args.from_lock:
+        from missionimpossible.core.lockfile import install_lock, read_lockfile
+        install_lock(
+            read_lockfile(args.from_lock),
+            use_venv=bool(args.venv),
+            venv_path=args.venv or ".missionimpossible-env",
+            wheelhouse=args.wheelhouse,
+            backend=args.installer,
+            link=args.link,
+        )
+    elif args.action == "install":
+        from missionimpossible import install_stack
+        stack = _resolve_stack(args)
+        install_stack(
+            stack["preset"],
+            use_venv=bool(args.venv),
+            venv_path=args.venv or ".missionimpossible-env",
+            wheelhouse=args.wheelhouse,
+            backend=args.installer,
+            link=args.link,
+        )
+    elif args.action == "prefetch":
+        from missionimpossible.core.installer import stack_requirements
+        from missionimpossible.core.wheelhouse import parse_size, prefetch
+        result = _resolve_stack(args, framework=args.framework, solve=args.solve)
+        stack = result.get("pinned", result["preset"])
+        fetched = prefetch(
+            stack_requirements(stack),
+            root=args.wheelhouse,
+            max_size=parse_size(args.max_size) if args.max_size else None,
+        )
+        print(f"[MissionImPossible] {len(fetched['files'])} files in wheelhouse, "
+              f"{fetched['downloaded']} downloaded, {len(fetched['evicted'])} evicted")
+    elif args.action == "profile-imports":
+        import json
+        from missionimpossible.core.import_profile import (
+            format_report, profile_imports, to_chrome_trace,
+        )
+        result = _resolve_stack(args, framework=args.framework)
+        report = profile_imports(list(result["preset"]))
+        if args.format == "json":
+            text = json.dumps(report, indent=2)
+        elif args.format == "trace":
+            text = json.dumps(to_chrome_trace(report))
+        else:
+            text = format_report(report)
+        _emit(text, args.output)
+    elif args.action == "footprint":
+        import json
+        from missionimpossible.core.footprint import format_footprint
+        if args.format == "trace":
+            parser.error("footprint supports --format text or json")
+        result = _resolve_stack(args, framework=args.framework, solve=args.solve, footprint=True)
+        report = result["footprint"]
+        _emit(json.dumps(report, indent=2) if args.format == "json" else format_footprint(report),
+              args.output)
+
+
+def _resolve_stack(args, **kwargs):
+    """
+    resolve_universal_stack() for the preset / YOLO / GPU options of this call.
+
+    A stack that cannot be resolved (ResolutionImpossible, e.g. no GPU
+    build fits the driver) is reported and exits with status 1.
+    """
+    from missionimpossible import resolve_universal_stack
+    from missionimpossible.resolvers.dependency_solver import ResolutionImpossible
+    try:
+        return resolve_universal_stack(args.preset, args.yolo, args.gpu,
+                                       use_cache=not args.no_cache, context=_daemon_context(args),
+                                       **kwargs)
+    except ResolutionImpossible as exc:
+        print(f"[MissionImPossible] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _daemon_diagnostics(args):
+    """detect_all_conflicts() result of a running daemon, or None to detect in-process."""
+    if args.no_daemon or args.import_frameworks:
+        return None
+    from missionimpossible.core.daemon import query_daemon
+    reply = query_daemon("detect")
+    return reply["result"] if reply else None
+
+
+def _daemon_context(args):
+    """A ResolutionContext pre-filled from the daemon, or None (resolvers create their own)."""
+    diagnostics = _daemon_diagnostics(args)
+    if diagnostics is None:
+        return None
+    from missionimpossible import ResolutionContext
+    return ResolutionContext(diagnostics=diagnostics)
+
+
+def _emit(text, output=None):
+    """Print a report, or write it to ``output``."""
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Import check run *inside* the target interpreter (see installer.check_imports
+and import_profile.profile_imports).
+
+Executed by path, so it must only use the standard library and must not
+import missionimpossible (the target venv usually does not have it):
+
+    python _import_probe.py '{"packages": ["scikit-learn", "opencv-python"], "skip": []}'
+
+Module names come from each distribution's top_level.txt, or from the
+top-level entries of its RECORD. One JSON line per event is written to
+the original stdout; anything the imported modules print goes to stderr.
+
+    {"event": "start", "package": ..., "module": ...}
+    {"event": "result", "package": ..., "module": ..., "ok": bool, "error": str|null, "seconds": float}
+    {"event": "missing", "package": ..., "error": str}
+
+A distribution without importable modules gets one result with module null.
+
+A "start" without its "result" means the import took the process down.
+
+With "profile": true in the request, results also carry "rss_before" /
+"rss_after" (bytes, null if unknown) and every import is bracketed by
+IMPORT_BEGIN / IMPORT_END lines on stderr, so ``-X importtime`` output
+can be attributed to it.
+"""
+
+import json
+import os
+import sys
+import time
+from importlib import metadata
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+IMPORT_BEGIN = "--missionimpossible-import-begin--"
+IMPORT_END = "--missionimpossible-import-end--"
+_EXTENSION_SUFFIXES = (".so", ".pyd")
+_SKIPPED_DIRS = (".dist-info", ".egg-info", ".data")
+
+
+def _from_record(dist):
+    names = set()
+    for path in dist.files or []:
+        parts = path.parts
+        if not parts or parts[0] in ("..", "__pycache__") or parts[0].endswith(_SKIPPED_DIRS):
+            continue
+        if len(parts) > 1:
+            names.add(parts[0])
+        elif parts[0].endswith(".py"):
+            names.add(parts[0][:-3])
+        elif parts[0].endswith(_EXTENSION_SUFFIXES):
+            names.add(parts[0].split(".")[0])
+    return names
+
+
+def module_names(dist):
+    """Importable top-level modules of a distribution: the one named like it first, then public ones."""
+    text = dist.read_text("top_level.txt")
+    if text:
+        names = {line.strip().replace("/", ".") for line in text.splitlines() if line.strip()}
+    else:
+        names = _from_record(dist)
+    own = dist.metadata["Name"].lower().replace("-", "_")
+    names = sorted(n for n in names if n.split(".")[0].isidentifier())
+    public = [n for n in names if not n.startswith("_")] or names
+    return sorted(public, key=lambda n: n.lower() != own)
+
+
+def rss():
+    """Resident set size in bytes (peak RSS where the current one is unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def main():
+    # running by path put this directory first on sys.path, where its
+    # siblings would shadow installed modules
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+        del sys.path[0]
+    request = json.loads(sys.argv[1])
+    skip = set(request.get("skip", []))
+    profile = request.get("profile", False)
+
+    report = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)  # keep module output (including C level) off the report
+    sys.stdout = sys.stderr
+
+    def emit(**event):
+        report.write(json.dumps(event) + "\n")
+        report.flush()
+
+    for package in request["packages"]:
+        try:
+            dist = metadata.distribution(package)
+        except metadata.PackageNotFoundError:
+            emit(event="missing", package=package, error="distribution not installed")
+            continue
+        modules = module_names(dist)
+        if not modules:
+            emit(event="result", package=package, module=None, ok=True, error=None, seconds=0.0)
+        for module in modules:
+            if module in skip:
+                continue
+            emit(event="start", package=package, module=module)
+            extra = {}
+            if profile:
+                extra["rss_before"] = rss()
+                sys.stderr.write(IMPORT_BEGIN + "\n")
+                sys.stderr.flush()
+            start = time.perf_counter()
+            error = None
+            try:
+                # __import__ (unlike importlib.import_module) goes through the
+                # C import path, which is what -X importtime measures
+                __import__(module)
+            except (Exception, SystemExit) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            seconds = time.perf_counter() - start
+            if profile:
+                sys.stderr.flush()
+                sys.stderr.write(IMPORT_END + "\n")
+                sys.stderr.flush()
+                extra["rss_after"] = rss()
+            emit(event="result", package=package, module=module, ok=error is None,
+                 error=error, seconds=seconds, **extra)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Installer backends for MissionImPossible.
+
+A backend turns (interpreter, requirements) into an install and reports
+how long each phase took, in the same structure for every backend:
+
+    {"backend", "returncode", "command", "total",
+     "phases": {"resolve", "download", "build", "install"}}
+
+Phase times are in seconds; None means the backend does not report that
+phase separately (uv counts builds as part of "Prepared", i.e. download).
+
+- pip: ``python -m pip install --log FILE``; phases come from the
+  timestamps of the log lines.
+- uv:  ``uv pip install --python EXE``; phases come from its summary
+  lines ("Resolved 12 packages in 1.20s", ...).
+
+Offline installs from the wheelhouse go through wheelhouse_args(), as
+each installer reads --find-links differently: pip gets a generated HTML
+page, uv (which only takes directories and URLs) a flat directory of
+links to the stored files.
+
+"auto" picks uv when it is on PATH and pip otherwise;
+$MISSIONIMPOSSIBLE_INSTALLER overrides the choice. Further backends can
+be added with register_backend().
+"""
+
+from __future__ import annotations
+
+import abc
+import contextlib
+import inspect
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+PHASES = ("resolve", "download", "build", "install")
+
+# pip log message prefixes that start a phase (checked in order)
+_PIP_MARKERS: List[Tuple[str, Optional[str]]] = [
+    ("Successfully installed", None),
+    ("Installing collected packages", "install"),
+    ("Installing build dependencies", "build"),
+    ("Getting requirements to build", "build"),
+    ("Preparing metadata", "build"),
+    ("Building wheel", "build"),
+    ("Running setup.py", "build"),
+    ("Downloading ", "download"),
+    ("Using cached ", "download"),
+    ("Processing ", "download"),
+    ("Obtaining ", "download"),
+    ("Collecting ", "resolve"),
+    ("Requirement already satisfied", "resolve"),
+]
+_PIP_LOG_RE = re.compile(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d,\d{3}) (.*)$")
+
+_UV_SUMMARY = {
+    "Resolved": "resolve",
+    "Prepared": "download",
+    "Uninstalled": "install",
+    "Installed": "install",
+}
+_UV_LINE_RE = re.compile(r"^(\w+) \d+ packages? in (.+?)\s*$")
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _empty_phases() -> Dict[str, Optional[float]]:
+    return {phase: None for phase in PHASES}
+
+
+def _add(phases: Dict[str, Optional[float]], phase: str, seconds: float) -> None:
+    phases[phase] = (phases[phase] or 0.0) + seconds
+
+
+def parse_pip_log(text: str) -> Dict[str, Optional[float]]:
+    """
+    Split a ``pip install --log`` file into phase durations.
+
+    Time between two timestamped lines is charged to the phase the first
+    of them belongs to; a phase lasts until the next line that starts
+    another phase ("Collecting", "Downloading", "Building wheel", ...).
+    """
+    phases = _empty_phases()
+    current: Optional[str] = "resolve"
+    previous: Optional[datetime] = None
+    for line in text.splitlines():
+        match = _PIP_LOG_RE.match(line)
+        if not match:
+            continue
+        stamp = datetime.strptime(match.group(1), "%Y-%m-%dT%H:%M:%S,%f")
+        if previous is not None and current is not None:
+            _add(phases, current, (stamp - previous).total_seconds())
+        message = match.group(2).strip()
+        for prefix, phase in _PIP_MARKERS:
+            if message.startswith(prefix):
+                current = phase
+                break
+        previous = stamp
+    return phases
+
+
+def parse_duration(text: str) -> float:
+    """Parse uv durations such as "120ms", "1.52s" or "1m 05s" into seconds."""
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in _DURATION_RE.findall(text))
+
+
+def parse_uv_output(text: str) -> Dict[str, Optional[float]]:
+    """Read phase durations from the summary lines of ``uv pip install``."""
+    phases = _empty_phases()
+    for line in text.splitlines():
+        match = _UV_LINE_RE.match(line.strip())
+        if match and match.group(1) in _UV_SUMMARY:
+            _add(phases, _UV_SUMMARY[match.group(1)], parse_duration(match.group(2)))
+    return phases
+
+
+def _run_teed(cmd: List[str]) -> Tuple[int, str]:
+    """Run ``cmd`` streaming its output to the console; returns (code, stderr)."""
+    proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    captured = []
+    for line in proc.stderr:
+        sys.stderr.write(line)
+        captured.append(line)
+    return proc.wait(), "".join(captured)
+
+
+class InstallerBackend(abc.ABC):
+    """
+    Base class of installer backends.
+
+    Subclasses must implement ``available()`` and ``command()`` and may
+    override ``parse_phases()``; ``install()`` runs the command and builds
+    the common result.
+    """
+
+    name = "base"
+
+    @classmethod
+    @abc.abstractmethod
+    def available(cls) -> bool:
+        """Whether the backend can run on this machine."""
+
+    @abc.abstractmethod
+    def command(
+        self,
+        python_exe: str,
+        requirements: List[str],
+        extra_args: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Command line installing ``requirements`` into ``python_exe``."""
+
+    def install(
+        self,
+        python_exe: str,
+        requirements: List[str],
+        extra_args: Optional[List[str]] = None,
+    ) -> dict:
+        """
+        Install ``requirements`` into the interpreter ``python_exe``.
+
+        Parameters
+        ----------
+        python_exe : str
+            Target interpreter (e.g. the python of a venv).
+        requirements : list of str
+            Requirement strings.
+        extra_args : list of str, optional
+            Installer options, e.g. ["--no-deps"] or those of
+            wheelhouse_args().
+
+        Returns
+        -------
+        dict : {"backend", "returncode", "command", "total", "phases"}
+        """
+        cmd = self.command(python_exe, requirements, extra_args)
+        start = time.perf_counter()
+        code, phases = self._execute(cmd)
+        return {
+            "backend": self.name,
+            "returncode": code,
+            "command": cmd,
+            "total": time.perf_counter() - start,
+            "phases": phases,
+        }
+
+    @contextlib.contextmanager
+    def wheelhouse_args(self, root: Optional[str]) -> Iterator[List[str]]:
+        """
+        Options installing only from the wheelhouse ``root`` (no index).
+
+        The options are valid inside the ``with`` block; files created for
+        them are removed afterwards. Yields [] when ``root`` is None.
+        """
+        if not root:
+            yield []
+            return
+        from .wheelhouse import find_links_page
+        page = find_links_page(Path(root))
+        try:
+            yield ["--no-index", "--find-links", str(page)]
+        finally:
+            page.unlink()
+
+    def _execute(self, cmd: List[str]) -> Tuple[int, Dict[str, Optional[float]]]:
+        code, output = _run_teed(cmd)
+        return code, self.parse_phases(output)
+
+    def parse_phases(self, output: str) -> Dict[str, Optional[float]]:
+        return _empty_phases()
+
+
+class PipBackend(InstallerBackend):
+    """``python -m pip install`` (always available)."""
+
+    name = "pip"
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def command(self, python_exe, requirements, extra_args=None):
+        return [python_exe, "-m", "pip", "install"] + list(extra_args or []) + list(requirements)
+
+    def _execute(self, cmd):
+        fd, log = tempfile.mkstemp(prefix="missionimpossible-pip-", suffix=".log")
+        os.close(fd)
+        try:
+            code = subprocess.call(cmd + ["--log", log])
+            with open(log, encoding="utf-8", errors="replace") as f:
+                return code, parse_pip_log(f.read())
+        finally:
+            os.unlink(log)
+
+
+class UvBackend(InstallerBackend):
+    """``uv pip install`` when the uv binary is on PATH."""
+
+    name = "uv"
+
+    @classmethod
+    def available(cls) -> bool:
+        return shutil.which("uv") is not None
+
+    def command(self, python_exe, requirements, extra_args=None):
+        return (
+            [shutil.which("uv") or "uv", "pip", "install", "--python", python_exe]
+            + list(extra_args or []) + list(requirements)
+        )
+
+    @contextlib.contextmanager
+    def wheelhouse_args(self, root):
+        if not root:
+            yield []
+            return
+        from .wheelhouse import find_links_dir
+        flat = find_links_dir(Path(root))
+        try:
+            yield ["--no-index", "--find-links", str(flat)]
+        finally:
+            shutil.rmtree(flat, ignore_errors=True)
+
+    def parse_phases(self, output):
+        return parse_uv_output(output)
+
+
+# name -> backend class; "auto" prefers the first available in this order
+BACKENDS: Dict[str, Type[InstallerBackend]] = {
+    "uv": UvBackend,
+    "pip": PipBackend,
+}
+
+
+def register_backend(backend: Type[InstallerBackend]) -> None:
+    """Make ``backend`` selectable by its ``name``."""
+    if inspect.isabstract(backend):
+        missing = ", ".join(sorted(backend.__abstractmethods__))
+        raise TypeError(f"installer backend {backend.name!r} does not implement {missing}")
+    BACKENDS[backend.name] = backend
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def get_backend(name: Optional[str] = None) -> InstallerBackend:
+    """
+    Return an installer backend instance.
+
+    Parameters
+    ----------
+    name : str, optional
+        "pip", "uv", another registered name, or "auto" (default, also
+        taken from $MISSIONIMPOSSIBLE_INSTALLER).
+    """
+    name = name or os.environ.get("MISSIONIMPOSSIBLE_INSTALLER") or "auto"
+    if name == "auto":
+        name = (available_backends() or ["pip"])[0]
+    if name not in BACKENDS:
+        raise ValueError(f"unknown installer backend {name!r}; choose from {sorted(BACKENDS)}")
+    backend = BACKENDS[name]
+    if not backend.available():
+        raise RuntimeError(f"installer backend {name!r} is not available here")
+    return backend()
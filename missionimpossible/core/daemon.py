@@ -0,0 +1,450 @@
+"""
+Detection daemon: keeps detect_all_conflicts() hot and serves it over a
+Unix socket.
+
+``missionimpossible daemon`` runs one detection pass, then watches what
+the diagnostics depend on and runs again only when it changes:
+
+- the top level of every library directory on ``sys.path`` (with inotify
+  on Linux):
+  installing, upgrading or removing a distribution always adds or removes
+  its ``*.dist-info`` / ``*.egg-info`` entry there, which is all the
+  metadata index reads,
+- the NVIDIA device nodes (``/dev/nvidia*``, inotify) and the driver
+  version in ``/proc/driver/nvidia``, which procfs cannot report through
+  inotify and is therefore polled.
+
+Without inotify (other platforms, or no watches left) the directories are
+polled too; every poll is a handful of stat() calls. Events are debounced
+until the environment is quiet, so a ``pip install`` triggers one pass.
+
+Clients send one JSON line ({"op": "detect"}, {"op": "status"} or
+{"op": "stop"}) and read one JSON line back. The detect reply is encoded
+once per pass, so answering is a socket write. While a pass triggered by
+a change is running, detect requests wait for it (up to MAX_WAIT) rather
+than get the outdated result; after that the reply is {"status": "busy"}
+and clients detect locally.
+
+The socket is private to the user and keyed by the interpreter, its
+library directories and ``CUDA_VISIBLE_DEVICES``, so query_daemon() only
+reaches a daemon that sees the same installed distributions and GPUs.
+The first ``sys.path`` entry (the script directory, or the working
+directory under ``python -m`` / ``-c``) is not part of the key, so the
+CLI finds the daemon from whatever directory a job starts in.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import glob
+import hashlib
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..detectors.gpu_detector import NVIDIA_PROC_DIR
+from ..utils.cache import cache_dir
+from ..utils.metadata import _INFO_SUFFIXES
+
+# Seconds between polls of the driver state (and of the directories
+# when inotify is not available).
+POLL_INTERVAL = 5.0
+# Quiet period after a change before the diagnostics are recomputed.
+SETTLE_DELAY = 0.5
+# Longest a detect request waits for a running pass (client timeout is longer).
+MAX_WAIT = 45.0
+CLIENT_TIMEOUT = MAX_WAIT + 5.0
+_MAX_REQUEST = 4096
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+_DIR_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+             | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_DEV_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+DEV_DIR = Path("/dev")
+
+
+def library_paths() -> List[str]:
+    """``sys.path`` without its script / working directory entry, as absolute paths."""
+    paths = sys.path if getattr(sys.flags, "safe_path", False) else sys.path[1:]
+    return [os.path.abspath(p) for p in paths if p]
+
+
+def socket_path() -> Path:
+    """
+    Socket of the daemon serving this interpreter.
+
+    $MISSIONIMPOSSIBLE_DAEMON_SOCKET overrides the default, a file in the
+    cache dir named after the interpreter, library_paths() and
+    CUDA_VISIBLE_DEVICES (the inputs a detection pass depends on).
+    """
+    override = os.environ.get("MISSIONIMPOSSIBLE_DAEMON_SOCKET")
+    if override:
+        return Path(override)
+    ident = "\0".join(
+        [sys.executable, repr(os.environ.get("CUDA_VISIBLE_DEVICES"))]
+        + library_paths()
+    )
+    return cache_dir("daemon") / f"{hashlib.sha256(ident.encode('utf-8')).hexdigest()[:16]}.sock"
+
+
+def query_daemon(op: str = "detect", path: Optional[Path] = None,
+                 timeout: float = CLIENT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to a running daemon.
+
+    Returns
+    -------
+    dict or None : the reply ({"status": "ok", ...}), or None when no
+        daemon is listening or it could not answer; callers then fall
+        back to detecting locally.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = Path(path or socket_path())
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({"op": op}).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                data = sock.recv(1 << 16)
+                if not data:
+                    break
+                chunks.append(data)
+        reply = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) and reply.get("status") == "ok" else None
+
+
+class _Inotify:
+    """Minimal ctypes binding to inotify(7)."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch {path}: {os.strerror(ctypes.get_errno())}")
+        return wd
+
+    def read_events(self) -> List[tuple]:
+        """Pending (wd, mask, name) events."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, size = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = buf[offset:offset + size].rstrip(b"\0").decode("utf-8", "replace")
+                offset += size
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _stat(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_mtime_ns]
+
+
+def _read_driver_version() -> Optional[str]:
+    try:
+        return (NVIDIA_PROC_DIR / "version").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+
+class EnvironmentWatcher:
+    """
+    Reports changes of the installed distributions and the NVIDIA driver state.
+
+    Parameters
+    ----------
+    paths : list of str, optional
+        Directories whose entries are watched (default: library_paths()).
+    use_inotify : bool
+        Use inotify where available; False polls everything.
+    """
+
+    def __init__(self, paths: Optional[List[str]] = None, use_inotify: bool = True):
+        self.paths = library_paths() if paths is None else [os.path.abspath(p or ".") for p in paths]
+        self._inotify: Optional[_Inotify] = None
+        self._dev_wd: Optional[int] = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                for path in self.paths:
+                    if os.path.isdir(path):
+                        self._inotify.add_watch(path, _DIR_MASK)
+            except (OSError, AttributeError):  # no inotify, or out of watches
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+        if self._inotify is not None and DEV_DIR.is_dir():
+            try:
+                self._dev_wd = self._inotify.add_watch(str(DEV_DIR), _DEV_MASK)
+            except OSError:  # e.g. a read-only /dev in containers; nodes are polled
+                pass
+        self.mode = "inotify" if self._inotify is not None else "poll"
+        self._signature = self.signature()
+
+    def signature(self) -> List[Any]:
+        """What polling compares: driver state, and the directories when not on inotify."""
+        state: List[Any] = [_read_driver_version()]
+        if self._dev_wd is None:
+            state.append(sorted(glob.glob(str(DEV_DIR / "nvidia*"))))
+        if self._inotify is None:
+            state.extend(_stat(path) for path in self.paths)
+        return state
+
+    def _relevant(self, events: List[tuple]) -> bool:
+        for wd, mask, name in events:
+            if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                return True
+            if wd == self._dev_wd:
+                if name.startswith("nvidia"):
+                    return True
+            elif name.endswith(_INFO_SUFFIXES):  # other files do not affect the diagnostics
+                return True
+        return False
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds; True if something changed."""
+        deadline = time.monotonic() + timeout
+        changed = False
+        if self._inotify is not None:
+            while not changed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                ready, _, _ = select.select([self._inotify.fd], [], [], remaining)
+                if ready:
+                    changed = self._relevant(self._inotify.read_events())
+        else:
+            time.sleep(max(0.0, timeout))
+        signature = self.signature()
+        if signature != self._signature:
+            self._signature = signature
+            changed = True
+        return changed
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline(_MAX_REQUEST) or b"{}")
+            op = request.get("op", "detect")
+        except (ValueError, AttributeError):
+            op = None
+        self.wfile.write(self.server.owner.reply(op))
+        if op == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DetectionDaemon:
+    """
+    Serves detect_all_conflicts() from memory, recomputing it on change.
+
+    Parameters
+    ----------
+    path : Path, optional
+        Socket to listen on (default: socket_path()).
+    detect : callable, optional
+        Computes the diagnostics (default: detect_all_conflicts()).
+    watcher : EnvironmentWatcher, optional
+        Change source (default: one over ``sys.path``).
+    poll_interval, settle : float
+        See POLL_INTERVAL and SETTLE_DELAY.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        detect: Optional[Callable[[], dict]] = None,
+        watcher: Optional[EnvironmentWatcher] = None,
+        poll_interval: float = POLL_INTERVAL,
+        settle: float = SETTLE_DELAY,
+    ):
+        if detect is None:
+            from .detector import detect_all_conflicts
+            detect = detect_all_conflicts
+        self.path = Path(path or socket_path())
+        self.detect = detect
+        self.watcher = watcher or EnvironmentWatcher()
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.generation = 0
+        self.computed_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self._payload = b""
+        self._stale = True
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._server: Optional[_Server] = None
+        self._watcher_thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        """Run one detection pass and publish its result."""
+        start = time.perf_counter()
+        result = self.detect()
+        duration = time.perf_counter() - start
+        with self._cond:
+            self.generation += 1
+            self.computed_at = time.time()
+            self.duration = duration
+            self._payload = json.dumps({
+                "status": "ok",
+                "generation": self.generation,
+                "computed_at": self.computed_at,
+                "result": result,
+            }, default=str).encode("utf-8") + b"\n"
+            self._stale = False
+            self._cond.notify_all()
+
+    def reply(self, op: Optional[str]) -> bytes:
+        """Encoded reply to a request."""
+        if op == "detect":
+            with self._cond:
+                if self._cond.wait_for(lambda: not self._stale, timeout=MAX_WAIT):
+                    return self._payload
+            return b'{"status": "busy"}\n'
+        if op in ("status", "stop"):
+            with self._cond:
+                status = {
+                    "status": "ok", "pid": os.getpid(), "watch": self.watcher.mode,
+                    "generation": self.generation, "computed_at": self.computed_at,
+                    "duration": self.duration, "stale": self._stale,
+                }
+            return json.dumps(status).encode("utf-8") + b"\n"
+        return json.dumps({"status": "error", "error": f"unknown op {op!r}"}).encode("utf-8") + b"\n"
+
+    def _watch(self) -> None:
+        while not self._stopped.is_set():
+            if not self.watcher.wait(self.poll_interval):
+                continue
+            with self._cond:
+                self._stale = True
+            # let an install finish before looking at the environment
+            while not self._stopped.is_set() and self.watcher.wait(self.settle):
+                pass
+            if not self._stopped.is_set():
+                try:
+                    self.refresh()
+                except Exception as exc:  # keep serving; retried on the next change
+                    print(f"[MissionImPossible] detection failed: {type(exc).__name__}: {exc}",
+                          file=sys.stderr)
+
+    def _bind(self) -> _Server:
+        if query_daemon("status", self.path, timeout=1.0) is not None:
+            raise RuntimeError(f"a daemon is already listening on {self.path}")
+        try:
+            self.path.unlink()  # stale socket of a daemon that died
+        except FileNotFoundError:
+            pass
+        old_umask = os.umask(0o177)  # socket is private to the user
+        try:
+            server = _Server(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+        server.owner = self
+        return server
+
+    def start(self) -> None:
+        """Run the first detection pass, bind the socket and start watching."""
+        self.refresh()
+        self._server = self._bind()
+        self._watcher_thread = threading.Thread(
+            target=self._watch, name="missionimpossible-daemon-watch", daemon=True,
+        )
+        self._watcher_thread.start()
+
+    def serve_forever(self) -> None:
+        """Answer requests until shutdown() or a "stop" request (start()s first if needed)."""
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            self._watcher_thread.join(self.poll_interval + 1.0)
+            self.watcher.close()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() (from another thread)."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def run_daemon(path: Optional[Path] = None) -> None:
+    """Entry point of ``missionimpossible daemon``; runs until SIGTERM / Ctrl-C."""
+    import signal
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("the daemon needs Unix domain sockets")
+    daemon = DetectionDaemon(path)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    daemon.start()
+    print(f"[MissionImPossible] Daemon listening on {daemon.path} "
+          f"(watching {len(daemon.watcher.paths)} paths via {daemon.watcher.mode}, "
+          f"first pass {daemon.duration:.2f}s)", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
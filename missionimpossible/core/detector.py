@@ -4,34 +4,114 @@ Universal ML Stack Conflict Detector
 
 from __future__ import annotations
 
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
 from ..detectors.cnn_detector import detect_cnn_conflicts
 from ..detectors.nlp_detector import detect_nlp_conflicts
 from ..detectors.vision_detector import detect_vision_conflicts
 from ..detectors.gpu_detector import detect_gpu_status
+from ..utils.dependency_check import check_dependencies, format_conflicts
 
 
-def detect_all_conflicts() -> dict:
-    """Detect conflicts across all ML domains."""
-    return {
-        "cnn": detect_cnn_conflicts(),
-        "nlp": detect_nlp_conflicts(),
-        "vision": detect_vision_conflicts(),
-        "gpu": detect_gpu_status(),
-        "pip": check_pip_conflicts(),
+# Seconds each probe may take before its result is reported as a timeout.
+DEFAULT_TIMEOUT = 30.0
+DETECTOR_TIMEOUTS: Dict[str, float] = {
+    "gpu": 15.0,
+}
+
+
+def _run_probe(probe: Callable[[Dict[str, Any]], dict], box: Dict[str, Any]) -> None:
+    try:
+        box["result"] = probe(box["partial"])
+    except Exception as exc:  # reported per probe, never fatal for the pass
+        box["error"] = f"{type(exc).__name__}: {exc}"
+
+
+def detect_all_conflicts(
+    timeouts: Optional[Dict[str, float]] = None,
+    default_timeout: float = DEFAULT_TIMEOUT,
+    import_frameworks: bool = False,
+    gpu_status: Optional[dict] = None,
+) -> dict:
+    """
+    Detect conflicts across all ML domains.
+
+    All probes run concurrently, each on its own daemon thread, so the
+    wall time is roughly that of the slowest probe. A probe that does not
+    finish within its timeout (or raises) does not block the others; its
+    entry is reported with ``status`` "timeout" / "error" instead. A timed
+    out GPU probe still reports the fields it had found (e.g. the driver
+    and devices while a framework import hangs); the other probes only
+    produce their result at the end.
+
+    Parameters
+    ----------
+    timeouts : dict, optional
+        Per-probe timeout overrides in seconds, e.g. {"gpu": 5}.
+    default_timeout : float
+        Timeout for probes without an explicit entry.
+    import_frameworks : bool
+        Let the GPU probe import TensorFlow / PyTorch in-process instead
+        of reading driver state and build metadata (see detect_gpu_status).
+    gpu_status : dict, optional
+        Result of an earlier detect_gpu_status() call to report instead of
+        probing the GPU again.
+
+    Returns
+    -------
+    dict : {"cnn","nlp","vision","gpu","pip"} -> probe result, each with a
+        "status" key ("ok", "timeout" or "error"); a "timeout" entry also
+        has the probe's "timeout" and any partial result.
+    """
+    # one site-packages scan and dependency check per pass, shared by
+    # every detector
+    check_dependencies(refresh=True)
+
+    limits = dict(DETECTOR_TIMEOUTS)
+    limits.update(timeouts or {})
+
+    # each probe gets a dict it may fill as it goes (see _run_probe)
+    probes = {
+        "cnn": lambda partial: detect_cnn_conflicts(),
+        "nlp": lambda partial: detect_nlp_conflicts(),
+        "vision": lambda partial: detect_vision_conflicts(),
+        "gpu": (lambda partial: gpu_status) if gpu_status is not None
+               else lambda partial: detect_gpu_status(import_frameworks=import_frameworks, partial=partial),
+        "pip": lambda partial: check_pip_conflicts(),
     }
+    start = time.monotonic()
+    running = {}
+    for name, probe in probes.items():
+        box: Dict[str, Any] = {"partial": {}}
+        thread = threading.Thread(
+            target=_run_probe,
+            args=(probe, box),
+            name=f"missionimpossible-detect-{name}",
+            daemon=True,
+        )
+        thread.start()
+        running[name] = (thread, box)
+
+    results: Dict[str, dict] = {}
+    for name, (thread, box) in running.items():
+        limit = limits.get(name, default_timeout)
+        thread.join(max(0.0, start + limit - time.monotonic()))
+        if thread.is_alive():
+            results[name] = dict(box["partial"], status="timeout", timeout=limit)
+        elif "error" in box:
+            results[name] = {"status": "error", "error": box["error"]}
+        else:
+            results[name] = dict(box["result"], status="ok")
+    return results
 
 
 def check_pip_conflicts() -> dict:
-    """Run `pip check` and return whether conflicts exist."""
-    import subprocess
-    import sys
-
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "check"],
-        capture_output=True,
-        text=True,
-    )
+    """Check installed distributions for broken requirements (like `pip check`)."""
+    records = check_dependencies()
     return {
-        "conflicts": result.returncode != 0,
-        "details": result.stdout.strip(),
+        "conflicts": bool(records),
+        "details": format_conflicts(records),
+        "records": records,
     }
@@ -0,0 +1,301 @@
+"""
+Download and disk footprint of a resolved stack.
+
+For every package the release that would be installed (the exact pin, or
+the newest release matching its specifier) is looked up on the index,
+and the file pip would pick for this interpreter is chosen with the
+solver's tag rules (IndexProvider.get_files):
+
+- download size: the file's ``size`` from the Simple API page (a HEAD
+  request on indexes that do not publish it),
+- installed size: the sum of the uncompressed entries listed in the
+  wheel's zip central directory, read with HTTP range requests (a few
+  KB, not the wheel) and cached per file.
+
+Where the index gives no size, the server ignores ranges or only an
+sdist exists, the installed size is estimated from the download size and
+the package is flagged as estimated.
+
+Pass the "pinned" set of ``resolve_universal_stack(solve=True)`` to
+include transitive dependencies (e.g. the nvidia-* wheels of torch).
+
+Smaller drop-in equivalents that are already used by a preset
+(tensorflow-cpu in lightweight, opencv-python-headless in production)
+are suggested with the bytes they would save.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+import requests
+from packaging.version import InvalidVersion, Version
+
+from ..resolvers.dependency_solver import IndexProvider, spec_to_requirement
+from ..utils.cache import cache_dir, read_json, write_json
+from ..utils.metadata import canonicalize_name
+from ..utils.preset_manager import get_preset, list_presets
+from ..utils.pypi_api import MAX_WORKERS, PyPIUnavailableError, get_session
+from .wheelhouse import DOWNLOAD_TIMEOUT
+
+# Unpacked / compressed size of a typical wheel, used when the real
+# installed size cannot be read.
+INSTALLED_RATIO = 2.5
+
+# package -> smaller packages that can replace it (same import name and API)
+SMALLER_EQUIVALENTS: Dict[str, Tuple[str, ...]] = {
+    "tensorflow": ("tensorflow-cpu",),
+    "tensorflow-gpu": ("tensorflow-cpu",),
+    "opencv-python": ("opencv-python-headless",),
+    "opencv-contrib-python": ("opencv-contrib-python-headless",),
+    "onnxruntime-gpu": ("onnxruntime",),
+}
+
+
+class _RangeReader(io.RawIOBase):
+    """Seekable read-only view of a remote file, read with HTTP Range requests."""
+
+    def __init__(self, url: str, size: int):
+        self.url = url
+        self.size = size
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: self.size}[whence]
+        self.pos = max(0, base + offset)
+        return self.pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = self.size if n is None or n < 0 else min(self.size, self.pos + n)
+        if end <= self.pos:
+            return b""
+        resp = get_session().get(
+            self.url, headers={"Range": f"bytes={self.pos}-{end - 1}"}, timeout=DOWNLOAD_TIMEOUT,
+        )
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise OSError(f"{self.url}: server ignores range requests")
+        data = resp.content
+        self.pos += len(data)
+        return data
+
+
+def _file_sizes(entry: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (download, installed) bytes of an index file.
+
+    installed is the sum of the uncompressed entries of a wheel and None
+    for sdists or when the file cannot be read.
+    """
+    url, size = entry["url"], entry.get("size")
+    path = cache_dir("footprint") / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+    cached = read_json(path)
+    if cached is not None:
+        return cached["download"], cached["installed"]
+    installed = None
+    try:
+        if url.startswith("file:"):
+            local = url2pathname(urlsplit(url).path)
+            size = os.path.getsize(local)
+            source = open(local, "rb")
+        else:
+            if not size:
+                resp = get_session().head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+                resp.raise_for_status()
+                size = int(resp.headers["Content-Length"])
+            source = _RangeReader(url, size)
+        with source:
+            if entry["filename"].endswith(".whl"):
+                with zipfile.ZipFile(source) as zf:
+                    installed = sum(info.file_size for info in zf.infolist())
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, requests.RequestException):
+        return size, None
+    write_json(path, {"download": size, "installed": installed})  # published files never change
+    return size, installed
+
+
+def _select_version(requirement, provider: IndexProvider) -> Optional[str]:
+    pins = [s.version for s in requirement.specifier if s.operator in ("==", "===") and "*" not in s.version]
+    if pins:
+        return pins[0]
+    candidates = []
+    for version in provider.get_versions(requirement.name):
+        try:
+            candidates.append(Version(version))
+        except InvalidVersion:
+            continue
+    matching = list(requirement.specifier.filter(candidates))
+    return str(max(matching)) if matching else None
+
+
+def package_footprint(name: str, spec: str, provider: Optional[IndexProvider] = None) -> Dict[str, Any]:
+    """
+    Footprint of one stack entry.
+
+    Returns
+    -------
+    dict : {"name", "version", "filename", "download", "installed" (bytes
+            or None), "estimated" (bool), "error" (str or None)}
+    """
+    provider = provider or IndexProvider()
+    requirement = spec_to_requirement(name, spec)
+    record: Dict[str, Any] = {
+        "name": requirement.name, "version": None, "filename": None,
+        "download": None, "installed": None, "estimated": False, "error": None,
+    }
+    try:
+        version = _select_version(requirement, provider)
+        files = provider.get_files(requirement.name, version) if version else []
+    except (PyPIUnavailableError, requests.RequestException, InvalidVersion) as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        return record
+    record["version"] = version
+    if not files:
+        record["error"] = f"no file of {requirement} for this interpreter on the index"
+        return record
+
+    best = files[0]
+    record["filename"] = best["filename"]
+    record["download"], record["installed"] = _file_sizes(best)
+    if record["installed"] is None and record["download"]:
+        record["installed"] = int(record["download"] * INSTALLED_RATIO)
+        record["estimated"] = True
+    if record["download"] is None:
+        record["estimated"] = True
+    return record
+
+
+def _preset_users() -> Dict[str, List[str]]:
+    """Canonical package name -> presets that use it."""
+    users: Dict[str, List[str]] = {}
+    for preset in sorted(list_presets()):
+        for name in get_preset(preset):
+            users.setdefault(canonicalize_name(name), []).append(preset)
+    return users
+
+
+def _replacement_spec(name: str, spec: str, replacement: str) -> str:
+    requirement = spec_to_requirement(name, spec)
+    requirement.name = replacement
+    return str(requirement)
+
+
+def estimate_footprint(
+    stack: Dict[str, str],
+    provider: Optional[IndexProvider] = None,
+    suggest: bool = True,
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Download and installed size of a stack, per package and in total.
+
+    Parameters
+    ----------
+    stack : dict
+        Mapping {package_name: version_spec}, e.g. result["preset"] or
+        result["pinned"] of resolve_universal_stack.
+    provider : IndexProvider, optional
+        Index access (shared with the resolution when given).
+    suggest : bool
+        Also size the smaller equivalents used by presets and report
+        those that save space.
+
+    Returns
+    -------
+    dict : {"packages": [package_footprint(), ...] (largest download first),
+            "download", "installed" (totals in bytes), "complete" (every
+            package sized exactly),
+            "suggestions": [{"package", "replacement", "version",
+                             "download_saved", "installed_saved", "presets"}]}
+    """
+    provider = provider or IndexProvider()
+    items = list(stack.items())
+    present = {canonicalize_name(spec_to_requirement(n, s).name) for n, s in items}
+    users = _preset_users() if suggest else {}
+    swaps = [
+        (i, replacement)
+        for i, (name, spec) in enumerate(items)
+        for replacement in SMALLER_EQUIVALENTS.get(canonicalize_name(spec_to_requirement(name, spec).name), ())
+        if replacement in users and replacement not in present
+    ]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items) + len(swaps)))) as pool:
+        packages = list(pool.map(lambda item: package_footprint(item[0], item[1], provider), items))
+        alternatives = list(pool.map(
+            lambda swap: package_footprint(
+                swap[1], _replacement_spec(*items[swap[0]], swap[1]), provider),
+            swaps,
+        ))
+
+    suggestions = []
+    for (i, replacement), alternative in zip(swaps, alternatives):
+        current = packages[i]
+        if alternative["error"] or current["error"] or not alternative["download"] or not current["download"]:
+            continue
+        if alternative["download"] >= current["download"]:
+            continue
+        suggestions.append({
+            "package": current["name"],
+            "replacement": replacement,
+            "version": alternative["version"],
+            "download_saved": current["download"] - alternative["download"],
+            "installed_saved": (current["installed"] or 0) - (alternative["installed"] or 0),
+            "presets": users[replacement],
+        })
+
+    return {
+        "packages": sorted(packages, key=lambda p: p["download"] or 0, reverse=True),
+        "download": sum(p["download"] or 0 for p in packages),
+        "installed": sum(p["installed"] or 0 for p in packages),
+        "complete": not any(p["error"] or p["estimated"] for p in packages),
+        "suggestions": sorted(suggestions, key=lambda s: s["download_saved"], reverse=True),
+    }
+
+
+def format_size(size: Optional[int]) -> str:
+    """Human-readable byte count, e.g. "1.2 GB" ("-" if unknown)."""
+    if size is None:
+        return "-"
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def format_footprint(report: Dict[str, Any]) -> str:
+    """Plain-text table of an estimate_footprint() report."""
+    lines = [f"{'package':<30} {'version':<14} {'download':>10} {'installed':>10}"]
+    for p in report["packages"]:
+        note = f"  ({p['error']})" if p["error"] else ("  ~" if p["estimated"] else "")
+        lines.append(f"{p['name']:<30} {p['version'] or '-':<14} {format_size(p['download']):>10} "
+                     f"{format_size(p['installed']):>10}{note}")
+    lines.append(f"{'total':<45} {format_size(report['download']):>10} {format_size(report['installed']):>10}")
+    if not report["complete"]:
+        lines.append("~ estimated: some sizes are unknown or extrapolated from the download size")
+    for s in report["suggestions"]:
+        lines.append(
+            f"suggestion: {s['package']} -> {s['replacement']} {s['version']} saves "
+            f"{format_size(s['download_saved'])} download, {format_size(s['installed_saved'])} "
+            f"installed (used by preset {', '.join(s['presets'])})"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,177 @@
+"""
+Import-time and memory profile of an installed stack.
+
+Every package is imported in its own fresh interpreter under
+``-X importtime`` (through the same probe validate_environment uses), so
+each one is charged for everything it pulls in, as it would be on a cold
+inference worker. The report gives, per package:
+
+- the cumulative import time of its top-level modules,
+- the RSS growth caused by importing them,
+- the import tree (module, self / cumulative microseconds),
+
+sorted by import time, as text, JSON or a Chrome trace (chrome://tracing,
+Perfetto).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+from .installer import _IMPORT_PROBE
+
+# written by _import_probe around each import (it cannot import this module)
+IMPORT_BEGIN = "--missionimpossible-import-begin--"
+IMPORT_END = "--missionimpossible-import-end--"
+_IMPORTTIME_RE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$")
+
+
+def parse_importtime(lines: List[str]) -> List[Dict[str, Any]]:
+    """
+    Rebuild the import tree from ``-X importtime`` lines.
+
+    A module is printed after everything it imported, one indentation
+    level (two spaces) deeper per nesting level.
+
+    Returns
+    -------
+    list of dict : root imports in order, each
+        {"name", "self_us", "cumulative_us", "children": [...]}.
+    """
+    pending: Dict[int, List[Dict[str, Any]]] = {}
+    for line in lines:
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        level = (len(indent) - 1) // 2
+        node = {
+            "name": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "children": pending.pop(level + 1, []),
+        }
+        pending.setdefault(level, []).append(node)
+    return pending.get(0, [])
+
+
+def _windows(stderr: str) -> List[List[str]]:
+    """importtime lines between each IMPORT_BEGIN / IMPORT_END pair."""
+    windows: List[List[str]] = []
+    current: Optional[List[str]] = None
+    for line in stderr.splitlines():
+        if line == IMPORT_BEGIN:
+            current = []
+        elif line == IMPORT_END:
+            if current is not None:
+                windows.append(current)
+            current = None
+        elif current is not None:
+            current.append(line)
+    if current is not None:  # crashed mid-import
+        windows.append(current)
+    return windows
+
+
+def profile_package(package: str, python_exe: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import the top-level modules of ``package`` in a fresh interpreter.
+
+    Returns
+    -------
+    dict : {"package", "modules", "ok", "error", "import_time" (seconds),
+            "rss_delta" (bytes or None), "imports" (tree, see parse_importtime)}
+    """
+    request = json.dumps({"packages": [package], "profile": True})
+    proc = subprocess.run(
+        [python_exe or sys.executable, "-X", "importtime", str(_IMPORT_PROBE), request],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    events = [json.loads(line) for line in proc.stdout.splitlines()]
+    results = [e for e in events if e["event"] in ("result", "missing")]
+    errors = [f"{e['module']}: {e['error']}" if e.get("module") else e["error"]
+              for e in results if e.get("error")]
+    started = {e["module"] for e in events if e["event"] == "start"}
+    finished = {e.get("module") for e in results}
+    for module in sorted(started - finished):
+        errors.append(f"{module}: interpreter crashed (exit code {proc.returncode})")
+    if not events and proc.returncode != 0:
+        errors.append(f"profiler failed to start: {proc.stderr.strip()[-500:]}")
+
+    imports = [node for window in _windows(proc.stderr) for node in parse_importtime(window)]
+    rss_deltas = [
+        e["rss_after"] - e["rss_before"] for e in results
+        if e.get("rss_before") is not None and e.get("rss_after") is not None
+    ]
+    return {
+        "package": package,
+        "modules": [e["module"] for e in results if e.get("module")],
+        "ok": not errors,
+        "error": "; ".join(errors) or None,
+        "import_time": sum(node["cumulative_us"] for node in imports) / 1e6,
+        "rss_delta": sum(rss_deltas) if rss_deltas else None,
+        "imports": imports,
+    }
+
+
+def profile_imports(packages: List[str], python_exe: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Profile every package of a stack; heaviest import first.
+
+    Parameters
+    ----------
+    packages : list of str
+        Distribution names, e.g. the keys of a resolved stack.
+    python_exe : str, optional
+        Interpreter of the environment to profile (default: the current one).
+
+    Returns
+    -------
+    list of dict : profile_package() results sorted by import_time.
+    """
+    report = [profile_package(package, python_exe) for package in packages]
+    return sorted(report, key=lambda entry: entry["import_time"], reverse=True)
+
+
+def _trace_events(node: Dict[str, Any], start: float, tid: int, out: List[dict]) -> None:
+    out.append({
+        "name": node["name"], "cat": "import", "ph": "X",
+        "ts": start, "dur": node["cumulative_us"], "pid": 1, "tid": tid,
+        "args": {"self_us": node["self_us"]},
+    })
+    cursor = start
+    for child in node["children"]:
+        _trace_events(child, cursor, tid, out)
+        cursor += child["cumulative_us"]
+
+
+def to_chrome_trace(report: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Chrome trace (JSON object format) with one track per package."""
+    events: List[dict] = []
+    for tid, entry in enumerate(report, start=1):
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                       "args": {"name": entry["package"]}})
+        events.append({
+            "name": entry["package"], "cat": "package", "ph": "X", "ts": 0,
+            "dur": entry["import_time"] * 1e6, "pid": 1, "tid": tid,
+            "args": {"rss_delta": entry["rss_delta"], "error": entry["error"]},
+        })
+        cursor = 0.0
+        for node in entry["imports"]:
+            _trace_events(node, cursor, tid, events)
+            cursor += node["cumulative_us"]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    """Plain-text table of a profile_imports() report."""
+    lines = [f"{'package':<28} {'import':>10} {'rss':>10}  status"]
+    for entry in report:
+        rss = "-" if entry["rss_delta"] is None else f"{entry['rss_delta'] / 2**20:.1f} MB"
+        status = "ok" if entry["ok"] else f"FAILED ({entry['error']})"
+        lines.append(f"{entry['package']:<28} {entry['import_time'] * 1000:>7.1f} ms {rss:>10}  {status}")
+    return "\n".join(lines)
@@ -2,27 +2,60 @@
 Installer utilities for MissionImPossible.
 
 - Creates (optional) virtual environment
-- Runs pip install for a resolved stack
+- Installs a resolved stack with a pluggable backend (pip, uv; see
+  core.backends), optionally offline from a wheelhouse
+- Or materializes a venv by hardlinking from a store of unpacked
+  distributions (see core.materialize)
 - Validates imports after installation
 """
 
 from __future__ import annotations
+import json
 import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..resolvers.dependency_solver import spec_to_requirement
+from .backends import get_backend
+
+# run by path inside the target interpreter, see validate_environment
+_IMPORT_PROBE = Path(__file__).with_name("_import_probe.py")
+
 
 def run(cmd: List[str], env: Optional[Dict[str, str]] = None) -> int:
     """Run a shell command and stream output."""
     return subprocess.call(cmd, env=env or None)
 
 
+def stack_requirements(stack: Dict[str, str]) -> List[str]:
+    """Requirement strings for a stack ("2.1.0" -> "torch==2.1.0", specifiers kept)."""
+    return [str(spec_to_requirement(name, spec)) for name, spec in stack.items()]
+
+
+def venv_python(venv_dir: Path) -> str:
+    """Path of the interpreter inside a virtual environment."""
+    if sys.platform.startswith("win"):
+        return str(venv_dir / "Scripts" / "python.exe")
+    return str(venv_dir / "bin" / "python")
+
+
+def ensure_venv(venv_dir: Path) -> str:
+    """Create the virtualenv ``venv_dir`` if missing; returns its interpreter."""
+    if not venv_dir.exists():
+        print(f"[MissionImPossible] Creating virtualenv at {venv_dir} ...")
+        run([sys.executable, "-m", "venv", str(venv_dir)])
+    return venv_python(venv_dir)
+
+
 def install_stack(
     stack: Dict[str, str],
     use_venv: bool = False,
     venv_path: str = ".missionimpossible-env",
-) -> None:
+    wheelhouse: Optional[str] = None,
+    backend: Optional[str] = None,
+    link: bool = False,
+) -> dict:
     """
     Install a resolved stack of packages.
 
@@ -34,47 +67,137 @@ def install_stack(
         Whether to create and use a dedicated virtual environment.
     venv_path : str
         Path to the virtual environment directory.
+    wheelhouse : str, optional
+        Install only from this wheelhouse (see core.wheelhouse.prefetch),
+        without contacting the index.
+    backend : str, optional
+        Installer backend name ("pip", "uv", "auto"; see core.backends).
+    link : bool
+        Build the venv (requires ``use_venv``) by linking unpacked
+        distributions from the store instead of running an installer.
+        Fetches go to ``wheelhouse`` (default location if None).
+
+    Returns
+    -------
+    dict : the backend's install result with per-phase timings
+        {"backend", "returncode", "command", "total", "phases"}.
     """
     python_exe = sys.executable
+    pkgs = stack_requirements(stack)
 
-    if use_venv:
-        venv_dir = Path(venv_path)
-        if not venv_dir.exists():
-            print(f"[MissionImPossible] Creating virtualenv at {venv_dir} ...")
-            run([python_exe, "-m", "venv", str(venv_dir)])
+    if link:
+        if not use_venv:
+            raise ValueError("link mode builds a dedicated venv; pass use_venv=True")
+        from .materialize import materialize
+        print(f"[MissionImPossible] Linking {venv_path} from the package store:", " ".join(pkgs))
+        result = materialize(pkgs, venv_path, wheelhouse=wheelhouse)
+        print("[MissionImPossible] " + format_timings(result))
+        python_exe = venv_python(Path(venv_path))
+        validate_environment(list(stack.keys()), python_exe)
+        return result
 
+    if use_venv:
         # select Python inside venv
-        if sys.platform.startswith("win"):
-            python_exe = str(venv_dir / "Scripts" / "python.exe")
-        else:
-            python_exe = str(venv_dir / "bin" / "python")
+        python_exe = ensure_venv(Path(venv_path))
 
-    # build pip install command
-    pkgs = [f"{name}=={ver}" for name, ver in stack.items()]
-    cmd = [python_exe, "-m", "pip", "install"] + pkgs
-    print("[MissionImPossible] Installing:", " ".join(pkgs))
-    code = run(cmd)
-    if code != 0:
-        raise RuntimeError("Installation failed, see pip output above.")
+    installer = get_backend(backend)
+    if wheelhouse:
+        print(f"[MissionImPossible] Using wheelhouse {wheelhouse} (no index)")
+    print(f"[MissionImPossible] Installing with {installer.name}:", " ".join(pkgs))
+    with installer.wheelhouse_args(wheelhouse) as extra_args:
+        result = installer.install(python_exe, pkgs, extra_args)
+    if result["returncode"] != 0:
+        raise RuntimeError(f"Installation failed, see {installer.name} output above.")
+    print("[MissionImPossible] " + format_timings(result))
 
     # basic validation
     validate_environment(list(stack.keys()), python_exe)
+    return result
+
+
+def format_timings(result: dict) -> str:
+    """One-line summary of an install result, e.g. "pip: 41.2s (resolve 3.1s, ...)"."""
+    phases = ", ".join(
+        f"{phase} {seconds:.1f}s"
+        for phase, seconds in result["phases"].items()
+        if seconds is not None
+    )
+    return f"{result['backend']}: {result['total']:.1f}s" + (f" ({phases})" if phases else "")
 
 
-def validate_environment(packages: List[str], python_exe: Optional[str] = None) -> None:
+def check_imports(packages: List[str], python_exe: Optional[str] = None) -> List[dict]:
     """
-    Try importing every package to ensure environment is consistent.
+    Import the top-level modules of ``packages`` in one child interpreter.
+
+    Module names come from each distribution's top_level.txt / RECORD
+    (scikit-learn -> sklearn, opencv-python -> cv2). A module whose import
+    kills the interpreter is reported as crashed and the check continues
+    in a new child with the remaining modules.
+
+    Parameters
+    ----------
+    packages : list of str
+        Distribution names.
+    python_exe : str, optional
+        Interpreter to check (default: the current one).
+
+    Returns
+    -------
+    list of dict : [{"package", "module", "ok", "error", "seconds"}];
+        "module" is None for distributions that are missing or have no
+        importable modules.
     """
     python_exe = python_exe or sys.executable
+    records: List[dict] = []
+    done: List[str] = []
+    remaining = list(packages)
+    while remaining:
+        request = json.dumps({"packages": remaining, "skip": done})
+        proc = subprocess.run(
+            [python_exe, str(_IMPORT_PROBE), request],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        started = None
+        for line in proc.stdout.splitlines():
+            event = json.loads(line)
+            kind = event.pop("event")
+            if kind == "start":
+                started = event
+                continue
+            if kind == "missing":
+                event.update(module=None, ok=False, seconds=0.0)
+            records.append(event)
+            if event["module"]:
+                done.append(event["module"])
+            started = None
+
+        if started is None:
+            if proc.returncode != 0 and not records:
+                raise RuntimeError(f"import check failed to start in {python_exe}:\n{proc.stderr.strip()}")
+            break
+        records.append(dict(started, ok=False, seconds=None,
+                            error=f"interpreter crashed (exit code {proc.returncode})"))
+        done.append(started["module"])
+        remaining = remaining[remaining.index(started["package"]):]
+    return records
+
+
+def validate_environment(packages: List[str], python_exe: Optional[str] = None) -> List[dict]:
+    """
+    Try importing every package to ensure environment is consistent.
+
+    All imports run in a single child interpreter (see check_imports);
+    returns its records.
+    """
     print("[MissionImPossible] Validating imports ...")
-    for pkg in packages:
-        # ambil nama modul (tanpa tanda -)
-        mod_name = pkg.split("-")[0].replace("-", "_")
-        code = run([python_exe, "-c", f"import {mod_name}"])
-        if code != 0:
-            print(f"[MissionImPossible] WARNING: Failed to import '{mod_name}'.")
+    records = check_imports(packages, python_exe)
+    for record in records:
+        label = record["package"] if record["module"] is None else f"{record['module']} ({record['package']})"
+        if record["ok"]:
+            print(f"[MissionImPossible] OK: {label}")
         else:
-            print(f"[MissionImPossible] OK: {mod_name}")
+            print(f"[MissionImPossible] WARNING: Failed to import {label}: {record['error']}")
     print("[MissionImPossible] Validation finished.")
+    return records
 
 
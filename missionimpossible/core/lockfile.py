@@ -0,0 +1,262 @@
+"""
+Hash-pinned lockfiles for MissionImPossible.
+
+A resolved stack still mixes exact pins with open ranges
+(``ultralytics>=8.3.234``), so every install resolves again and two nodes
+can end up with different environments. lock_stack() expands the stack
+through pip (the same ``--dry-run --report`` pass the wheelhouse uses)
+into its full transitive closure and records, per target environment,
+the exact file of every distribution:
+
+    {
+      "version": 1,
+      "index_url": "https://pypi.org/simple",
+      "requirements": ["torch==2.1.0", "ultralytics>=8.3.234", ...],
+      "environments": [
+        {"python_version": "3.11", "implementation": "cp",
+         "platform": "manylinux_2_35_x86_64",
+         "packages": [{"name", "version", "url", "filename", "sha256"}, ...]},
+        ...
+      ]
+    }
+
+install_lock() picks the environment the interpreter can install and
+installs exactly those files with ``--require-hashes --no-deps``: nothing
+is resolved, and a substituted file fails the install.
+
+The first environment is the interpreter that wrote the lock; further
+ones are locked with pip's ``--platform`` / ``--python-version`` (binary
+wheels only). pip evaluates environment markers for the locking machine,
+so lock on each OS when the stack has OS-specific dependencies.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from packaging import tags
+from packaging.requirements import Requirement
+from packaging.utils import parse_wheel_filename
+
+from ..utils.cache import write_text
+from ..utils.pypi_api import get_index_url, get_session
+from .backends import get_backend
+from .installer import (
+    ensure_venv, format_timings, stack_requirements, validate_environment,
+)
+from .wheelhouse import DOWNLOAD_TIMEOUT, plan_downloads
+
+LOCK_VERSION = 1
+DEFAULT_LOCKFILE = "missionimpossible.lock.json"
+_CHUNK = 1 << 20
+
+
+def parse_target(text: str) -> Dict[str, str]:
+    """Parse "3.10:manylinux2014_x86_64" (optionally ":cp") into a plan_downloads target."""
+    parts = text.split(":")
+    if len(parts) not in (2, 3) or not all(parts):
+        raise ValueError(f"invalid lock target {text!r}; use PYTHON:PLATFORM, e.g. 3.10:win_amd64")
+    return {
+        "python_version": parts[0],
+        "platform": parts[1],
+        "implementation": parts[2] if len(parts) == 3 else "cp",
+    }
+
+
+def _sha256_of(url: str) -> str:
+    """Digest of a file the index published without a hash."""
+    digest = hashlib.sha256()
+    if url.startswith("file:"):
+        with open(url2pathname(urlsplit(url).path), "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    with get_session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _environment(
+    requirements: List[str],
+    index_url: str,
+    target: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    plan = plan_downloads(requirements, index_url=index_url, target=target)
+    for entry in plan:
+        if not entry["sha256"]:
+            entry["sha256"] = _sha256_of(entry["url"])
+    if target is None:
+        target = {
+            "python_version": "%d.%d" % sys.version_info[:2],
+            "platform": next(iter(tags.sys_tags())).platform,
+            "implementation": tags.interpreter_name(),
+        }
+    return {
+        "python_version": target["python_version"],
+        "implementation": target.get("implementation", "cp"),
+        "platform": target["platform"],
+        "packages": sorted(plan, key=lambda entry: entry["name"].lower()),
+    }
+
+
+def lock_stack(
+    stack: Dict[str, str],
+    targets: Optional[List[Dict[str, str]]] = None,
+    index_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Pin a resolved stack, with its transitive closure, to exact files.
+
+    Parameters
+    ----------
+    stack : dict
+        Mapping {package_name: version_spec}, e.g. result["preset"] or
+        result["pinned"] of resolve_universal_stack.
+    targets : list of dict, optional
+        Extra environments to lock (see parse_target), besides the
+        current interpreter.
+    index_url : str, optional
+        Index the files are taken from (default: the configured one).
+
+    Returns
+    -------
+    dict : the lock (see module doc).
+    """
+    index_url = index_url or get_index_url()
+    requirements = stack_requirements(stack)
+    environments = [_environment(requirements, index_url)]
+    for target in targets or []:
+        environments.append(_environment(requirements, index_url, target))
+    return {
+        "version": LOCK_VERSION,
+        "index_url": index_url,
+        "requirements": requirements,
+        "environments": environments,
+    }
+
+
+def write_lockfile(lock: Dict[str, Any], path: str = DEFAULT_LOCKFILE) -> Path:
+    """Atomically write ``lock`` as indented JSON."""
+    path = Path(path)
+    write_text(path, json.dumps(lock, indent=2) + "\n")
+    return path
+
+
+def read_lockfile(path: str = DEFAULT_LOCKFILE) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        lock = json.load(f)
+    if lock.get("version") != LOCK_VERSION:
+        raise ValueError(f"{path}: unsupported lockfile version {lock.get('version')!r}")
+    return lock
+
+
+def _installable(filename: str, supported: set) -> bool:
+    if not filename.endswith(".whl"):
+        return True  # sdist, built for the interpreter
+    return not supported.isdisjoint(parse_wheel_filename(filename)[3])
+
+
+def select_environment(lock: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The locked environment the current interpreter can install.
+
+    Venvs created by the installer use this interpreter, so it also
+    decides for them.
+    """
+    python_version = "%d.%d" % sys.version_info[:2]
+    supported = set(tags.sys_tags())
+    for env in lock["environments"]:
+        if env["python_version"] != python_version or env["implementation"] != tags.interpreter_name():
+            continue
+        if all(_installable(entry["filename"], supported) for entry in env["packages"]):
+            return env
+    locked = ", ".join(
+        f"{env['implementation']}{env['python_version']}-{env['platform']}"
+        for env in lock["environments"]
+    )
+    raise RuntimeError(
+        f"lockfile has no environment for {tags.interpreter_name()}{python_version} "
+        f"on this platform (locked: {locked}); lock again with a matching --lock-target"
+    )
+
+
+def requirement_lines(packages: List[Dict[str, Any]], pin_urls: bool = True) -> List[str]:
+    """
+    Requirements-file lines with hashes for locked packages.
+
+    ``pin_urls`` installs the recorded URLs directly (no index lookups);
+    otherwise packages are pinned by version, e.g. to install from a
+    wheelhouse.
+    """
+    lines = []
+    for entry in packages:
+        spec = f"{entry['name']} @ {entry['url']}" if pin_urls else f"{entry['name']}=={entry['version']}"
+        lines.append(f"{spec} --hash=sha256:{entry['sha256']}")
+    return lines
+
+
+def install_lock(
+    lock: Dict[str, Any],
+    use_venv: bool = False,
+    venv_path: str = ".missionimpossible-env",
+    wheelhouse: Optional[str] = None,
+    backend: Optional[str] = None,
+    link: bool = False,
+) -> dict:
+    """
+    Install exactly the files of a lock, without resolving anything.
+
+    Parameters are those of installer.install_stack; the lock replaces
+    the stack.
+
+    Returns
+    -------
+    dict : the backend's install result
+        {"backend", "returncode", "command", "total", "phases"}.
+    """
+    env = select_environment(lock)
+    packages = env["packages"]
+    names = [Requirement(req).name for req in lock["requirements"]]
+
+    if link:
+        if not use_venv:
+            raise ValueError("link mode builds a dedicated venv; pass use_venv=True")
+        from .materialize import materialize
+        print(f"[MissionImPossible] Linking {venv_path} from the package store: {len(packages)} locked files")
+        result = materialize([], venv_path, wheelhouse=wheelhouse, plan=packages)
+        print("[MissionImPossible] " + format_timings(result))
+        validate_environment(names, ensure_venv(Path(venv_path)))
+        return result
+
+    python_exe = ensure_venv(Path(venv_path)) if use_venv else sys.executable
+    installer = get_backend(backend)
+    if wheelhouse:
+        print(f"[MissionImPossible] Using wheelhouse {wheelhouse} (no index)")
+    fd, reqs = tempfile.mkstemp(prefix="missionimpossible-lock-", suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("\n".join(requirement_lines(packages, pin_urls=not wheelhouse)) + "\n")
+    print(f"[MissionImPossible] Installing {len(packages)} locked files with {installer.name} "
+          f"({env['implementation']}{env['python_version']}-{env['platform']})")
+    try:
+        with installer.wheelhouse_args(wheelhouse) as wheelhouse_args:
+            result = installer.install(
+                python_exe, [], ["--require-hashes", "--no-deps"] + wheelhouse_args + ["-r", reqs],
+            )
+    finally:
+        os.unlink(reqs)
+    if result["returncode"] != 0:
+        raise RuntimeError(f"Installation failed, see {installer.name} output above.")
+    print("[MissionImPossible] " + format_timings(result))
+
+    validate_environment(names, python_exe)
+    return result
@@ -0,0 +1,313 @@
+"""
+Materialize virtual environments from a store of unpacked distributions.
+
+Instead of running an installer for every new venv, each wheel of the
+stack is unpacked (and byte-compiled) once into a store keyed by the
+wheel's sha256:
+
+    <store>/<sha256>/          site-packages contents of the wheel
+    <store>/<sha256>-<tag>/    same, for a wheel built from an sdist
+                               (interpreter specific, e.g. tag cpython-311)
+
+A venv is then created without pip and every store file is hardlinked
+into its site-packages (reflinked on copy-on-write filesystems when
+hardlinks are not possible, e.g. across devices; copied as a last resort).
+Only directories, console scripts and metadata written by the venv itself
+take new disk space. Stored files are shared between venvs and must not
+be edited in place.
+
+The wheels themselves come from the wheelhouse (core.wheelhouse), so the
+full transitive closure and hashes are the ones pip would install.
+"""
+
+from __future__ import annotations
+
+import compileall
+import configparser
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import venv
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.cache import cache_dir
+from .installer import venv_python
+from .wheelhouse import prefetch
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl(2) request for a copy-on-write clone (btrfs, XFS, overlay on those)
+FICLONE = 0x40049409
+
+_SCRIPT_TEMPLATE = """#!{python}
+# -*- coding: utf-8 -*-
+import re
+import sys
+from {module} import {head}
+if __name__ == "__main__":
+    sys.argv[0] = re.sub(r"(-script\\.pyw|\\.exe)?$", "", sys.argv[0])
+    sys.exit({call}())
+"""
+
+
+def default_store() -> Path:
+    return Path(os.environ.get("MISSIONIMPOSSIBLE_STORE") or cache_dir("store"))
+
+
+def _venv_paths(venv_dir: Path) -> Dict[str, Path]:
+    """
+    Install directories of a venv, as reported by its own interpreter.
+
+    The host's default scheme does not apply: Debian / Ubuntu system
+    Pythons default to posix_local (``<prefix>/local/lib/.../dist-packages``)
+    but use the plain venv layout inside a venv.
+    """
+    out = subprocess.check_output(
+        [venv_python(venv_dir), "-c",
+         "import json, sysconfig; print(json.dumps(sysconfig.get_paths()))"],
+        text=True,
+    )
+    paths = json.loads(out)
+    return {
+        "purelib": Path(paths["purelib"]),
+        "scripts": Path(paths["scripts"]),
+        "data": venv_dir,
+    }
+
+
+def _build_wheel(sdist: Path, out_dir: Path) -> Path:
+    subprocess.check_call(
+        [sys.executable, "-m", "pip", "wheel", "--no-deps", "--quiet",
+         "--wheel-dir", str(out_dir), str(sdist)]
+    )
+    return next(out_dir.glob("*.whl"))
+
+
+def _unpack_wheel(wheel: Path, target: Path) -> None:
+    """Extract a wheel into ``target`` laid out as site-packages."""
+    with zipfile.ZipFile(wheel) as zf:
+        zf.extractall(target)
+    # <name>.data/{purelib,platlib} belong in site-packages; scripts,
+    # headers and data stay under .data and are placed per venv
+    for data_dir in target.glob("*.data"):
+        for lib in ("purelib", "platlib"):
+            lib_dir = data_dir / lib
+            if lib_dir.is_dir():
+                for item in lib_dir.iterdir():
+                    shutil.move(str(item), str(target / item.name))
+                lib_dir.rmdir()
+    compileall.compile_dir(str(target), quiet=2, workers=1)
+
+
+def store_entry(artifact: Path, sha256: str, store: Optional[Path] = None) -> Path:
+    """
+    Return the unpacked store directory of a wheel or sdist, creating it once.
+
+    Parameters
+    ----------
+    artifact : Path
+        Wheel or sdist (as stored in the wheelhouse).
+    sha256 : str
+        Digest of ``artifact``; the store key.
+    """
+    store = Path(store or default_store())
+    key = sha256 if artifact.name.endswith(".whl") else f"{sha256}-{sys.implementation.cache_tag}"
+    entry = store / key
+    if entry.is_dir():
+        return entry
+
+    store.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=store, prefix=".tmp-"))
+    try:
+        wheel = artifact
+        if not artifact.name.endswith(".whl"):
+            wheel = _build_wheel(artifact, staging / ".build")
+        unpacked = staging / "entry"
+        _unpack_wheel(wheel, unpacked)
+        try:
+            os.replace(unpacked, entry)
+        except OSError:
+            if not entry.is_dir():  # not just a concurrent writer winning
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return entry
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    if fcntl is None:
+        raise OSError("reflink not supported on this platform")
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+def place_file(src: Path, dst: Path) -> str:
+    """Hardlink, else reflink, else copy ``src`` to ``dst``; returns the method used."""
+    # never write through an existing file: it may be a link into the store
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    try:
+        _reflink(src, dst)
+        shutil.copystat(src, dst)
+        return "reflink"
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def _write_script(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+    path.chmod(0o755)
+
+
+def _console_scripts(dist_info: Path, scripts_dir: Path, python: str) -> int:
+    entry_points = dist_info / "entry_points.txt"
+    if not entry_points.exists():
+        return 0
+    parser = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    parser.optionxform = str  # keep script names as written
+    parser.read(entry_points, encoding="utf-8")
+    count = 0
+    for section in ("console_scripts", "gui_scripts"):
+        if not parser.has_section(section):
+            continue
+        for name, value in parser.items(section):
+            target = value.split("[")[0].strip()
+            module, _, attr = target.partition(":")
+            attr = attr or "main"
+            _write_script(scripts_dir / name, _SCRIPT_TEMPLATE.format(
+                python=python, module=module.strip(),
+                head=attr.split(".")[0].strip(), call=attr.strip(),
+            ))
+            count += 1
+    return count
+
+
+def link_entry(
+    entry: Path,
+    venv_dir: Path,
+    python: str,
+    paths: Optional[Dict[str, Path]] = None,
+) -> Dict[str, int]:
+    """
+    Place one store entry into a venv; returns counts per placement method.
+
+    ``paths`` are the venv's install directories (queried if omitted).
+    """
+    paths = paths or _venv_paths(venv_dir)
+    counts: Dict[str, int] = {"hardlink": 0, "reflink": 0, "copy": 0, "scripts": 0}
+    for root, dirs, files in os.walk(entry):
+        rel = Path(root).relative_to(entry)
+        if rel.parts and rel.parts[0].endswith(".data"):
+            dirs[:] = []
+            continue
+        dest = paths["purelib"] / rel
+        dest.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            counts[place_file(Path(root) / name, dest / name)] += 1
+
+    for data_dir in entry.glob("*.data"):
+        scripts = data_dir / "scripts"
+        if scripts.is_dir():
+            for script in scripts.iterdir():
+                body = script.read_bytes()
+                if body.startswith(b"#!python"):
+                    body = b"#!" + python.encode() + body[len(b"#!python"):]
+                target = paths["scripts"] / script.name
+                target.write_bytes(body)
+                target.chmod(0o755)
+                counts["scripts"] += 1
+        data = data_dir / "data"
+        if data.is_dir():
+            for root, _, files in os.walk(data):
+                dest = paths["data"] / Path(root).relative_to(data)
+                dest.mkdir(parents=True, exist_ok=True)
+                for name in files:
+                    counts[place_file(Path(root) / name, dest / name)] += 1
+
+    for dist_info in entry.glob("*.dist-info"):
+        counts["scripts"] += _console_scripts(dist_info, paths["scripts"], python)
+    return counts
+
+
+def materialize(
+    requirements: List[str],
+    venv_path: str,
+    wheelhouse: Optional[str] = None,
+    store: Optional[Path] = None,
+    plan: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Create (or fill) a venv at ``venv_path`` by linking from the store.
+
+    Parameters
+    ----------
+    requirements : list of str
+        Requirement strings of the stack.
+    venv_path : str
+        Virtual environment to create; an existing one is reused.
+    wheelhouse : str, optional
+        Wheelhouse the wheels are prefetched into (default location if None).
+    store : Path, optional
+        Unpacked store (default: $MISSIONIMPOSSIBLE_STORE or the cache).
+    plan : list of dict, optional
+        Exact files to link (e.g. from a lockfile) instead of resolving
+        ``requirements``; see wheelhouse.prefetch.
+
+    Returns
+    -------
+    dict : install result in the installer backend format
+        {"backend": "link", "returncode", "command", "total", "phases",
+         "placed": {"hardlink", "reflink", "copy", "scripts"}}.
+    """
+    start = time.perf_counter()
+    venv_dir = Path(venv_path).resolve()
+    if not venv_dir.exists():
+        venv.EnvBuilder(with_pip=False, symlinks=os.name != "nt").create(venv_dir)
+    python = venv_python(venv_dir)
+
+    fetched = prefetch(requirements, root=wheelhouse, plan=plan)
+    fetch_done = time.perf_counter()
+
+    # wheelhouse files live in sha256/<aa>/<digest>/<filename>
+    entries = [store_entry(path, path.parent.name, store) for path in fetched["files"]]
+    unpack_done = time.perf_counter()
+
+    placed = {"hardlink": 0, "reflink": 0, "copy": 0, "scripts": 0}
+    paths = _venv_paths(venv_dir)
+    for entry in entries:
+        for method, count in link_entry(entry, venv_dir, python, paths).items():
+            placed[method] += count
+    done = time.perf_counter()
+
+    return {
+        "backend": "link",
+        "returncode": 0,
+        "command": None,
+        "total": done - start,
+        "phases": {
+            "resolve": None,  # part of the prefetch (pip --report)
+            "download": fetch_done - start,
+            "build": unpack_done - fetch_done,
+            "install": done - unpack_done,
+        },
+        "placed": placed,
+    }
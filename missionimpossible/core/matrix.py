@@ -0,0 +1,135 @@
+"""
+Batch ("matrix") resolution for MissionImPossible.
+
+Resolves many parameter sets (preset x YOLO family x GPU x framework) in
+one process. All combinations share one ResolutionContext, so detection,
+the GPU probe, preset parsing and index lookups run once for the whole
+batch; the combinations themselves are resolved on a thread pool and
+yielded as soon as each one finishes.
+
+A matrix spec is either a grid (every value a list, or a scalar kept
+fixed) or a list of such grids / plain parameter sets:
+
+    {"use_case": ["research", "production"], "gpu": [true, false]}
+    [{"use_case": "research", "yolo_family": ["v8", "v11"]},
+     {"use_case": "lightweight", "framework": "pytorch"}]
+
+CLI spellings ("preset", "yolo") are accepted for "use_case" and
+"yolo_family".
+"""
+
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ..resolvers.context import ResolutionContext
+from ..resolvers.stack_resolver import resolve_cnn_nlp_stack
+from .resolver import generate_pip_command, resolve_universal_stack
+
+MAX_WORKERS = 8
+
+_ALIASES = {"preset": "use_case", "yolo": "yolo_family"}
+_DEFAULTS = {"use_case": "research", "yolo_family": "latest", "gpu": True, "framework": "auto"}
+
+MatrixSpec = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+def expand_matrix(spec: MatrixSpec) -> List[Dict[str, Any]]:
+    """
+    Expand a matrix spec into the list of parameter sets it describes.
+
+    Returns
+    -------
+    list of dict : every combination, with defaults filled in and
+        duplicates removed, e.g. [{"use_case", "yolo_family", "gpu", "framework"}, ...].
+    """
+    grids = spec if isinstance(spec, list) else [spec]
+    combos: List[Dict[str, Any]] = []
+    seen = set()
+    for grid in grids:
+        axes: Dict[str, List[Any]] = {}
+        for key, values in grid.items():
+            key = _ALIASES.get(key, key)
+            if key not in _DEFAULTS:
+                raise ValueError(f"unknown matrix parameter {key!r}; use {sorted(_DEFAULTS)}")
+            axes[key] = values if isinstance(values, list) else [values]
+        names = list(axes)
+        for values in itertools.product(*(axes[n] for n in names)):
+            params = dict(_DEFAULTS, **dict(zip(names, values)))
+            marker = tuple(sorted(params.items()))
+            if marker not in seen:
+                seen.add(marker)
+                combos.append(params)
+    return combos
+
+
+def _resolve_one(
+    params: Dict[str, Any],
+    context: ResolutionContext,
+    resolver: str,
+    solve: bool,
+    use_cache: bool,
+) -> dict:
+    if resolver == "cnn_nlp":
+        stack = resolve_cnn_nlp_stack(
+            use_case=params["use_case"], yolo_family=params["yolo_family"],
+            framework=params["framework"], context=context,
+        )
+        return {"preset": stack, "install_command": generate_pip_command(stack)}
+    return resolve_universal_stack(
+        params["use_case"], params["yolo_family"], params["gpu"], params["framework"],
+        solve=solve, use_cache=use_cache, context=context,
+    )
+
+
+def resolve_matrix(
+    spec: MatrixSpec,
+    resolver: str = "universal",
+    solve: bool = False,
+    use_cache: bool = True,
+    context: Optional[ResolutionContext] = None,
+    max_workers: int = MAX_WORKERS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Resolve every combination of a matrix spec, streaming the results.
+
+    Parameters
+    ----------
+    spec : dict or list
+        Matrix spec (see module doc).
+    resolver : {"universal","cnn_nlp"}
+        resolve_universal_stack (with diagnostics, optional solve and the
+        resolution cache) or the lighter resolve_cnn_nlp_stack.
+    solve, use_cache : bool
+        Passed to resolve_universal_stack.
+    context : ResolutionContext, optional
+        Shared probes and lookups; a new one is created if omitted.
+    max_workers : int
+        Combinations resolved concurrently.
+
+    Yields
+    ------
+    dict : {"index", "params", "status": "ok", "result"} or
+        {"index", "params", "status": "error", "error"}, in completion order.
+    """
+    if resolver not in ("universal", "cnn_nlp"):
+        raise ValueError(f"unknown resolver {resolver!r}")
+    combos = expand_matrix(spec)
+    # probes run lazily (under the context's lock) on first use, so a
+    # batch answered entirely from the resolution cache never probes
+    context = context or ResolutionContext()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(combos)))) as pool:
+        futures = {
+            pool.submit(_resolve_one, params, context, resolver, solve, use_cache): (i, params)
+            for i, params in enumerate(combos)
+        }
+        for future in as_completed(futures):
+            index, params = futures[future]
+            try:
+                outcome = {"status": "ok", "result": future.result()}
+            except Exception as exc:  # one bad combination must not end the batch
+                outcome = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+            yield dict({"index": index, "params": params}, **outcome)
@@ -0,0 +1,83 @@
+"""
+Memoized results of resolve_universal_stack.
+
+An entry is keyed by everything the resolution reads:
+- the call arguments,
+- the index URL and offline mode the releases are read with,
+- the contents of the file defining the requested preset,
+- the GPU / driver fingerprint,
+- the contents of the framework compatibility dataset,
+- the installed-environment fingerprint (diagnostics depend on it).
+
+The index pages consulted during the resolution are stored with their
+content digests and re-checked on lookup (served from the PyPI cache while
+fresh, revalidated otherwise), so a changed index invalidates the entry too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from ..detectors.gpu_detector import gpu_fingerprint
+from ..resolvers import compatibility
+from ..utils.cache import cache_dir, read_json, write_json
+from ..utils.metadata import environment_fingerprint
+from ..utils.preset_manager import preset_source
+from ..utils.pypi_api import PyPIUnavailableError, get_index_url, is_offline, page_digest
+
+
+def _file_digest(path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _preset_digest(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    try:
+        path = preset_source(name)
+    except KeyError:
+        return None
+    return f"{path}:{_file_digest(path)}"
+
+
+def resolution_key(**arguments: Any) -> str:
+    """Digest of the resolve arguments and every local input of the resolution."""
+    inputs = {
+        "arguments": arguments,
+        "index_url": get_index_url(),
+        "offline": is_offline(),
+        "preset": _preset_digest(arguments.get("use_case")),
+        "gpu": gpu_fingerprint(),
+        "compatibility": _file_digest(compatibility.DATA_FILE),
+        "environment": environment_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str):
+    return cache_dir("resolutions") / f"{key}.json"
+
+
+def load_resolution(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached result for ``key`` if its index snapshot still holds."""
+    entry = read_json(_entry_path(key))
+    if entry is None:
+        return None
+    try:
+        for url, digest in entry["index"].items():
+            if page_digest(url) != digest:
+                return None
+    except PyPIUnavailableError:
+        return None
+    return entry["result"]
+
+
+def store_resolution(key: str, result: Dict[str, Any], pages: Iterable[str]) -> None:
+    """Persist ``result`` together with digests of the index pages it used."""
+    try:
+        index = {url: page_digest(url) for url in sorted(pages)}
+    except PyPIUnavailableError:
+        return
+    write_json(_entry_path(key), {"index": index, "result": result})
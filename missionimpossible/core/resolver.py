@@ -4,11 +4,14 @@ Universal Stack Resolver with Dynamic YOLO Support
 
 from __future__ import annotations
 
-from .detector import detect_all_conflicts          # <- panggil detector di core
+from typing import Optional
+
+from ..resolvers.context import ResolutionContext
 from ..resolvers.yolo_resolver import resolve_yolo_stack
 from ..resolvers.framework_resolver import resolve_framework_stack
-from ..utils.preset_manager import get_preset
-from ..utils.environment import write_dockerfile as generate_dockerfile
+from ..resolvers.dependency_solver import solve_stack
+from ..utils.pypi_api import record_index_pages
+from .resolution_cache import load_resolution, resolution_key, store_resolution
 
 
 def generate_pip_command(stack: dict) -> str:
@@ -22,29 +25,92 @@ def resolve_universal_stack(
     yolo_family: str = "latest",
     gpu: bool = True,
     framework: str = "auto",
+    solve: bool = False,
+    use_cache: bool = True,
+    context: Optional[ResolutionContext] = None,
+    footprint: bool = False,
 ) -> dict:
-    """Resolve complete ML research stack."""
+    """
+    Resolve complete ML research stack.
+
+    With ``solve=True`` the preset, YOLO and framework layers are not just
+    overlaid: their constraints are solved together (with transitive
+    requirements) against the index into one consistent pinned set,
+    returned under "pinned". ResolutionImpossible is raised on conflicts.
+
+    Results are memoized on disk (see core.resolution_cache) and reused
+    while the arguments, preset files, GPU/driver state, installed
+    environment and consulted index pages are unchanged. Pass
+    ``use_cache=False`` to force a fresh resolution.
+
+    Every probe (diagnostics, GPU status, preset, index lookups) runs at
+    most once and is shared by all resolvers through a ResolutionContext.
+    Pass ``context`` to inject precomputed state or to share it between
+    several resolutions.
+
+    With ``footprint=True`` the download and installed size of the
+    resolved stack (per package, in total, and smaller equivalents used
+    by other presets) is added under "footprint"; see core.footprint.
+    """
+    context = context or ResolutionContext()
+    if not use_cache:
+        result = _resolve_stack(context, use_case, yolo_family, gpu, framework, solve)
+    else:
+        key = resolution_key(
+            use_case=use_case, yolo_family=yolo_family, gpu=gpu,
+            framework=framework, solve=solve,
+        )
+        result = load_resolution(key)
+        if result is None:
+            with record_index_pages() as pages:
+                result = _resolve_stack(context, use_case, yolo_family, gpu, framework, solve)
+            store_resolution(key, result, pages)
+
+    if footprint:
+        from .footprint import estimate_footprint
+        result["footprint"] = estimate_footprint(
+            result.get("pinned", result["preset"]), provider=context.index_provider(),
+        )
+    return result
+
 
+def _resolve_stack(
+    context: ResolutionContext,
+    use_case: str,
+    yolo_family: str,
+    gpu: bool,
+    framework: str,
+    solve: bool,
+) -> dict:
     # 1. Detect current state
-    diagnostics = detect_all_conflicts()
+    diagnostics = context.diagnostics()
 
     # 2. Generate dynamic preset
-    preset = get_preset(use_case)
+    preset = context.preset(use_case)
+    layers = [(f"preset:{use_case}", dict(preset))]
 
     # 3. Dynamic YOLO integration
-    yolo_stack = resolve_yolo_stack(yolo_family=yolo_family, gpu=gpu)
+    yolo_stack = resolve_yolo_stack(yolo_family=yolo_family, gpu=gpu, context=context)
     preset.update(yolo_stack)
+    layers.append(("yolo", yolo_stack))
 
     # 4. Framework auto-resolution
     if framework == "auto":
-        framework_stack = resolve_framework_stack(prefer="auto")
+        framework_stack = resolve_framework_stack(prefer="auto", context=context)
     else:
-        framework_stack = resolve_framework_stack(prefer=framework)
+        framework_stack = resolve_framework_stack(prefer=framework, context=context)
     preset.update(framework_stack)
+    layers.append(("framework", framework_stack))
 
-    return {
+    result = {
         "preset": preset,
         "diagnostics": diagnostics,
         "install_command": generate_pip_command(preset),
-        "dockerfile": generate_dockerfile(preset),
     }
+
+    # 5. Consistent pinned set over all layers
+    if solve:
+        pinned = solve_stack(layers, provider=context.index_provider())
+        result["pinned"] = pinned
+        result["install_command"] = generate_pip_command(pinned)
+    return result
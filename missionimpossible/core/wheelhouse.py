@@ -0,0 +1,292 @@
+"""
+Content-addressed local wheelhouse.
+
+A resolved stack is expanded by pip (``pip install --dry-run --report``)
+into the exact files it would install, and those files are downloaded in
+parallel into a store keyed by their sha256:
+
+    <root>/sha256/<aa>/<digest>/<filename>
+
+Files already present are not downloaded again, so several venvs or nodes
+sharing the store (e.g. on NFS) fetch torch / tensorflow only once.
+Installing from the store uses ``pip install --no-index --find-links``.
+The store is trimmed to a size limit by evicting the least recently
+prefetched files first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+from urllib.request import url2pathname
+
+from ..utils.cache import cache_dir
+from ..utils.pypi_api import MAX_WORKERS, get_index_url, get_session
+
+# Default size limit, overridable with $MISSIONIMPOSSIBLE_WHEELHOUSE_MAX_SIZE.
+DEFAULT_MAX_SIZE = "50G"
+DOWNLOAD_TIMEOUT = 60
+_CHUNK = 1 << 20
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.I)
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(text: str) -> int:
+    """Parse "500M", "50G", "1.5TB" or a plain byte count."""
+    match = _SIZE_RE.match(str(text))
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    number, unit = match.groups()
+    return int(float(number) * _UNITS[unit.upper()])
+
+
+def default_wheelhouse() -> Path:
+    return Path(os.environ.get("MISSIONIMPOSSIBLE_WHEELHOUSE") or cache_dir("wheelhouse"))
+
+
+def default_max_size() -> int:
+    return parse_size(os.environ.get("MISSIONIMPOSSIBLE_WHEELHOUSE_MAX_SIZE", DEFAULT_MAX_SIZE))
+
+
+def _blob_dir(root: Path, sha256: str) -> Path:
+    return root / "sha256" / sha256[:2] / sha256
+
+
+def stored_files(root: Path) -> List[Path]:
+    """All files in the wheelhouse."""
+    return sorted(p for p in root.glob("sha256/*/*/*") if not p.name.startswith(".tmp-"))
+
+
+def plan_downloads(
+    requirements: List[str],
+    python_exe: Optional[str] = None,
+    index_url: Optional[str] = None,
+    target: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ask pip which files installing ``requirements`` would fetch.
+
+    Parameters
+    ----------
+    target : dict, optional
+        Select files for another platform instead of the interpreter:
+        {"python_version": "3.10", "platform": "manylinux2014_x86_64",
+        "implementation": "cp"}. Binary wheels only; environment markers
+        are still evaluated for the interpreter running pip.
+
+    Returns
+    -------
+    list of dict : [{"name", "version", "url", "filename", "sha256" or None}]
+        covering the full transitive closure for the target interpreter.
+    """
+    cmd = [
+        python_exe or sys.executable, "-m", "pip", "install",
+        "--dry-run", "--ignore-installed", "--quiet", "--report", "-",
+        "--index-url", index_url or get_index_url(),
+    ]
+    scratch = None
+    if target:
+        # pip only accepts platform options for a --target install; with
+        # --dry-run nothing is written there
+        scratch = tempfile.mkdtemp(prefix="missionimpossible-target-")
+        cmd += [
+            "--target", scratch, "--only-binary=:all:",
+            "--platform", target["platform"],
+            "--python-version", target["python_version"],
+            "--implementation", target.get("implementation", "cp"),
+        ]
+    try:
+        proc = subprocess.run(cmd + list(requirements), capture_output=True, text=True)
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"pip could not resolve the stack:\n{proc.stderr.strip()}")
+    report = json.loads(proc.stdout)
+
+    plan = []
+    for item in report.get("install", []):
+        info = item["download_info"]
+        hashes = info.get("archive_info", {}).get("hashes", {})
+        plan.append({
+            "name": item["metadata"]["name"],
+            "version": item["metadata"]["version"],
+            "url": info["url"],
+            "filename": unquote(urlsplit(info["url"]).path.rsplit("/", 1)[-1]),
+            "sha256": hashes.get("sha256"),
+        })
+    return plan
+
+
+def _store(chunks, root: Path, filename: str, expected: Optional[str]) -> Path:
+    """Stream ``chunks`` into the store, checking the sha256; returns the stored path."""
+    staging_root = root / "sha256"
+    staging_root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=staging_root, prefix=".tmp-"))
+    try:
+        digest = hashlib.sha256()
+        with (staging / filename).open("wb") as out:
+            for chunk in chunks:
+                digest.update(chunk)
+                out.write(chunk)
+        actual = digest.hexdigest()
+        if expected and actual != expected:
+            raise RuntimeError(f"sha256 mismatch for {filename}: expected {expected}, got {actual}")
+        final = _blob_dir(root, actual)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(staging, final)
+        except OSError:
+            # another process stored the same content first
+            if not (final / filename).exists():
+                raise
+        return final / filename
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _fetch(root: Path, entry: Dict[str, Any]) -> Path:
+    filename, sha256 = entry["filename"], entry["sha256"]
+    if sha256:
+        existing = _blob_dir(root, sha256) / filename
+        if existing.exists():
+            os.utime(existing.parent)  # recently used, see evict()
+            return existing
+
+    url = entry["url"]
+    if url.startswith("file:"):
+        with open(url2pathname(urlsplit(url).path), "rb") as f:
+            return _store(iter(lambda: f.read(_CHUNK), b""), root, filename, sha256)
+    with get_session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+        resp.raise_for_status()
+        return _store(resp.iter_content(_CHUNK), root, filename, sha256)
+
+
+def prefetch(
+    requirements: List[str],
+    root: Optional[Path] = None,
+    python_exe: Optional[str] = None,
+    max_workers: int = MAX_WORKERS,
+    max_size: Optional[int] = None,
+    plan: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Download every file needed to install ``requirements`` into the wheelhouse.
+
+    Parameters
+    ----------
+    requirements : list of str
+        Requirement strings, e.g. ["torch==2.1.0", "ultralytics>=8.3"].
+    root : Path, optional
+        Wheelhouse directory (default: $MISSIONIMPOSSIBLE_WHEELHOUSE or
+        the cache directory).
+    python_exe : str, optional
+        Interpreter the files are selected for (wheel tags, markers).
+    max_workers : int
+        Parallel downloads.
+    max_size : int, optional
+        Size limit in bytes applied after the download (see evict).
+    plan : list of dict, optional
+        Files to fetch, as returned by plan_downloads (e.g. the packages of
+        a lockfile); ``requirements`` is not resolved when given.
+
+    Returns
+    -------
+    dict : {"files": [paths], "downloaded": int, "evicted": [paths]}
+    """
+    root = Path(root or default_wheelhouse())
+    root.mkdir(parents=True, exist_ok=True)
+    if plan is None:
+        plan = plan_downloads(requirements, python_exe=python_exe)
+    before = set(stored_files(root))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(plan) or 1))) as pool:
+        files = list(pool.map(lambda entry: _fetch(root, entry), plan))
+
+    evicted = evict(root, max_size if max_size is not None else default_max_size(), keep=files)
+    return {
+        "files": files,
+        "downloaded": len(set(files) - before),
+        "evicted": evicted,
+    }
+
+
+def evict(root: Path, max_size: int, keep: Optional[List[Path]] = None) -> List[Path]:
+    """
+    Remove least recently prefetched files until the store fits ``max_size``.
+
+    Files listed in ``keep`` are never removed.
+    """
+    keep_dirs = {Path(p).parent for p in keep or []}
+    entries = []
+    total = 0
+    for path in stored_files(Path(root)):
+        try:
+            size = path.stat().st_size
+            used = path.parent.stat().st_mtime
+        except OSError:
+            continue  # evicted concurrently
+        total += size
+        entries.append((used, size, path))
+
+    removed = []
+    for used, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        if path.parent in keep_dirs:
+            continue
+        shutil.rmtree(path.parent, ignore_errors=True)
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def find_links_page(root: Path) -> Path:
+    """
+    Write an HTML page linking every stored file, for ``pip --find-links``.
+
+    pip only lists the top level of a --find-links directory, so the
+    nested store is exposed through a page generated per install.
+    """
+    lines = ["<!DOCTYPE html>", "<html><body>"]
+    for path in stored_files(Path(root)):
+        lines.append(f'<a href="{path.resolve().as_uri()}">{path.name}</a><br/>')
+    lines.append("</body></html>")
+    fd, page = tempfile.mkstemp(prefix="missionimpossible-wheelhouse-", suffix=".html")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return Path(page)
+
+
+def find_links_dir(root: Path) -> Path:
+    """
+    Create a flat directory linking every stored file, for ``--find-links``
+    of installers that do not read HTML pages (uv).
+
+    Entries are symlinks (hardlinks or copies where symlinks are not
+    allowed); the caller removes the directory after the install.
+    """
+    flat = Path(tempfile.mkdtemp(prefix="missionimpossible-wheelhouse-"))
+    for path in stored_files(Path(root)):
+        link = flat / path.name
+        if os.path.lexists(link):  # same file name stored under another digest
+            continue
+        try:
+            os.symlink(path.resolve(), link)
+        except OSError:
+            try:
+                os.link(path, link)
+            except OSError:
+                shutil.copy2(path, link)
+    return flat
+
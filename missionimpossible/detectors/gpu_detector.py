@@ -1,59 +1,244 @@
 """
 GPU / CUDA detector: basic info about GPU availability and CUDA toolkit.
+
+By default nothing heavy is imported: devices come from NVML when
+libnvidia-ml is present (falling back to ``nvidia-smi`` and the driver's
+``/proc/driver/nvidia`` entries) and the CUDA builds of TensorFlow / PyTorch
+are read from their installed build-info files. Importing the frameworks
+in-process (slow, may create CUDA contexts) is an explicit opt-in.
 """
 
 from __future__ import annotations
+import hashlib
+import json
+import os
+import re
 import subprocess
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..utils.metadata import installed_distributions, canonicalize_name
+from ..utils.nvml import gpu_inventory, lowest_compute_capability
+
+# nvidia-smi can hang for a long time on a wedged driver
+NVIDIA_SMI_TIMEOUT = 10.0
+
+NVIDIA_PROC_DIR = Path("/proc/driver/nvidia")
+
+_DRIVER_VERSION_RE = re.compile(r"Kernel Module\s+(?:for\s+\S+\s+)?(\d+(?:\.\d+)+)")
+_TORCH_CUDA_RE = re.compile(r"^cuda\s*(?::[^=]*)?=\s*['\"]([^'\"]+)['\"]", re.M)
+_TF_CUDA_BUILD_RE = re.compile(r"['\"]is_cuda_build['\"]\s*:\s*(True|False)")
+_TF_CUDA_VERSION_RE = re.compile(r"['\"]cuda_version['\"]\s*:\s*['\"]([^'\"]*)['\"]")
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+
+
+def _driver_info(proc_dir: Path = NVIDIA_PROC_DIR) -> Dict[str, Any]:
+    """Read driver version and GPU count from the kernel module's procfs."""
+    text = _read_text(proc_dir / "version")
+    match = _DRIVER_VERSION_RE.search(text or "")
+    gpus_dir = proc_dir / "gpus"
+    gpu_count = len(list(gpus_dir.iterdir())) if gpus_dir.is_dir() else 0
+    return {
+        "driver_version": match.group(1) if match else None,
+        "gpu_count": gpu_count,
+    }
+
+
+def _cuda_visible(gpu_count: int) -> bool:
+    """Apply CUDA_VISIBLE_DEVICES the way the CUDA runtime would."""
+    if gpu_count == 0:
+        return False
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is None:
+        return True
+    first = visible.split(",")[0].strip()
+    return bool(first) and first != "-1"
+
+
+def gpu_fingerprint() -> str:
+    """
+    Cheap digest of the GPU / driver state, without starting nvidia-smi.
+
+    Changes when the driver, the set of devices or CUDA_VISIBLE_DEVICES
+    changes.
+    """
+    inventory = gpu_inventory()
+    if inventory is not None:
+        state: Any = inventory
+    else:
+        state = {
+            "proc_version": _read_text(NVIDIA_PROC_DIR / "version"),
+            "gpus": _driver_info()["gpu_count"],
+        }
+    state = {"gpu": state, "visible": os.environ.get("CUDA_VISIBLE_DEVICES")}
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
 
 
-def detect_gpu_status() -> Dict[str, Any]:
+def _package_file(dist_name: str, *parts: str) -> Optional[Path]:
+    info = installed_distributions().get(canonicalize_name(dist_name))
+    if info is None:
+        return None
+    return Path(info["path"]).parent.joinpath(*parts)
+
+
+def torch_cuda_build() -> Optional[str]:
+    """
+    CUDA version the installed torch was built against, from torch/version.py.
+
+    Returns "" for a CPU-only build and None if torch is not installed.
+    """
+    path = _package_file("torch", "torch", "version.py")
+    text = _read_text(path) if path else None
+    if text is None:
+        return None
+    match = _TORCH_CUDA_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def tf_cuda_build() -> Optional[str]:
+    """
+    CUDA version the installed TensorFlow was built against.
+
+    Read from tensorflow/python/platform/build_info.py. Returns "" for a
+    CPU-only build and None if TensorFlow is not installed.
+    """
+    for dist in ("tensorflow", "tensorflow-cpu", "tf-nightly"):
+        path = _package_file(dist, "tensorflow", "python", "platform", "build_info.py")
+        text = _read_text(path) if path else None
+        if text is None:
+            continue
+        build = _TF_CUDA_BUILD_RE.search(text)
+        if not build or build.group(1) != "True":
+            return ""
+        ver = _TF_CUDA_VERSION_RE.search(text)
+        return ver.group(1) if ver else ""
+    return None
+
+
+def _framework_visibility_static(gpu_visible: bool) -> Dict[str, Any]:
+    torch_cuda = torch_cuda_build()
+    tf_cuda = tf_cuda_build()
+    return {
+        "torch_cuda_build": torch_cuda,
+        "tf_cuda_build": tf_cuda,
+        "torch_gpu_visible": None if torch_cuda is None else bool(torch_cuda) and gpu_visible,
+        "tf_gpu_visible": None if tf_cuda is None else bool(tf_cuda) and gpu_visible,
+    }
+
+
+def _framework_visibility_import() -> Dict[str, Any]:
+    # TensorFlow GPU
+    try:
+        import tensorflow as tf  # type: ignore
+        tf_gpu_visible = bool(tf.config.list_physical_devices("GPU"))
+    except Exception:
+        tf_gpu_visible = None
+
+    # PyTorch GPU
+    try:
+        import torch  # type: ignore
+        torch_gpu_visible = bool(torch.cuda.is_available())
+    except Exception:
+        torch_gpu_visible = None
+
+    return {
+        "tf_gpu_visible": tf_gpu_visible,
+        "torch_gpu_visible": torch_gpu_visible,
+    }
+
+
+def detect_gpu_status(import_frameworks: bool = False,
+                      partial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Detect whether a GPU and CUDA are available.
 
+    Parameters
+    ----------
+    import_frameworks : bool
+        Import TensorFlow / PyTorch in-process and ask them directly.
+        Accurate but costs seconds and GBs of RSS; off by default, in
+        which case visibility is derived from the driver state and the
+        frameworks' build metadata.
+    partial : dict, optional
+        Filled in place as the probe goes (driver and devices first, then
+        framework visibility) and returned, so a caller that stops waiting
+        still has what was found so far.
+
     Returns
     -------
     dict with keys:
         cuda_version (str|None),
-        nvidia_smi_ok (bool),
+        nvidia_smi_ok (bool|None, None when NVML answered and nvidia-smi was skipped),
         tf_gpu_visible (bool|None),
-        torch_gpu_visible (bool|None)
+        torch_gpu_visible (bool|None),
+        driver_version (str|None),
+        gpu_count (int),
+        devices (list of {"index","name","memory_total","compute_capability"}),
+        compute_capability (str|None, lowest among devices),
+        probe ("static"|"import")
     """
+    info: Dict[str, Any] = {} if partial is None else partial
+    inventory = gpu_inventory()
+    if inventory is not None:
+        return _gpu_status_from_inventory(inventory, import_frameworks, info)
+
     # CUDA / driver via nvidia-smi
     try:
         smi = subprocess.run(
             ["nvidia-smi"],
             capture_output=True,
             text=True,
+            timeout=NVIDIA_SMI_TIMEOUT,
         )
         nvidia_smi_ok = smi.returncode == 0
         cuda_version = None
         if nvidia_smi_ok:
             for line in smi.stdout.splitlines():
                 if "CUDA Version" in line:
-                    cuda_version = line.split("CUDA Version")[-1].strip(" :")
+                    cuda_version = line.split("CUDA Version")[-1].strip(" :|")
                     break
-    except FileNotFoundError:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         nvidia_smi_ok = False
         cuda_version = None
+    info.update(cuda_version=cuda_version, nvidia_smi_ok=nvidia_smi_ok)
 
-    # TensorFlow GPU
-    try:
-        import tensorflow as tf  # type: ignore
-        tf_gpu_visible = bool(tf.config.list_physical_devices("GPU"))
-    except Exception:
-        tf_gpu_visible = None
+    driver = _driver_info()
+    info.update(
+        driver_version=driver["driver_version"],
+        gpu_count=driver["gpu_count"],
+        devices=[],
+        compute_capability=None,
+    )
+    # containers often expose nvidia-smi but not /proc/driver/nvidia/gpus
+    gpu_count = driver["gpu_count"] or int(nvidia_smi_ok)
+    return _add_framework_visibility(info, gpu_count, import_frameworks)
 
-    # PyTorch GPU
-    try:
-        import torch  # type: ignore
-        torch_gpu_visible = bool(torch.cuda.is_available())
-    except Exception:
-        torch_gpu_visible = None
 
-    return {
-        "cuda_version": cuda_version,
-        "nvidia_smi_ok": nvidia_smi_ok,
-        "tf_gpu_visible": tf_gpu_visible,
-        "torch_gpu_visible": torch_gpu_visible,
-    }
+def _gpu_status_from_inventory(inventory: Dict[str, Any], import_frameworks: bool,
+                               info: Dict[str, Any]) -> Dict[str, Any]:
+    devices = inventory["devices"]
+    info.update(
+        cuda_version=inventory["cuda_driver_version"],
+        nvidia_smi_ok=None,
+        driver_version=inventory["driver_version"],
+        gpu_count=len(devices),
+        devices=devices,
+        compute_capability=lowest_compute_capability(devices),
+    )
+    return _add_framework_visibility(info, len(devices), import_frameworks)
+
+
+def _add_framework_visibility(info: Dict[str, Any], gpu_count: int, import_frameworks: bool) -> Dict[str, Any]:
+    if import_frameworks:
+        info.update(_framework_visibility_import())
+        info["probe"] = "import"
+    else:
+        info.update(_framework_visibility_static(_cuda_visible(gpu_count)))
+        info["probe"] = "static"
+    return info
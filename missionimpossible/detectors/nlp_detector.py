@@ -3,23 +3,10 @@ NLP stack detector: NLTK, Transformers, spaCy.
 """
 
 from __future__ import annotations
-import subprocess
-import sys
 from typing import Dict, Any
 
-
-def _pip_show(name: str) -> str | None:
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "show", name],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return None
-    for line in result.stdout.splitlines():
-        if line.lower().startswith("version:"):
-            return line.split(":", 1)[1].strip()
-    return None
+from ..utils.dependency_check import check_dependencies, format_conflicts
+from ..utils.metadata import get_installed_version
 
 
 def detect_nlp_conflicts() -> Dict[str, Any]:
@@ -32,17 +19,13 @@ def detect_nlp_conflicts() -> Dict[str, Any]:
         nltk_version, transformers_version, spacy_version,
         pip_conflicts (bool), pip_output (str)
     """
-    pip_check = subprocess.run(
-        [sys.executable, "-m", "pip", "check"],
-        capture_output=True,
-        text=True,
-    )
+    conflicts = check_dependencies()
 
     info = {
-        "nltk_version": _pip_show("nltk"),
-        "transformers_version": _pip_show("transformers"),
-        "spacy_version": _pip_show("spacy"),
-        "pip_conflicts": pip_check.returncode != 0,
-        "pip_output": pip_check.stdout.strip(),
+        "nltk_version": get_installed_version("nltk"),
+        "transformers_version": get_installed_version("transformers"),
+        "spacy_version": get_installed_version("spacy"),
+        "pip_conflicts": bool(conflicts),
+        "pip_output": format_conflicts(conflicts),
     }
     return info
@@ -3,23 +3,10 @@ Computer Vision detector: OpenCV, Albumentations, Segment-Anything.
 """
 
 from __future__ import annotations
-import subprocess
-import sys
 from typing import Dict, Any
 
-
-def _pip_show(name: str) -> str | None:
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "show", name],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return None
-    for line in result.stdout.splitlines():
-        if line.lower().startswith("version:"):
-            return line.split(":", 1)[1].strip()
-    return None
+from ..utils.dependency_check import check_dependencies, format_conflicts
+from ..utils.metadata import get_installed_version
 
 
 def detect_vision_conflicts() -> Dict[str, Any]:
@@ -32,17 +19,13 @@ def detect_vision_conflicts() -> Dict[str, Any]:
         opencv_version, albumentations_version, sam_version,
         pip_conflicts (bool), pip_output (str)
     """
-    pip_check = subprocess.run(
-        [sys.executable, "-m", "pip", "check"],
-        capture_output=True,
-        text=True,
-    )
+    conflicts = check_dependencies()
 
     info = {
-        "opencv_version": _pip_show("opencv-python"),
-        "albumentations_version": _pip_show("albumentations"),
-        "sam_version": _pip_show("segment-anything"),
-        "pip_conflicts": pip_check.returncode != 0,
-        "pip_output": pip_check.stdout.strip(),
+        "opencv_version": get_installed_version("opencv-python"),
+        "albumentations_version": get_installed_version("albumentations"),
+        "sam_version": get_installed_version("segment-anything"),
+        "pip_conflicts": bool(conflicts),
+        "pip_output": format_conflicts(conflicts),
     }
     return info
@@ -0,0 +1,216 @@
+"""
+CUDA / framework compatibility data and its lookup index.
+
+The bundled dataset (missionimpossible/data/compatibility.json) lists:
+
+- builds: framework release, build tag (e.g. "cu121"), CUDA and cuDNN it
+  was built against, and the Python versions it has wheels for,
+- drivers: minimum Linux driver of every CUDA toolkit,
+- architectures: CUDA toolkits able to target each GPU compute capability,
+- yolo: torch release recommended for each YOLO family.
+
+Tables are stored as {"columns": [...], "rows": [[...], ...]}; the file
+carries a "schema" (format) and a "dataset" (content) version.
+
+The file is parsed once into a CompatibilityIndex. Builds are bucketed
+per (framework, Python minor) and sorted by CUDA version, with a sparse
+table of the newest release over every CUDA range, so a query such as
+"newest torch build that runs on driver 535 with Python 3.11 on an sm_90
+GPU" is a few bisects plus one O(1) range-maximum lookup, however large
+the dataset grows.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from packaging.version import Version
+
+DATA_FILE = Path(__file__).resolve().parents[1] / "data" / "compatibility.json"
+SCHEMA_VERSION = 1
+
+# (release, CUDA) of a build; the larger one wins a lookup, so among
+# builds of the same release the one for the newest usable CUDA is chosen
+_Rank = Tuple[Version, Version]
+
+
+def _rows(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [dict(zip(table["columns"], row)) for row in table["rows"]]
+
+
+def _minor(version: str) -> Tuple[int, int]:
+    release = Version(version).release
+    return release[0], release[1] if len(release) > 1 else 0
+
+
+def _current_python() -> str:
+    return "%d.%d" % sys.version_info[:2]
+
+
+class _RangeMax:
+    """Sparse table: position of the largest value in values[lo:hi], in O(1)."""
+
+    def __init__(self, values: List[_Rank]):
+        self.values = values
+        self.levels = [list(range(len(values)))]
+        span = 1
+        while 2 * span <= len(values):
+            below = self.levels[-1]
+            self.levels.append([
+                self._larger(below[i], below[i + span])
+                for i in range(len(values) - 2 * span + 1)
+            ])
+            span *= 2
+
+    def _larger(self, a: int, b: int) -> int:
+        return a if self.values[a] >= self.values[b] else b
+
+    def query(self, lo: int, hi: int) -> Optional[int]:
+        if lo >= hi:
+            return None
+        level = (hi - lo).bit_length() - 1
+        row = self.levels[level]
+        return self._larger(row[lo], row[hi - (1 << level)])
+
+
+class CompatibilityIndex:
+    """
+    Sorted / bisect lookups over a compatibility dataset.
+
+    Parameters
+    ----------
+    data : dict
+        Parsed compatibility.json (see module doc).
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        if data.get("schema") != SCHEMA_VERSION:
+            raise ValueError(f"unsupported compatibility data schema {data.get('schema')!r}")
+        self.dataset = data.get("dataset")
+        self.builds = _rows(data["builds"])
+
+        buckets: Dict[Tuple[str, Tuple[int, int]], List[Dict[str, Any]]] = {}
+        for row in self.builds:
+            (major, low), (_, high) = _minor(row["python_min"]), _minor(row["python_max"])
+            for minor in range(low, high + 1):
+                buckets.setdefault((row["framework"], (major, minor)), []).append(row)
+
+        # GPU builds per bucket, sorted by CUDA: (CUDA keys, rows, range max)
+        self._gpu: Dict[Tuple[str, Tuple[int, int]], Tuple[List[Version], List[dict], _RangeMax]] = {}
+        # newest release per bucket, for CPU-only use
+        self._newest: Dict[Tuple[str, Tuple[int, int]], str] = {}
+        for key, rows in buckets.items():
+            self._newest[key] = str(max(Version(r["version"]) for r in rows))
+            gpu = sorted((r for r in rows if r["cuda"]), key=lambda r: Version(r["cuda"]))
+            if gpu:
+                self._gpu[key] = (
+                    [Version(r["cuda"]) for r in gpu],
+                    gpu,
+                    _RangeMax([(Version(r["version"]), Version(r["cuda"])) for r in gpu]),
+                )
+
+        drivers = sorted(_rows(data["drivers"]), key=lambda r: Version(r["min_driver"]))
+        self._driver_keys = [Version(r["min_driver"]) for r in drivers]
+        # newest CUDA among all toolkits up to each driver (prefix maximum)
+        self._driver_cuda: List[Version] = []
+        for row in drivers:
+            cuda = Version(row["cuda"])
+            self._driver_cuda.append(max(cuda, self._driver_cuda[-1]) if self._driver_cuda else cuda)
+
+        arches = sorted(_rows(data["architectures"]), key=lambda r: Version(r["compute_capability"]))
+        self._arch_keys = [Version(r["compute_capability"]) for r in arches]
+        self._arch_bounds = [
+            (Version(r["min_cuda"]) if r["min_cuda"] else None,
+             Version(r["max_cuda"]) if r["max_cuda"] else None)
+            for r in arches
+        ]
+
+        self._yolo = {r["family"]: r["torch"] for r in _rows(data.get("yolo", {"columns": [], "rows": []}))}
+
+    def releases(self, framework: str) -> List[str]:
+        """Known releases of ``framework``, oldest first."""
+        versions = {Version(r["version"]) for r in self.builds if r["framework"] == framework}
+        return [str(v) for v in sorted(versions)]
+
+    def max_cuda_for_driver(self, driver_version: str) -> Optional[Version]:
+        """Newest CUDA toolkit the driver supports (None if older than all of them)."""
+        i = bisect.bisect_right(self._driver_keys, Version(driver_version))
+        return self._driver_cuda[i - 1] if i else None
+
+    def cuda_range_for_capability(self, compute_capability: str) -> Tuple[Optional[Version], Optional[Version]]:
+        """(oldest, newest) CUDA toolkit able to target a GPU architecture; None = unbounded."""
+        i = bisect.bisect_right(self._arch_keys, Version(compute_capability))
+        return self._arch_bounds[i - 1] if i else (None, None)
+
+    def newest_build(
+        self,
+        framework: str,
+        python_version: Optional[str] = None,
+        cuda_version: Optional[str] = None,
+        driver_version: Optional[str] = None,
+        compute_capability: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Newest GPU build of ``framework`` that runs with the given constraints.
+
+        Parameters
+        ----------
+        python_version : str, optional
+            "3.11" (default: the running interpreter).
+        cuda_version : str, optional
+            Newest CUDA the driver supports (nvidia-smi "CUDA Version").
+        driver_version : str, optional
+            NVIDIA driver, e.g. "535.104.05".
+        compute_capability : str, optional
+            Lowest compute capability among the GPUs, e.g. "8.6".
+
+        Returns
+        -------
+        dict or None : the build row {"framework", "version", "build",
+            "cuda", "cudnn", "python_min", "python_max"}.
+        """
+        low: Optional[Version] = None
+        high = Version(cuda_version) if cuda_version else None
+        if driver_version:
+            limit = self.max_cuda_for_driver(driver_version)
+            if limit is None:
+                return None
+            high = limit if high is None else min(high, limit)
+        if compute_capability:
+            low, cap_high = self.cuda_range_for_capability(compute_capability)
+            if cap_high is not None:
+                high = cap_high if high is None else min(high, cap_high)
+
+        bucket = self._gpu.get((framework, _minor(python_version or _current_python())))
+        if bucket is None:
+            return None
+        keys, rows, newest = bucket
+        lo = bisect.bisect_left(keys, low) if low is not None else 0
+        hi = bisect.bisect_right(keys, high) if high is not None else len(keys)
+        i = newest.query(lo, hi)
+        return dict(rows[i]) if i is not None else None
+
+    def newest_release(self, framework: str, python_version: Optional[str] = None) -> Optional[str]:
+        """Newest release of ``framework`` with wheels for ``python_version`` (any build)."""
+        return self._newest.get((framework, _minor(python_version or _current_python())))
+
+    def yolo_torch(self, family: str) -> Optional[str]:
+        """Torch release recommended for a YOLO family ("8", "10", "11")."""
+        return self._yolo.get(family)
+
+
+def build_pin(row: Dict[str, Any]) -> str:
+    """Version pin of a build row: "2.1.0+cu121" for tagged builds, else the release."""
+    return f"{row['version']}+{row['build']}" if row.get("build") else row["version"]
+
+
+@functools.lru_cache(maxsize=None)
+def load_index(path: Optional[str] = None) -> CompatibilityIndex:
+    """The compatibility index of ``path`` (default: the bundled dataset), parsed once."""
+    with open(path or DATA_FILE, encoding="utf-8") as f:
+        return CompatibilityIndex(json.load(f))
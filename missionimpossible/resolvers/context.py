@@ -0,0 +1,98 @@
+"""
+Shared state of one resolution.
+
+A ResolutionContext runs each probe (diagnostics, GPU status, preset
+lookup, index release lists) at most once and hands the result to every
+resolver that asks for it, so one resolve does not start nvidia-smi or
+import TensorFlow / PyTorch twice. Callers can pre-fill any part of it
+(e.g. from a cached detection run) and pass the same context to several
+resolutions.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from missionimpossible.core.detector import detect_all_conflicts
+from missionimpossible.detectors.gpu_detector import detect_gpu_status
+from missionimpossible.resolvers.dependency_solver import IndexProvider
+from missionimpossible.utils.preset_manager import get_preset
+from missionimpossible.utils.pypi_api import get_pypi_releases
+
+
+class ResolutionContext:
+    """
+    Lazily computed, memoized inputs of a stack resolution.
+
+    Parameters
+    ----------
+    diagnostics : dict, optional
+        Precomputed detect_all_conflicts() result.
+    gpu_info : dict, optional
+        Precomputed detect_gpu_status() result.
+    presets : dict, optional
+        {preset name: stack} overriding the preset files.
+    releases : dict, optional
+        {package name: [versions]} overriding index lookups.
+    import_frameworks : bool
+        Passed to the GPU probe (see detect_gpu_status).
+    """
+
+    def __init__(
+        self,
+        diagnostics: Optional[Dict[str, Any]] = None,
+        gpu_info: Optional[Dict[str, Any]] = None,
+        presets: Optional[Dict[str, Dict[str, str]]] = None,
+        releases: Optional[Dict[str, List[str]]] = None,
+        import_frameworks: bool = False,
+    ):
+        self._diagnostics = diagnostics
+        self._gpu_info = gpu_info
+        self._presets: Dict[str, Dict[str, str]] = dict(presets or {})
+        self._releases: Dict[str, List[str]] = dict(releases or {})
+        self.import_frameworks = import_frameworks
+        self._provider = None
+        self._lock = threading.RLock()
+
+    def diagnostics(self) -> Dict[str, Any]:
+        """detect_all_conflicts() result; its GPU probe is shared with gpu_info()."""
+        with self._lock:
+            if self._diagnostics is None:
+                self._diagnostics = detect_all_conflicts(
+                    import_frameworks=self.import_frameworks,
+                    gpu_status=self._gpu_info,
+                )
+            return self._diagnostics
+
+    def gpu_info(self) -> Dict[str, Any]:
+        """detect_gpu_status() result, reusing the diagnostics pass when it has one."""
+        with self._lock:
+            if self._gpu_info is None:
+                probed = (self._diagnostics or {}).get("gpu", {})
+                if probed.get("status") == "ok":
+                    self._gpu_info = {k: v for k, v in probed.items() if k != "status"}
+                else:
+                    self._gpu_info = detect_gpu_status(import_frameworks=self.import_frameworks)
+            return self._gpu_info
+
+    def preset(self, name: str) -> Dict[str, str]:
+        """A copy of preset ``name`` (callers may update it in place)."""
+        with self._lock:
+            if name not in self._presets:
+                self._presets[name] = get_preset(name)
+            return dict(self._presets[name])
+
+    def releases(self, package: str) -> List[str]:
+        """Versions of ``package`` on the index."""
+        with self._lock:
+            if package not in self._releases:
+                self._releases[package] = get_pypi_releases(package)
+            return list(self._releases[package])
+
+    def index_provider(self):
+        """IndexProvider shared by every solve run with this context."""
+        with self._lock:
+            if self._provider is None:
+                self._provider = IndexProvider()
+            return self._provider
@@ -0,0 +1,388 @@
+"""
+Backtracking dependency solver for MissionImPossible.
+
+Takes the constraints of every stack layer (preset, YOLO, framework),
+walks their transitive requirements against index metadata and returns
+one consistent set of pins, or raises ResolutionImpossible explaining
+which requirements clash.
+
+The search is a depth-first backtracking solver:
+- packages closest to the root requirements are pinned first, ties going
+  to the one with the fewest remaining candidates,
+- candidate lists are memoized per (package, specifier set),
+- dead ends are traced to the pins that caused them, and the search jumps
+  back to the most recent of those instead of retrying unrelated choices,
+- ``foo[bar]`` is handled as a virtual package depending on ``foo==X``
+  plus the requirements of extra ``bar``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from email.parser import HeaderParser
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from packaging.markers import default_environment
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.tags import sys_tags
+from packaging.utils import canonicalize_name, parse_wheel_filename
+from packaging.version import InvalidVersion, Version
+
+from missionimpossible.utils.pypi_api import (
+    get_core_metadata,
+    get_project_page,
+    version_from_filename,
+)
+
+# Hard cap on search steps so pathological inputs fail fast.
+MAX_ROUNDS = 20000
+
+# (requirement, who asked for it)
+Constraint = Tuple[Requirement, str]
+
+
+class ResolutionImpossible(Exception):
+    """No set of versions satisfies all constraints."""
+
+    def __init__(self, name: str, causes: List[Tuple[str, str]]):
+        self.name = name
+        self.causes = causes
+        lines = [f"Cannot find a version of {name} that satisfies:"]
+        lines += [f"  {req}  (required by {parent})" for req, parent in causes]
+        super().__init__("\n".join(lines))
+
+
+class ResolutionTooDeep(RuntimeError):
+    """The search exceeded MAX_ROUNDS steps."""
+
+
+def spec_to_requirement(name: str, spec: str) -> Requirement:
+    """
+    Turn a stack entry into a Requirement.
+
+    Stack values are either bare versions ("2.15.0" -> ==2.15.0), specifiers
+    (">=1.4") or full requirement strings ("ultralytics>=8.3.234").
+    """
+    spec = str(spec).strip()
+    if not spec:
+        return Requirement(name)
+    if spec[0].isdigit():
+        return Requirement(f"{name}=={spec}")
+    if spec[0] in "<>=!~":
+        return Requirement(f"{name}{spec}")
+    return Requirement(spec)
+
+
+class IndexProvider:
+    """
+    Candidate versions and dependencies from the package index.
+
+    Only versions with a file installable on the target interpreter
+    (compatible wheel tag or sdist, matching Requires-Python, not yanked)
+    are offered.
+    """
+
+    def __init__(self, environment: Optional[Dict[str, str]] = None):
+        self.environment = environment or default_environment()
+        self.python_version = Version(self.environment["python_full_version"])
+        # most specific tag first, as pip prefers them
+        self._tag_rank = {tag: i for i, tag in enumerate(sys_tags())}
+        self.supported_tags = set(self._tag_rank)
+        self.missing_metadata: List[str] = []
+
+    def _file_usable(self, entry: dict) -> bool:
+        if entry.get("yanked"):
+            return False
+        requires_python = entry.get("requires-python")
+        if requires_python:
+            try:
+                if not SpecifierSet(requires_python).contains(self.python_version, prereleases=True):
+                    return False
+            except InvalidSpecifier:
+                pass
+        filename = entry["filename"]
+        if filename.endswith(".whl"):
+            try:
+                tags = parse_wheel_filename(filename)[3]
+            except ValueError:
+                return False
+            return not self.supported_tags.isdisjoint(tags)
+        return filename.endswith((".tar.gz", ".zip"))
+
+    def get_versions(self, name: str) -> List[str]:
+        usable = {
+            version_from_filename(f["filename"])
+            for f in get_project_page(name).get("files", [])
+            if self._file_usable(f)
+        }
+        usable.discard(None)
+        return list(usable)
+
+    def get_files(self, name: str, version: str) -> List[dict]:
+        """Usable files of one release, best first (most specific wheel, sdists last)."""
+        version = str(Version(version))
+        worst = len(self._tag_rank)
+
+        def rank(entry: dict) -> int:
+            if not entry["filename"].endswith(".whl"):
+                return worst
+            tags = parse_wheel_filename(entry["filename"])[3]
+            return min(self._tag_rank.get(tag, worst) for tag in tags)
+
+        usable = [
+            f for f in get_project_page(name).get("files", [])
+            if self._file_usable(f) and version_from_filename(f["filename"]) == version
+        ]
+        return sorted(usable, key=rank)
+
+    def get_dependencies(self, name: str, version: str) -> List[str]:
+        text = get_core_metadata(name, version)
+        if text is None:
+            self.missing_metadata.append(f"{name}=={version}")
+            return []
+        return HeaderParser().parsestr(text).get_all("Requires-Dist") or []
+
+
+class BacktrackingSolver:
+    """
+    Resolve requirements to pins with a memoized backtracking search.
+
+    Parameters
+    ----------
+    provider : object
+        Exposes ``get_versions(name) -> [str]`` and
+        ``get_dependencies(name, version) -> [requirement str]``.
+    environment : dict, optional
+        Marker environment of the target interpreter.
+    max_rounds : int
+        Search step budget before ResolutionTooDeep is raised.
+    """
+
+    def __init__(self, provider, environment: Optional[Dict[str, str]] = None,
+                 max_rounds: int = MAX_ROUNDS):
+        self.provider = provider
+        self.environment = environment or getattr(provider, "environment", None) or default_environment()
+        self.max_rounds = max_rounds
+        self._versions: Dict[str, List[Version]] = {}
+        self._candidate_cache: Dict[Tuple[str, frozenset], List[Version]] = {}
+        # candidates under the current constraints, dropped when they change
+        self._current: Dict[str, List[Version]] = {}
+        self._dependency_cache: Dict[Tuple[str, Version], List[Requirement]] = {}
+        # key -> [(requirement, parent label, parent key or None for roots)]
+        self._constraints: Dict[str, List[Tuple[Requirement, str, Optional[str]]]] = {}
+        self._pins: Dict[str, Version] = {}
+        self._depths: Dict[str, int] = {}
+        self._conflicts: Counter = Counter()
+        self._last_causes: Dict[str, List[Tuple[str, str]]] = {}
+        self.rounds = 0
+
+    # -- candidates -------------------------------------------------------
+
+    @staticmethod
+    def _key(req: Requirement) -> str:
+        name = canonicalize_name(req.name)
+        if req.extras:
+            return f"{name}[{','.join(sorted(canonicalize_name(e) for e in req.extras))}]"
+        return name
+
+    @staticmethod
+    def _split_key(key: str) -> Tuple[str, List[str]]:
+        name, _, extras = key.partition("[")
+        return name, [e for e in extras.rstrip("]").split(",") if e]
+
+    def _all_versions(self, name: str) -> List[Version]:
+        if name not in self._versions:
+            parsed = []
+            for raw in self.provider.get_versions(name):
+                try:
+                    parsed.append(Version(raw))
+                except InvalidVersion:
+                    continue
+            self._versions[name] = sorted(set(parsed), reverse=True)
+        return self._versions[name]
+
+    def _candidates(self, key: str) -> List[Version]:
+        current = self._current.get(key)
+        if current is not None:
+            return current
+        specs = frozenset(str(req.specifier) for req, _, _ in self._constraints[key])
+        cache_key = (key, specs)
+        if cache_key not in self._candidate_cache:
+            name, _ = self._split_key(key)
+            combined = SpecifierSet(",".join(s for s in specs if s))
+            self._candidate_cache[cache_key] = list(combined.filter(self._all_versions(name)))
+        self._current[key] = self._candidate_cache[cache_key]
+        return self._current[key]
+
+    def _dependencies(self, key: str, ver: Version) -> List[Requirement]:
+        if (key, ver) in self._dependency_cache:
+            return self._dependency_cache[(key, ver)]
+        name, extras = self._split_key(key)
+        deps: List[Requirement] = []
+        if extras:
+            # virtual "name[extras]" node: the base package plus extra deps
+            deps.append(Requirement(f"{name}=={ver}"))
+        for raw in self.provider.get_dependencies(name, str(ver)):
+            try:
+                req = Requirement(raw)
+            except InvalidRequirement:
+                continue
+            if req.marker is None:
+                if not extras:
+                    deps.append(req)
+                continue
+            wanted = extras or [""]
+            if any(req.marker.evaluate(dict(self.environment, extra=e)) for e in wanted):
+                if extras and req.marker.evaluate(dict(self.environment, extra="")):
+                    continue  # already a base dependency
+                deps.append(req)
+        self._dependency_cache[(key, ver)] = deps
+        return deps
+
+    # -- search -----------------------------------------------------------
+
+    def _record_conflict(self, key: str) -> None:
+        self._conflicts[key] += 1
+        causes = [(str(req), parent) for req, parent, _ in self._constraints.get(key, [])]
+        if key in self._pins:
+            causes.append((f"{key}=={self._pins[key]}", "current pin"))
+        self._last_causes[key] = causes
+
+    def _culprits(self, key: str) -> Set[str]:
+        """Pinned packages whose choices shaped the constraints on ``key``."""
+        culprits = {pk for _, _, pk in self._constraints.get(key, []) if pk}
+        if key in self._pins:
+            culprits.add(key)
+        return culprits
+
+    def _add_constraint(self, req: Requirement, parent: str,
+                        parent_key: Optional[str] = None) -> Tuple[str, bool]:
+        key = self._key(req)
+        self._constraints.setdefault(key, []).append((req, parent, parent_key))
+        self._current.pop(key, None)
+        pinned = self._pins.get(key)
+        if pinned is not None:
+            ok = req.specifier.contains(pinned, prereleases=True)
+        else:
+            ok = bool(self._candidates(key))
+        if not ok:
+            self._record_conflict(key)
+        return key, ok
+
+    def _remove_constraints(self, keys: List[str]) -> None:
+        for key in reversed(keys):
+            self._current.pop(key, None)
+            self._constraints[key].pop()
+            if not self._constraints[key]:
+                del self._constraints[key]
+
+    def _pin(self, key: str, ver: Version) -> Tuple[Optional[Set[str]], List[str]]:
+        """Pin ``key`` and add its dependencies; returns (conflict set or None, added keys)."""
+        self._pins[key] = ver
+        self._depths[key] = self._depth(key)
+        added: List[str] = []
+        name, _ = self._split_key(key)
+        for dep in self._dependencies(key, ver):
+            dep_key, ok = self._add_constraint(dep, f"{name}=={ver}", key)
+            added.append(dep_key)
+            if not ok:
+                return self._culprits(dep_key), added
+        return None, added
+
+    def _depth(self, key: str) -> int:
+        """Distance of ``key`` from the root requirements."""
+        return min(
+            0 if pk is None else self._depths.get(pk, 0) + 1
+            for _, _, pk in self._constraints[key]
+        )
+
+    def _search(self) -> Optional[Set[str]]:
+        """
+        Pin the remaining packages; None on success, else the conflict set.
+
+        The conflict set names the pinned packages responsible for the dead
+        end. A level whose package is not in it jumps straight back instead
+        of trying its other candidates (conflict-directed backjumping).
+        """
+        self.rounds += 1
+        if self.rounds > self.max_rounds:
+            raise ResolutionTooDeep(f"gave up after {self.max_rounds} resolution rounds")
+        pending = [k for k in self._constraints if k not in self._pins]
+        if not pending:
+            return None
+        # shallowest first, so a package is pinned only after the packages
+        # that constrain it; then fewest candidates
+        key = min(pending, key=lambda k: (self._depth(k), len(self._candidates(k)), k))
+        candidates = self._candidates(key)
+        conflict = self._culprits(key)
+        if not candidates:
+            self._record_conflict(key)
+            return conflict
+        for ver in candidates:
+            failed, added = self._pin(key, ver)
+            if failed is None:
+                failed = self._search()
+                if failed is None:
+                    return None
+            self._remove_constraints(added)
+            del self._pins[key]
+            if key not in failed:
+                return failed
+            conflict |= failed - {key}
+        return conflict
+
+    def solve(self, requirements: Iterable[Constraint]) -> Dict[str, str]:
+        """
+        Resolve root requirements.
+
+        Parameters
+        ----------
+        requirements : iterable of (Requirement, source)
+            Root constraints, e.g. (Requirement("torch==2.1.0"), "preset:research").
+
+        Returns
+        -------
+        dict : {canonical_name: version} for the full transitive closure.
+        """
+        for req, source in requirements:
+            if req.marker is not None and not req.marker.evaluate(dict(self.environment, extra="")):
+                continue
+            self._add_constraint(req, source)
+        if self._search() is not None:
+            # report the package that caused the most dead ends
+            worst = max(self._conflicts, key=lambda k: self._conflicts[k])
+            raise ResolutionImpossible(worst, self._last_causes[worst])
+        return {
+            key: str(ver) for key, ver in sorted(self._pins.items())
+            if "[" not in key
+        }
+
+
+def solve_stack(
+    layers: Iterable[Tuple[str, Dict[str, str]]],
+    provider=None,
+    max_rounds: int = MAX_ROUNDS,
+) -> Dict[str, str]:
+    """
+    Resolve stack layers into one consistent pinned set.
+
+    Parameters
+    ----------
+    layers : iterable of (source, stack)
+        e.g. [("preset:research", {...}), ("yolo", {...}), ("framework", {...})].
+        Unlike dict.update, constraints of all layers must hold together.
+    provider : optional
+        Candidate provider; defaults to IndexProvider over the package index.
+
+    Returns
+    -------
+    dict : {package_name: exact_version}
+    """
+    requirements = [
+        (spec_to_requirement(name, spec), source)
+        for source, stack in layers
+        for name, spec in stack.items()
+    ]
+    solver = BacktrackingSolver(provider or IndexProvider(), max_rounds=max_rounds)
+    return solver.solve(requirements)
@@ -1,44 +1,80 @@
 """
 Framework resolver: choose compatible TensorFlow / PyTorch versions
-based on GPU availability and (optionally) detected CUDA version.
+based on GPU availability and the detected CUDA version, driver and GPU
+architecture, looked up in the bundled compatibility dataset (see
+resolvers.compatibility).
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, List, Optional, Tuple
 
-from missionimpossible.detectors.gpu_detector import detect_gpu_status
+from missionimpossible.resolvers.compatibility import CompatibilityIndex, build_pin, load_index
+from missionimpossible.resolvers.context import ResolutionContext
+from missionimpossible.resolvers.dependency_solver import ResolutionImpossible
 
-# Very rough, simple mappings (bisa kamu perhalus nanti)
-TF_CUDA_MAP = {
-    "2.15.0": "12.2",
-    "2.17.0": "12.3",
-    "2.18.0": "12.4",
-}
 
-TORCH_CUDA_MAP = {
-    "2.1.0+cu121": "12.1",
-    "2.2.0+cu122": "12.2",
-    "2.3.0+cu124": "12.4",
-}
+def _gpu_constraints(
+    index: CompatibilityIndex,
+    gpu_info: Dict[str, Any],
+    python_version: str,
+) -> List[Tuple[str, str]]:
+    """(constraint, source) pairs a GPU build has to meet, for error messages."""
+    causes = [(f"Python {python_version}", "the interpreter")]
+    if gpu_info.get("cuda_version"):
+        causes.append((f"CUDA <= {gpu_info['cuda_version']}", "the CUDA driver API"))
+    if gpu_info.get("driver_version"):
+        limit = index.max_cuda_for_driver(gpu_info["driver_version"])
+        causes.append((f"CUDA <= {limit}" if limit else "no CUDA toolkit",
+                       f"NVIDIA driver {gpu_info['driver_version']}"))
+    if gpu_info.get("compute_capability"):
+        low, high = index.cuda_range_for_capability(gpu_info["compute_capability"])
+        bounds = [f">= {low}" if low else "", f"<= {high}" if high else ""]
+        if any(bounds):
+            causes.append((f"CUDA {', '.join(b for b in bounds if b)}",
+                           f"compute capability {gpu_info['compute_capability']}"))
+    return causes
 
 
-def _best_match(cuda_version: str | None, mapping: Dict[str, str]) -> str:
-    """Pick first framework version whose CUDA requirement is <= detected."""
-    if not cuda_version:
-        # CPU-only fallback
-        # Return first key but without CUDA suffix
-        first = next(iter(mapping))
-        return first.split("+")[0]
+def select_framework_version(
+    framework: str,
+    gpu_info: Dict[str, Any],
+    python_version: Optional[str] = None,
+) -> str:
+    """
+    Newest release of ``framework`` ("torch", "tensorflow") for this machine.
+
+    With a GPU (CUDA or driver version known) this is the newest build
+    with wheels for ``python_version`` (default: the running interpreter)
+    whose CUDA the driver supports and that can target the GPU's compute
+    capability, e.g. "2.4.1+cu124". Without a GPU it is the newest
+    release with wheels for ``python_version``.
 
-    for fw_ver, required_cuda in mapping.items():
-        if cuda_version.startswith(required_cuda[:3]):
-            return fw_ver
-    # fallback: first entry
-    return next(iter(mapping))
+    Raises
+    ------
+    ResolutionImpossible
+        A GPU is present but no build fits it with this Python; pinning
+        a release built for a newer CUDA would not run on the GPU.
+    """
+    index = load_index()
+    if gpu_info.get("cuda_version") or gpu_info.get("driver_version"):
+        row = index.newest_build(
+            framework,
+            python_version=python_version,
+            cuda_version=gpu_info.get("cuda_version"),
+            driver_version=gpu_info.get("driver_version"),
+            compute_capability=gpu_info.get("compute_capability"),
+        )
+        if row is None:
+            python_version = python_version or "%d.%d" % sys.version_info[:2]
+            raise ResolutionImpossible(framework, _gpu_constraints(index, gpu_info, python_version))
+        return build_pin(row)
+    return index.newest_release(framework, python_version) or index.releases(framework)[-1]
 
 
 def resolve_framework_stack(
     prefer: str = "auto",
+    context: Optional[ResolutionContext] = None,
 ) -> Dict[str, str]:
     """
     Decide which framework versions to use.
@@ -47,25 +83,28 @@ def resolve_framework_stack(
     ----------
     prefer : {"auto","tensorflow","pytorch"}
         Preferred framework family.
+    context : ResolutionContext, optional
+        Shared resolution state; supplies the GPU probe result.
 
     Returns
     -------
     dict : minimal framework part of the stack, e.g.
         {"tensorflow": "2.17.0"} or {"torch": "2.1.0+cu121"}.
+
+    Raises
+    ------
+    ResolutionImpossible
+        No build of the chosen framework runs on the detected GPU (see
+        select_framework_version).
     """
-    gpu_info: Any = detect_gpu_status()
-    cuda_version = gpu_info.get("cuda_version")
+    gpu_info: Any = (context or ResolutionContext()).gpu_info()
 
     if prefer == "tensorflow":
-        tf_ver = _best_match(cuda_version, TF_CUDA_MAP)
-        return {"tensorflow": tf_ver}
+        return {"tensorflow": select_framework_version("tensorflow", gpu_info)}
     if prefer == "pytorch":
-        torch_ver = _best_match(cuda_version, TORCH_CUDA_MAP)
-        return {"torch": torch_ver}
+        return {"torch": select_framework_version("torch", gpu_info)}
 
     # auto: prefer GPU, then TF by default
     if gpu_info.get("torch_gpu_visible"):
-        torch_ver = _best_match(cuda_version, TORCH_CUDA_MAP)
-        return {"torch": torch_ver}
-    tf_ver = _best_match(cuda_version, TF_CUDA_MAP)
-    return {"tensorflow": tf_ver}
+        return {"torch": select_framework_version("torch", gpu_info)}
+    return {"tensorflow": select_framework_version("tensorflow", gpu_info)}
@@ -4,9 +4,9 @@ framework resolver, and optional YOLO/NLP choices.
 """
 
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from missionimpossible.utils.preset_manager import get_preset
+from missionimpossible.resolvers.context import ResolutionContext
 from missionimpossible.resolvers.framework_resolver import resolve_framework_stack
 from missionimpossible.resolvers.yolo_resolver import resolve_yolo_stack
 
@@ -15,6 +15,7 @@ def resolve_cnn_nlp_stack(
     use_case: str = "research",
     yolo_family: str = "latest",
     framework: str = "auto",
+    context: Optional[ResolutionContext] = None,
 ) -> Dict[str, Any]:
     """
     Build a hybrid CNN + NLP stack.
@@ -27,18 +28,22 @@ def resolve_cnn_nlp_stack(
         YOLO version family preference.
     framework : {"auto","tensorflow","pytorch"}
         Preferred main DL framework.
+    context : ResolutionContext, optional
+        Shared resolution state, so presets, GPU and index lookups run once.
 
     Returns
     -------
     dict : resolved stack, e.g. {"tensorflow": "2.17.0", "ultralytics": "...", "nltk": "..."}
     """
+    context = context or ResolutionContext()
+
     # 1. Base preset
-    stack = get_preset(use_case)
+    stack = context.preset(use_case)
 
     # 2. Framework
-    stack.update(resolve_framework_stack(prefer=framework))
+    stack.update(resolve_framework_stack(prefer=framework, context=context))
 
     # 3. YOLO
-    stack.update(resolve_yolo_stack(yolo_family=yolo_family))
+    stack.update(resolve_yolo_stack(yolo_family=yolo_family, context=context))
 
     return stack
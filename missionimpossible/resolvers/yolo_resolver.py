@@ -8,29 +8,19 @@ YOLO resolver for MissionImPossible.
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from packaging import version
 
-from ..utils.pypi_api import get_pypi_releases
+from .compatibility import load_index
+from .context import ResolutionContext
 
 
-# Default Torch versions we consider "good" for each YOLO family.
-YOLO_TORCH_MAP_GPU: Dict[str, str] = {
-    "8": "2.1.0",
-    "10": "2.2.0",
-    "11": "2.3.0",  # future-oriented guess
-}
-
-YOLO_TORCH_MAP_CPU: Dict[str, str] = {
-    "8": "2.1.0",
-    "10": "2.2.0",
-    "11": "2.3.0",
-}
-
-
-
-def resolve_yolo_stack(yolo_family: str = "latest", gpu: bool = True) -> Dict[str, str]:
+def resolve_yolo_stack(
+    yolo_family: str = "latest",
+    gpu: bool = True,
+    context: Optional[ResolutionContext] = None,
+) -> Dict[str, str]:
     """
     Resolve YOLO (ultralytics) and Torch versions.
 
@@ -40,13 +30,15 @@ def resolve_yolo_stack(yolo_family: str = "latest", gpu: bool = True) -> Dict[st
         Version family preference. "latest" = auto-detect from PyPI.
     gpu : bool
         Whether to prefer GPU-enabled Torch builds.
+    context : ResolutionContext, optional
+        Shared resolution state; supplies the ultralytics release list.
 
     Returns
     -------
     dict
         Minimal stack part, e.g. {"ultralytics": "...", "torch": "..."}.
     """
-    releases = get_pypi_releases("ultralytics")
+    releases = (context or ResolutionContext()).releases("ultralytics")
     latest_stable = get_latest_stable_yolo(releases)
 
     # Decide YOLO constraint
@@ -100,10 +92,12 @@ def infer_family_from_version(ver: str) -> str:
 def get_torch_for_yolo_family(family: str, gpu: bool) -> str:
     """
     Return a Torch version appropriate for given YOLO family and GPU flag.
+
+    Recommendations come from the "yolo" table of the compatibility
+    dataset and are the same for GPU and CPU (the framework resolver
+    picks the CUDA build).
     """
-    mapping = YOLO_TORCH_MAP_GPU if gpu else YOLO_TORCH_MAP_CPU
-    if family in mapping:
-        return mapping[family]
-    # Fallback to YOLOv8 mapping
-    return mapping["8"]
+    index = load_index()
+    # Fallback to YOLOv8 recommendation
+    return index.yolo_torch(family) or index.yolo_torch("8")
 
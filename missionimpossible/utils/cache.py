@@ -0,0 +1,64 @@
+"""
+On-disk cache location and small JSON helpers shared by the caches.
+
+The cache root is, in order of preference:
+  $MISSIONIMPOSSIBLE_CACHE_DIR
+  $XDG_CACHE_HOME/missionimpossible
+  %LOCALAPPDATA%/missionimpossible (Windows)
+  ~/.cache/missionimpossible
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory below the cache root."""
+    root = os.environ.get("MISSIONIMPOSSIBLE_CACHE_DIR")
+    if root:
+        base = Path(root)
+    elif os.environ.get("XDG_CACHE_HOME"):
+        base = Path(os.environ["XDG_CACHE_HOME"]) / "missionimpossible"
+    elif sys.platform.startswith("win") and os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"]) / "missionimpossible"
+    else:
+        base = Path.home() / ".cache" / "missionimpossible"
+    path = base.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Load a JSON cache file, treating missing or corrupt files as a miss."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Atomically write ``data`` as JSON (safe with concurrent readers)."""
+    write_text(path, json.dumps(data))
+
+
+def write_text(path: Path, text: str) -> None:
+    """Atomically write ``text`` (safe with concurrent readers)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,212 @@
+"""
+In-process dependency consistency checker (``pip check`` without pip).
+
+Reads ``Requires-Dist`` from every installed distribution in the metadata
+index, evaluates markers and specifiers with ``packaging`` and returns
+structured conflict records.
+
+Results are incremental: a snapshot (per interpreter, in the cache dir)
+remembers each distribution's dist-info fingerprint (directory mtime and
+RECORD stat/hash), its requirements and its conflict records. The next run
+re-reads only added or changed distributions and re-checks only those and
+the distributions that depend on something that changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from importlib.metadata import PathDistribution
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.version import InvalidVersion, Version
+
+from .cache import cache_dir, read_json, write_json
+from .metadata import canonicalize_name, installed_distributions
+
+# Bump when the snapshot layout changes.
+SNAPSHOT_VERSION = 1
+
+_CONFLICTS: Optional[List[Dict[str, Any]]] = None
+
+
+def read_requirements(info: Dict[str, str]) -> List[str]:
+    """Return the raw ``Requires-Dist`` strings of an indexed distribution."""
+    return list(PathDistribution(Path(info["path"])).requires or [])
+
+
+def _requirement_applies(req: Requirement) -> bool:
+    # like pip check, only unconditional deps and those whose marker holds
+    # for the running interpreter (no extras) are considered
+    if req.marker is None:
+        return True
+    return req.marker.evaluate({"extra": ""})
+
+
+def check_distribution(
+    info: Dict[str, str],
+    index: Dict[str, Dict[str, str]],
+    requires: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Check the requirements of a single distribution against ``index``."""
+    records: List[Dict[str, Any]] = []
+    if requires is None:
+        requires = read_requirements(info)
+    for raw in requires:
+        try:
+            req = Requirement(raw)
+        except InvalidRequirement:
+            continue
+        if not _requirement_applies(req):
+            continue
+        dep = index.get(canonicalize_name(req.name))
+        installed = dep["version"] if dep else None
+        if installed is not None:
+            try:
+                if req.specifier.contains(Version(installed), prereleases=True):
+                    continue
+            except InvalidVersion:
+                continue
+        records.append({
+            "package": info["name"],
+            "version": info["version"],
+            "requirement": str(req),
+            "dependency": req.name,
+            "installed": installed,
+        })
+    return records
+
+
+def _signature(info_dir: str) -> List[Optional[int]]:
+    """Cheap fingerprint: dist-info dir mtime plus RECORD mtime and size."""
+    sig: List[Optional[int]] = []
+    for path in (info_dir, os.path.join(info_dir, "RECORD")):
+        try:
+            st = os.stat(path)
+            sig += [st.st_mtime_ns, st.st_size if path != info_dir else None]
+        except OSError:
+            sig += [None, None]
+    return sig
+
+
+def _record_hash(info_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(info_dir, "RECORD"), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _dependency_names(requires: List[str]) -> List[str]:
+    names = set()
+    for raw in requires:
+        try:
+            names.add(canonicalize_name(Requirement(raw).name))
+        except InvalidRequirement:
+            continue
+    return sorted(names)
+
+
+def snapshot_path() -> Path:
+    """Snapshot file for the running interpreter and its sys.path."""
+    ident = "\0".join([sys.executable] + sys.path)
+    return cache_dir("detect") / f"{hashlib.sha256(ident.encode('utf-8')).hexdigest()}.json"
+
+
+def incremental_check(
+    index: Dict[str, Dict[str, str]],
+    path: Optional[Path] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Check ``index`` reusing the persisted snapshot at ``path``.
+
+    Returns
+    -------
+    (records, stats)
+        records : conflict records, as check_dependencies
+        stats : {"changed": [...], "rechecked": [...]} canonical names of
+            distributions that were added/removed/changed and of those
+            whose requirements were re-evaluated.
+    """
+    path = path or snapshot_path()
+    snapshot = read_json(path) or {}
+    old: Dict[str, Any] = {}
+    if snapshot.get("version") == SNAPSHOT_VERSION:
+        old = snapshot.get("dists", {})
+
+    dists: Dict[str, Any] = {}
+    changed = set(old) - set(index)  # removed
+    for key, info in index.items():
+        sig = _signature(info["path"])
+        prev = old.get(key)
+        if (prev and prev["path"] == info["path"] and prev["version"] == info["version"]
+                and prev["signature"] == sig):
+            dists[key] = prev
+            continue
+        record_hash = _record_hash(info["path"])
+        requires = read_requirements(info)
+        dists[key] = {
+            "path": info["path"],
+            "version": info["version"],
+            "signature": sig,
+            "record_sha256": record_hash,
+            "requires": requires,
+            "deps": _dependency_names(requires),
+        }
+        # a touched dist-info with identical contents is not a change
+        if not (prev and prev["path"] == info["path"] and prev["version"] == info["version"]
+                and prev["record_sha256"] == record_hash and prev["requires"] == requires):
+            changed.add(key)
+        elif "conflicts" in prev:
+            dists[key]["conflicts"] = prev["conflicts"]
+
+    rechecked = []
+    for key, entry in dists.items():
+        if "conflicts" in entry and key not in changed and changed.isdisjoint(entry["deps"]):
+            continue
+        entry["conflicts"] = check_distribution(index[key], index, entry["requires"])
+        rechecked.append(key)
+
+    if changed or rechecked or not old:
+        write_json(path, {"version": SNAPSHOT_VERSION, "dists": dists})
+
+    records = [r for key in sorted(dists) for r in dists[key]["conflicts"]]
+    return records, {"changed": sorted(changed), "rechecked": sorted(rechecked)}
+
+
+def check_dependencies(refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Check every installed distribution for unmet requirements.
+
+    The result is cached until the next ``refresh=True`` call, so all
+    detectors of one detection pass share a single walk of the environment.
+    Across processes the work is incremental (see incremental_check).
+
+    Returns
+    -------
+    list of dict with keys:
+        package, version, requirement, dependency, installed (str|None)
+    """
+    global _CONFLICTS
+    if _CONFLICTS is None or refresh:
+        _CONFLICTS, _ = incremental_check(installed_distributions(refresh))
+    return _CONFLICTS
+
+
+def format_conflict(record: Dict[str, Any]) -> str:
+    """Render a conflict record the way ``pip check`` prints it."""
+    pkg = f"{record['package']} {record['version']}"
+    if record["installed"] is None:
+        return f"{pkg} requires {record['dependency']}, which is not installed."
+    return (
+        f"{pkg} has requirement {record['requirement']}, "
+        f"but you have {record['dependency']} {record['installed']}."
+    )
+
+
+def format_conflicts(records: List[Dict[str, Any]]) -> str:
+    """Render all records as ``pip check``-style text."""
+    return "\n".join(format_conflict(r) for r in records)
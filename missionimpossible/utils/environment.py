@@ -6,13 +6,35 @@ Provides functions to export the resolved ML stack to common environment specifi
 - requirements.txt (pip)
 - environment.toml (simple reproducibility format)
 - environment.yml (Conda environment with pip section)
-- Dockerfile (minimal Dockerfile to build image with dependencies installed)
+- Dockerfile (multi-stage, layered for Docker's build cache)
+
+Nothing is written unless one of the write_* functions is called;
+render_dockerfile() only returns the text.
 """
 
 from __future__ import annotations
 
+import shlex
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
+
+from ..resolvers.dependency_solver import spec_to_requirement
+from .cache import write_text
+from .metadata import canonicalize_name
+
+# Install order of the generated Dockerfile: large, rarely bumped packages
+# get the first layers, so changing anything below them reuses their
+# cached layers. Frameworks (GBs each) get a layer of their own, in this
+# order; the scientific stack shares one; everything else goes into a
+# final "application" layer.
+DOCKER_FRAMEWORKS: Tuple[str, ...] = (
+    "torch", "torchvision", "torchaudio", "tensorflow", "tensorflow-cpu",
+    "tensorflow-gpu", "jax", "jaxlib", "onnxruntime", "onnxruntime-gpu",
+)
+DOCKER_SCIENTIFIC: Tuple[str, ...] = (
+    "numpy", "scipy", "pandas", "scikit-learn", "opencv-python",
+    "opencv-python-headless", "opencv-contrib-python", "pillow", "matplotlib",
+)
 
 
 def write_requirements_txt(stack: Dict[str, str], path: str = "requirements.txt") -> None:
@@ -67,27 +89,103 @@ def write_conda_env(stack: Dict[str, str], path: str = "environment.yml") -> Non
     Path(path).write_text("".join(lines), encoding="utf-8")
 
 
-def write_dockerfile(stack: Dict[str, str], path: str = "Dockerfile") -> None:
+def dockerfile_layers(stack: Dict[str, str]) -> List[Tuple[str, List[str]]]:
+    """
+    Split a stack into install layers, heaviest first (see DOCKER_FRAMEWORKS).
+
+    Returns
+    -------
+    list of (layer name, requirement strings), e.g.
+        [("torch", ["torch==2.1.0"]), ("scientific", [...]), ("application", [...])];
+        empty layers are omitted.
     """
-    Generate a minimal Dockerfile that installs the stack via pip.
+    frameworks: Dict[str, str] = {}
+    scientific: List[str] = []
+    application: List[str] = []
+    for name, spec in stack.items():
+        key = canonicalize_name(name)
+        requirement = str(spec_to_requirement(name, spec))
+        if key in DOCKER_FRAMEWORKS:
+            frameworks[key] = requirement
+        elif key in DOCKER_SCIENTIFIC:
+            scientific.append(requirement)
+        else:
+            application.append(requirement)
+
+    layers = [(key, [frameworks[key]]) for key in DOCKER_FRAMEWORKS if key in frameworks]
+    for layer, requirements in (("scientific", scientific), ("application", application)):
+        if requirements:
+            layers.append((layer, sorted(requirements, key=str.lower)))
+    return layers
 
-    Resulting Dockerfile example:
 
-    FROM python:3.11-slim
-    WORKDIR /app
-    RUN pip install --upgrade pip \
-        && pip install pkg1>=1.0 pkg2==2.0 ...
-    CMD ["python"]
+def render_dockerfile(stack: Dict[str, str], python_version: str = "3.11") -> str:
     """
-    pkgs = [str(spec).strip() for spec in stack.values()]
-    pkgs_str = " ".join(pkgs) if pkgs else ""
-
-    docker_lines = [
-        "FROM python:3.11-slim\n\n",
-        "WORKDIR /app\n\n",
-        "RUN pip install --upgrade pip \\\n",
-        f"    && pip install {pkgs_str}\n\n",
-        'CMD ["python"]\n',
+    Render a multi-stage Dockerfile that installs the stack layer by layer.
+
+    The builder stage installs into /opt/venv with one RUN per layer of
+    dockerfile_layers(), heaviest first, each with a BuildKit cache mount
+    for pip's download cache; the runtime stage only copies the venv.
+    A change to a small package therefore rebuilds its own layer from
+    cached downloads and leaves the torch / tensorflow layers untouched.
+
+    Every RUN repeats the requirements of the layers before it (already
+    installed, so no-ops), so pip resolves each layer against the whole
+    stack so far and cannot swap out a package an earlier layer pinned
+    or depends on. The builder stage ends with ``pip check``.
+
+    Example (abridged):
+
+    # syntax=docker/dockerfile:1
+    ARG PYTHON_VERSION=3.11
+    FROM python:${PYTHON_VERSION}-slim AS builder
+    ...
+    # torch
+    RUN --mount=type=cache,target=/root/.cache/pip \
+        pip install torch==2.1.0
+    # application
+    RUN --mount=type=cache,target=/root/.cache/pip \
+        pip install torch==2.1.0 \
+            'ultralytics>=8.3.234'
+    RUN pip check
+    FROM python:${PYTHON_VERSION}-slim
+    COPY --from=builder /opt/venv /opt/venv
+    ...
+    """
+    lines = [
+        "# syntax=docker/dockerfile:1",
+        "# Generated by MissionImPossible. Build with BuildKit (docker build, DOCKER_BUILDKIT=1).",
+        f"ARG PYTHON_VERSION={python_version}",
+        "",
+        "FROM python:${PYTHON_VERSION}-slim AS builder",
+        "ENV PIP_DISABLE_PIP_VERSION_CHECK=1 \\",
+        "    PATH=/opt/venv/bin:$PATH",
+        "RUN python -m venv /opt/venv",
     ]
+    earlier: List[str] = []
+    for layer, requirements in dockerfile_layers(stack):
+        own = " ".join(shlex.quote(req) for req in requirements)
+        lines += ["", f"# {layer}", "RUN --mount=type=cache,target=/root/.cache/pip \\"]
+        if earlier:
+            lines += ["    pip install " + " ".join(shlex.quote(req) for req in earlier) + " \\",
+                      "        " + own]
+        else:
+            lines.append("    pip install " + own)
+        earlier += requirements
+    lines += [
+        "RUN pip check",
+        "",
+        "FROM python:${PYTHON_VERSION}-slim",
+        "COPY --from=builder /opt/venv /opt/venv",
+        "ENV PATH=/opt/venv/bin:$PATH",
+        "WORKDIR /app",
+        'CMD ["python"]',
+    ]
+    return "\n".join(lines) + "\n"
+
 
-    Path(path).write_text("".join(docker_lines), encoding="utf-8")
+def write_dockerfile(stack: Dict[str, str], path: str = "Dockerfile", python_version: str = "3.11") -> Path:
+    """Atomically write render_dockerfile(stack) to ``path``; returns the path."""
+    target = Path(path)
+    write_text(target, render_dockerfile(stack, python_version))
+    return target
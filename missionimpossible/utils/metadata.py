@@ -0,0 +1,124 @@
+"""
+In-process index of installed distributions.
+
+Scans the ``*.dist-info`` / ``*.egg-info`` entries on ``sys.path`` once and
+keeps a normalized ``name -> version`` index, so detectors can look up
+package versions without spawning ``pip show`` for every package.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+_INFO_SUFFIXES = (".dist-info", ".egg-info")
+
+_INDEX: Optional[Dict[str, Dict[str, str]]] = None
+
+
+def canonicalize_name(name: str) -> str:
+    """Normalize a distribution name as described in PEP 503."""
+    return _NORMALIZE_RE.sub("-", name).lower()
+
+
+def _read_name_version(info_dir: Path) -> Optional[tuple]:
+    """Read Name / Version headers from a METADATA or PKG-INFO file."""
+    for fname in ("METADATA", "PKG-INFO"):
+        meta = info_dir / fname
+        if not meta.is_file():
+            continue
+        name = ver = None
+        with meta.open(encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    break  # end of headers
+                key, _, value = line.partition(":")
+                key = key.lower()
+                if key == "name":
+                    name = value.strip()
+                elif key == "version":
+                    ver = value.strip()
+                if name and ver:
+                    return name, ver
+    return None
+
+
+def _parse_info_dir(entry: os.DirEntry) -> Optional[Dict[str, str]]:
+    stem, suffix = os.path.splitext(entry.name)
+    if suffix not in _INFO_SUFFIXES:
+        return None
+    info_dir = Path(entry.path)
+    # dist-info names are "<name>-<version>" with the name already escaped
+    # (PEP 427), so the directory name is enough in the common case.
+    name, sep, ver = stem.partition("-")
+    if suffix == ".dist-info" and sep and ver and "-" not in ver:
+        return {"name": name, "version": ver, "path": str(info_dir)}
+    parsed = _read_name_version(info_dir)
+    if parsed is None:
+        return None
+    return {"name": parsed[0], "version": parsed[1], "path": str(info_dir)}
+
+
+def _scan(paths: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    index: Dict[str, Dict[str, str]] = {}
+    for entry_path in paths:
+        try:
+            entries = os.scandir(entry_path or ".")
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(_INFO_SUFFIXES):
+                    continue
+                info = _parse_info_dir(entry)
+                if info is None:
+                    continue
+                key = canonicalize_name(info["name"])
+                # first hit on sys.path wins, same as the import system
+                index.setdefault(key, info)
+    return index
+
+
+def installed_distributions(refresh: bool = False) -> Dict[str, Dict[str, str]]:
+    """
+    Return the index of installed distributions.
+
+    Parameters
+    ----------
+    refresh : bool
+        Rescan ``sys.path`` instead of reusing the cached index.
+
+    Returns
+    -------
+    dict : {canonical_name: {"name", "version", "path"}}
+    """
+    global _INDEX
+    if _INDEX is None or refresh:
+        _INDEX = _scan(sys.path)
+    return _INDEX
+
+
+def get_installed_version(name: str, refresh: bool = False) -> Optional[str]:
+    """Return the installed version of ``name`` or None if it is missing."""
+    info = installed_distributions(refresh).get(canonicalize_name(name))
+    return info["version"] if info else None
+
+
+def environment_fingerprint(refresh: bool = True) -> str:
+    """Digest of the interpreter and every installed distribution/version."""
+    index = installed_distributions(refresh)
+    digest = hashlib.sha256(sys.executable.encode("utf-8"))
+    for key in sorted(index):
+        digest.update(f"\0{key}={index[key]['version']}@{index[key]['path']}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def clear_cache() -> None:
+    """Drop the cached index; the next lookup rescans ``sys.path``."""
+    global _INDEX
+    _INDEX = None
@@ -0,0 +1,151 @@
+"""
+Minimal ctypes binding to NVML (libnvidia-ml) for GPU inventory.
+
+One call returns the driver version, the CUDA driver API version and the
+name / memory / compute capability of every device, without starting
+``nvidia-smi``. When the library is missing or fails to initialize,
+``gpu_inventory()`` returns None and callers fall back to other probes.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import sys
+from typing import Any, Dict, List, Optional
+
+NVML_SUCCESS = 0
+_BUFFER_SIZE = 96
+
+_LIBRARY_NAMES = {
+    "win32": ("nvml.dll",),
+}
+_DEFAULT_LIBRARY_NAMES = ("libnvidia-ml.so.1", "libnvidia-ml.so")
+
+_LIB: Any = None
+_LIB_LOADED = False
+
+
+class NVMLError(RuntimeError):
+    """Raised when an NVML call returns a non-success status."""
+
+
+class _Memory(ctypes.Structure):
+    _fields_ = [
+        ("total", ctypes.c_ulonglong),
+        ("free", ctypes.c_ulonglong),
+        ("used", ctypes.c_ulonglong),
+    ]
+
+
+def load_library() -> Any:
+    """Load libnvidia-ml once; returns None if it is not available."""
+    global _LIB, _LIB_LOADED
+    if not _LIB_LOADED:
+        _LIB_LOADED = True
+        for name in _LIBRARY_NAMES.get(sys.platform, _DEFAULT_LIBRARY_NAMES):
+            try:
+                _LIB = ctypes.CDLL(name)
+                break
+            except OSError:
+                continue
+    return _LIB
+
+
+def _call(lib: Any, func: str, *args: Any) -> None:
+    status = getattr(lib, func)(*args)
+    if status != NVML_SUCCESS:
+        raise NVMLError(f"{func} failed with NVML status {status}")
+
+
+def _first_available(lib: Any, *names: str) -> str:
+    for name in names:
+        if hasattr(lib, name):
+            return name
+    raise NVMLError(f"none of {names} exported by NVML")
+
+
+def _format_cuda_version(raw: int) -> str:
+    """NVML encodes CUDA 12.2 as 12020."""
+    return f"{raw // 1000}.{(raw % 1000) // 10}"
+
+
+def _device_info(lib: Any, index: int) -> Dict[str, Any]:
+    handle = ctypes.c_void_p()
+    _call(lib, _first_available(lib, "nvmlDeviceGetHandleByIndex_v2", "nvmlDeviceGetHandleByIndex"),
+          ctypes.c_uint(index), ctypes.byref(handle))
+
+    name = ctypes.create_string_buffer(_BUFFER_SIZE)
+    _call(lib, "nvmlDeviceGetName", handle, name, ctypes.c_uint(_BUFFER_SIZE))
+
+    memory = _Memory()
+    _call(lib, "nvmlDeviceGetMemoryInfo", handle, ctypes.byref(memory))
+
+    major, minor = ctypes.c_int(), ctypes.c_int()
+    _call(lib, "nvmlDeviceGetCudaComputeCapability", handle,
+          ctypes.byref(major), ctypes.byref(minor))
+
+    return {
+        "index": index,
+        "name": name.value.decode(errors="replace"),
+        "memory_total": int(memory.total),
+        "compute_capability": f"{major.value}.{minor.value}",
+    }
+
+
+def gpu_inventory(lib: Any = None) -> Optional[Dict[str, Any]]:
+    """
+    Query NVML for the driver and all visible devices.
+
+    Parameters
+    ----------
+    lib : optional
+        Object exposing the NVML C functions; defaults to the system
+        libnvidia-ml loaded through ctypes.
+
+    Returns
+    -------
+    dict or None
+        {"driver_version", "cuda_driver_version", "devices": [
+            {"index", "name", "memory_total" (bytes), "compute_capability"}]}
+        or None if NVML is unavailable.
+    """
+    lib = lib if lib is not None else load_library()
+    if lib is None:
+        return None
+    try:
+        _call(lib, _first_available(lib, "nvmlInit_v2", "nvmlInit"))
+    except NVMLError:
+        return None
+
+    try:
+        driver = ctypes.create_string_buffer(_BUFFER_SIZE)
+        _call(lib, "nvmlSystemGetDriverVersion", driver, ctypes.c_uint(_BUFFER_SIZE))
+
+        cuda = ctypes.c_int()
+        _call(lib, _first_available(lib, "nvmlSystemGetCudaDriverVersion_v2",
+                                    "nvmlSystemGetCudaDriverVersion"),
+              ctypes.byref(cuda))
+
+        count = ctypes.c_uint()
+        _call(lib, _first_available(lib, "nvmlDeviceGetCount_v2", "nvmlDeviceGetCount"),
+              ctypes.byref(count))
+
+        devices: List[Dict[str, Any]] = [_device_info(lib, i) for i in range(count.value)]
+        return {
+            "driver_version": driver.value.decode(errors="replace"),
+            "cuda_driver_version": _format_cuda_version(cuda.value),
+            "devices": devices,
+        }
+    except NVMLError:
+        return None
+    finally:
+        lib.nvmlShutdown()
+
+
+def lowest_compute_capability(devices: List[Dict[str, Any]]) -> Optional[str]:
+    """Return the oldest compute capability among ``devices`` (e.g. "7.5")."""
+    caps = [tuple(int(p) for p in d["compute_capability"].split(".")) for d in devices]
+    if not caps:
+        return None
+    major, minor = min(caps)
+    return f"{major}.{minor}"
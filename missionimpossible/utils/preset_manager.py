@@ -1,30 +1,199 @@
 """
-Preset manager: load and manage stack presets from presets/*.toml.
+Preset manager: load and manage stack presets from TOML files.
+
+Preset files are discovered recursively (``presets/custom/my_thesis.toml``
+counts too) under, in order of precedence:
+
+  $MISSIONIMPOSSIBLE_PRESETS   (os.pathsep-separated directories or files)
+  <user config dir>/missionimpossible/presets
+  the bundled presets/ directory
+
+Each file holds one or more ``[stacks.<name>]`` tables; the first
+definition of a name in that order wins. The registry parses every file
+once and keeps a name -> (file, table) index. A lookup only stats the
+directories (to notice added / removed files) and the file the preset
+comes from; files are re-parsed when their mtime or size changes, and a
+miss triggers a full rescan before giving up.
 """
 
 from __future__ import annotations
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-import tomllib  # Python 3.11+; untuk 3.9/3.10 pakai 'tomli' dan import berbeda
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:  # Python 3.9 / 3.10
+    import tomli as tomllib
 
 
 PRESETS_DIR = Path(__file__).resolve().parents[2] / "presets"
 
+# (mtime_ns, size)
+Signature = Tuple[int, int]
+
 
 def _load_toml(path: Path) -> Dict[str, Any]:
     with path.open("rb") as f:
         return tomllib.load(f)
 
 
+def user_presets_dir() -> Path:
+    """Per-user preset directory (XDG config dir, %APPDATA% on Windows)."""
+    if os.environ.get("XDG_CONFIG_HOME"):
+        base = Path(os.environ["XDG_CONFIG_HOME"])
+    elif sys.platform.startswith("win") and os.environ.get("APPDATA"):
+        base = Path(os.environ["APPDATA"])
+    else:
+        base = Path.home() / ".config"
+    return base / "missionimpossible" / "presets"
+
+
+def preset_roots() -> List[Path]:
+    """Directories (or single files) searched for presets, highest precedence first."""
+    extra = os.environ.get("MISSIONIMPOSSIBLE_PRESETS", "")
+    roots = [Path(p).expanduser() for p in extra.split(os.pathsep) if p]
+    return roots + [user_presets_dir(), PRESETS_DIR]
+
+
+def _signature(path: Path) -> Optional[Signature]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PresetRegistry:
+    """
+    Index of preset names across all preset files.
+
+    Parameters
+    ----------
+    roots : list of Path, optional
+        Fixed search roots; by default preset_roots() is consulted on
+        every lookup, so environment changes take effect.
+    """
+
+    def __init__(self, roots: Optional[List[Path]] = None):
+        self._fixed_roots = roots
+        self._roots: Optional[List[Path]] = None
+        self._dirs: Dict[Path, Optional[Signature]] = {}
+        self._files: Dict[Path, Tuple[Signature, Dict[str, Dict[str, Any]]]] = {}
+        self._order: List[Path] = []
+        self._index: Dict[str, Tuple[Path, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+
+    def _current_roots(self) -> List[Path]:
+        return list(self._fixed_roots) if self._fixed_roots is not None else preset_roots()
+
+    def _walk(self, root: Path, dirs: Dict[Path, Optional[Signature]], files: List[Path]) -> None:
+        if root.is_file():
+            files.append(root)
+            return
+        dirs[root] = _signature(root)
+        try:
+            entries = sorted(os.scandir(root), key=lambda e: e.name)
+        except OSError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir():
+                self._walk(path, dirs, files)
+            elif entry.name.endswith(".toml"):
+                files.append(path)
+
+    def _parse(self, path: Path, signature: Signature) -> Dict[str, Dict[str, Any]]:
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            stacks = _load_toml(path).get("stacks", {})
+        except (OSError, tomllib.TOMLDecodeError) as exc:
+            print(f"[MissionImPossible] WARNING: skipping preset file {path}: {exc}")
+            stacks = {}
+        return {name: table for name, table in stacks.items() if isinstance(table, dict)}
+
+    def scan(self) -> None:
+        """(Re)build the index, re-parsing only files whose mtime or size changed."""
+        with self._lock:
+            roots = self._current_roots()
+            dirs: Dict[Path, Optional[Signature]] = {}
+            paths: List[Path] = []
+            for root in roots:
+                self._walk(root, dirs, paths)
+
+            files = {}
+            index: Dict[str, Tuple[Path, Dict[str, Any]]] = {}
+            for path in dict.fromkeys(paths):
+                signature = _signature(path)
+                if signature is None:
+                    continue
+                stacks = self._parse(path, signature)
+                files[path] = (signature, stacks)
+                for name, table in stacks.items():
+                    index.setdefault(name, (path, table))
+
+            self._roots, self._dirs, self._files = roots, dirs, files
+            self._order = list(files)
+            self._index = index
+
+    def _stale(self) -> bool:
+        if self._roots is None or self._roots != self._current_roots():
+            return True
+        return any(_signature(d) != sig for d, sig in self._dirs.items())
+
+    def lookup(self, name: str) -> Tuple[Path, Dict[str, Any]]:
+        """Return (file, table) of preset ``name``; KeyError if it does not exist."""
+        with self._lock:
+            scanned = self._stale()
+            if scanned:
+                self.scan()
+            entry = self._index.get(name)
+            if entry is not None and _signature(entry[0]) != self._files[entry[0]][0]:
+                entry = None  # its file changed
+            if entry is None and not scanned:
+                self.scan()
+                entry = self._index.get(name)
+            if entry is None:
+                raise KeyError(f"Preset '{name}' not found in {', '.join(map(str, self._roots or []))}")
+            return entry
+
+    def names(self) -> Dict[str, Path]:
+        with self._lock:
+            self.scan()
+            return {name: path for name, (path, _) in self._index.items()}
+
+    def files(self) -> List[Path]:
+        with self._lock:
+            self.scan()
+            return list(self._order)
+
+
+_REGISTRY = PresetRegistry()
+
+
+def preset_files() -> List[Path]:
+    """Preset files consulted by get_preset / list_presets (recursive)."""
+    return _REGISTRY.files()
+
+
+def preset_source(name: str) -> Path:
+    """File that defines preset ``name``."""
+    return _REGISTRY.lookup(name)[0]
+
+
 def get_preset(name: str) -> Dict[str, str]:
     """
     Load a preset stack by name.
 
-    Looks into:
+    Looks into every preset file of the search roots (see module doc),
+    e.g.:
       presets/research.toml
       presets/production.toml
-      presets/lightweight.toml
+      presets/custom/my_thesis.toml
     and expects a table [stacks.<name>].
 
     Example:
@@ -32,24 +201,13 @@ def get_preset(name: str) -> Dict[str, str]:
       tensorflow = "2.17.0"
       nltk = "3.8.1"
     """
-    for file in PRESETS_DIR.glob("*.toml"):
-        data = _load_toml(file)
-        stacks = data.get("stacks", {})
-        if name in stacks:
-            raw = stacks[name]
-            # cast all values to str
-            return {k: str(v) for k, v in raw.items()}
-    raise KeyError(f"Preset '{name}' not found in {PRESETS_DIR}")
+    _, raw = _REGISTRY.lookup(name)
+    # cast all values to str
+    return {k: str(v) for k, v in raw.items()}
 
 
 def list_presets() -> Dict[str, Path]:
     """
     List available preset names and source files.
     """
-    mapping: Dict[str, Path] = {}
-    for file in PRESETS_DIR.glob("*.toml"):
-        data = _load_toml(file)
-        stacks = data.get("stacks", {})
-        for name in stacks:
-            mapping[name] = file
-    return mapping
+    return _REGISTRY.names()
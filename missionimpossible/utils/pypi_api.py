@@ -1,21 +1,389 @@
 """
-Thin wrapper around the PyPI JSON API.
+Thin wrapper around the package index Simple API (PEP 691 JSON).
+
+Project pages are requested as ``application/vnd.pypi.simple.v1+json``
+from a configurable index (``--index-url`` / $MISSIONIMPOSSIBLE_INDEX_URL,
+e.g. a devpi or Artifactory mirror); HTML-only mirrors are parsed as
+PEP 503 pages. Versions come from the PEP 700 ``versions`` key, or from
+the file names when a mirror does not provide it.
+
+Responses are kept in a persistent on-disk cache (see utils.cache). Fresh
+entries (younger than the TTL) are served without touching the network;
+stale ones are revalidated with ``If-None-Match`` / ``If-Modified-Since``.
+In offline mode only the cache is used.
+
+All requests share one pooled ``requests.Session`` with retries and
+backoff; ``get_pypi_releases_many`` fetches several projects concurrently.
 """
 
 from __future__ import annotations
-from typing import List
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import urldefrag, urljoin
 import requests
+from packaging.utils import (
+    InvalidSdistFilename,
+    InvalidWheelFilename,
+    parse_sdist_filename,
+    parse_wheel_filename,
+)
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import cache_dir, read_json, write_json, write_text
+from .metadata import canonicalize_name
+
+
+DEFAULT_INDEX_URL = "https://pypi.org/simple"
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+_ACCEPT = f"{SIMPLE_JSON}, application/vnd.pypi.simple.v1+html;q=0.2, text/html;q=0.01"
+
+_INDEX_URL = os.environ.get("MISSIONIMPOSSIBLE_INDEX_URL", DEFAULT_INDEX_URL)
+
+# File fields kept in the cache; the rest of each entry is dropped.
+_FILE_FIELDS = (
+    "filename", "url", "hashes", "size", "requires-python", "yanked",
+    "core-metadata", "data-dist-info-metadata",
+)
+_ANCHOR_RE = re.compile(r"<a\s+([^>]*)>([^<]*)</a>", re.I)
+_ATTR_RE = re.compile(r"([\w-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+_HTML_FILE_ATTRS = {
+    "data-requires-python": "requires-python",
+    "data-yanked": "yanked",
+    "data-core-metadata": "core-metadata",
+    "data-dist-info-metadata": "data-dist-info-metadata",
+}
+
+# Seconds a cached response is used without revalidation.
+CACHE_TTL = float(os.environ.get("MISSIONIMPOSSIBLE_PYPI_TTL", 600))
+
+# Concurrency of bulk fetches; also the size of the connection pool.
+MAX_WORKERS = 8
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+_RECORDERS: List[Set[str]] = []
+_RECORD_LOCK = threading.Lock()
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+_OFFLINE = os.environ.get("MISSIONIMPOSSIBLE_OFFLINE", "").lower() in {"1", "true", "yes"}
+
+
+class PyPIUnavailableError(RuntimeError):
+    """Raised when metadata is needed but neither the index nor the cache has it."""
+
+
+def set_offline(offline: bool = True) -> None:
+    """Serve PyPI metadata only from the on-disk cache."""
+    global _OFFLINE
+    _OFFLINE = offline
+
+
+def is_offline() -> bool:
+    return _OFFLINE
+
+
+def set_index_url(url: str) -> None:
+    """Use another Simple API index (e.g. a local mirror)."""
+    global _INDEX_URL
+    _INDEX_URL = url.rstrip("/")
+
+
+def get_index_url() -> str:
+    return _INDEX_URL.rstrip("/")
+
+
+def project_url(package_name: str) -> str:
+    return f"{get_index_url()}/{canonicalize_name(package_name)}/"
+
+
+def get_session() -> requests.Session:
+    """Return the shared, pooled HTTP session (created on first use)."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=MAX_WORKERS,
+                pool_maxsize=MAX_WORKERS,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _http_get(url: str, headers: Dict[str, str]) -> requests.Response:
+    return get_session().get(url, headers=headers, timeout=10)
+
+
+def _cache_file(url: str):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return cache_dir("pypi") / f"{key}.json"
+
+
+def _slim_file(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: entry[k] for k in _FILE_FIELDS if k in entry}
+
+
+def _parse_html_page(text: str, base_url: str) -> Dict[str, Any]:
+    """Turn a PEP 503 HTML project page into the PEP 691 JSON shape."""
+    files = []
+    for attr_text, label in _ANCHOR_RE.findall(text):
+        attrs = {k.lower(): html.unescape(v1 or v2) for k, v1, v2 in _ATTR_RE.findall(attr_text)}
+        if "href" not in attrs:
+            continue
+        url, fragment = urldefrag(urljoin(base_url, attrs["href"]))
+        hashes = {}
+        if "=" in fragment:
+            algo, _, digest = fragment.partition("=")
+            hashes[algo] = digest
+        entry: Dict[str, Any] = {"filename": html.unescape(label.strip()), "url": url, "hashes": hashes}
+        for attr, field in _HTML_FILE_ATTRS.items():
+            if attr in attrs:
+                entry[field] = attrs[attr] or True
+        files.append(entry)
+    return {"files": files}
+
+
+def _decode_project_page(resp: requests.Response, url: str) -> Dict[str, Any]:
+    content_type = resp.headers.get("Content-Type", SIMPLE_JSON)
+    if "html" in content_type:
+        return _parse_html_page(resp.text, url)
+    data = resp.json()
+    files = data.get("files", [])
+    for entry in files:
+        # PEP 691 URLs may be relative to the page
+        if "url" in entry and "://" not in entry["url"]:
+            entry["url"] = urljoin(url, entry["url"])
+    page = {"files": [_slim_file(f) for f in files]}
+    if "versions" in data:
+        page["versions"] = data["versions"]
+    return page
+
+
+def _digest(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
 
 
-PYPI_URL = "https://pypi.org/pypi/{name}/json"
+def _fetch_entry(url: str, ttl: Optional[float] = None) -> Dict[str, Any]:
+    """Return the cache entry for ``url``, refreshing it if needed."""
+    ttl = CACHE_TTL if ttl is None else ttl
+    path = _cache_file(url)
+    entry = read_json(path)
+    with _RECORD_LOCK:
+        for pages in _RECORDERS:
+            pages.add(url)
+
+    if _OFFLINE:
+        if entry is None:
+            raise PyPIUnavailableError(f"offline mode: no cached metadata for {url}")
+        return entry
+    if entry is not None and time.time() - entry["fetched_at"] < ttl:
+        return entry
+
+    headers: Dict[str, str] = {"Accept": _ACCEPT}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        resp = _http_get(url, headers)
+        if resp.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+            write_json(path, entry)
+            return entry
+        resp.raise_for_status()
+        data = _decode_project_page(resp, url)
+    except requests.RequestException as exc:
+        if entry is not None:
+            # index unreachable: a stale answer beats no answer
+            return entry
+        raise PyPIUnavailableError(f"could not fetch {url}: {exc}") from exc
+
+    entry = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "digest": _digest(data),
+        "data": data,
+    }
+    write_json(path, entry)
+    return entry
+
+
+def fetch_json(url: str, ttl: Optional[float] = None) -> Any:
+    """
+    GET a Simple API project page through the on-disk cache.
+
+    Parameters
+    ----------
+    url : str
+        Document URL.
+    ttl : float, optional
+        Override of CACHE_TTL for this call (0 forces revalidation).
+    """
+    return _fetch_entry(url, ttl)["data"]
+
+
+def page_digest(url: str) -> str:
+    """Content digest of the current (cached or revalidated) page at ``url``."""
+    entry = _fetch_entry(url)
+    return entry.get("digest") or _digest(entry["data"])
+
+
+@contextmanager
+def record_index_pages() -> Iterator[Set[str]]:
+    """Collect the URLs of every index page consulted inside the block."""
+    pages: Set[str] = set()
+    with _RECORD_LOCK:
+        _RECORDERS.append(pages)
+    try:
+        yield pages
+    finally:
+        with _RECORD_LOCK:
+            _RECORDERS.remove(pages)
+
+
+def get_project_page(package_name: str) -> Dict[str, Any]:
+    """
+    Return the (cached) Simple API page of a project.
+
+    Returns
+    -------
+    dict : {"files": [{"filename","url","hashes",...}], "versions": [...]?}
+    """
+    return fetch_json(project_url(package_name))
+
+
+def version_from_filename(filename: str) -> Optional[str]:
+    """Version encoded in a wheel or sdist file name (None if unparsable)."""
+    try:
+        if filename.endswith(".whl"):
+            return str(parse_wheel_filename(filename)[1])
+        return str(parse_sdist_filename(filename)[1])
+    except (InvalidWheelFilename, InvalidSdistFilename):
+        return None
+
+
+def versions_from_page(page: Dict[str, Any]) -> List[str]:
+    """Versions listed on a project page, in first-seen order."""
+    if "versions" in page:
+        return list(page["versions"])
+    seen = (version_from_filename(f["filename"]) for f in page.get("files", []))
+    return list(dict.fromkeys(v for v in seen if v))
 
 
 def get_pypi_releases(package_name: str) -> List[str]:
     """
-    Return list of available versions on PyPI for a package.
+    Return list of available versions on the index for a package.
     """
-    url = PYPI_URL.format(name=package_name)
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-    return list(data.get("releases", {}).keys())
+    return versions_from_page(get_project_page(package_name))
+
+
+def _metadata_available(entry: Dict[str, Any]) -> bool:
+    # PEP 658/714: absent means "unknown", which many mirrors still serve
+    flag = entry.get("core-metadata", entry.get("data-dist-info-metadata"))
+    return flag is None or bool(flag)
+
+
+def _fetch_immutable_text(url: str) -> Optional[str]:
+    """GET a file that never changes once published, cached forever on disk."""
+    path = cache_dir("metadata") / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.txt"
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    if _OFFLINE:
+        raise PyPIUnavailableError(f"offline mode: no cached metadata for {url}")
+    try:
+        resp = _http_get(url, {})
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+    except requests.RequestException as exc:
+        raise PyPIUnavailableError(f"could not fetch {url}: {exc}") from exc
+    text = resp.text
+    write_text(path, text)
+    return text
+
+
+def _legacy_requires_dist(package_name: str, version: str) -> Optional[str]:
+    """Synthesize METADATA from PyPI's per-release JSON (pypi.org only)."""
+    if get_index_url() != DEFAULT_INDEX_URL:
+        return None
+    url = f"https://pypi.org/pypi/{canonicalize_name(package_name)}/{version}/json"
+    text = _fetch_immutable_text(url)
+    if text is None:
+        return None
+    info = json.loads(text).get("info", {})
+    lines = [f"Name: {info.get('name', package_name)}", f"Version: {version}"]
+    if info.get("requires_python"):
+        lines.append(f"Requires-Python: {info['requires_python']}")
+    lines += [f"Requires-Dist: {req}" for req in info.get("requires_dist") or []]
+    return "\n".join(lines) + "\n"
+
+
+def get_core_metadata(package_name: str, version: str) -> Optional[str]:
+    """
+    Return the METADATA text of a release without downloading a wheel.
+
+    Uses the PEP 658 ``<wheel-url>.metadata`` files; on indexes without them
+    falls back to PyPI's per-release JSON. Returns None when neither is
+    available (e.g. sdist-only releases on a plain mirror).
+    """
+    page = get_project_page(package_name)
+    wheels = [
+        f for f in page.get("files", [])
+        if f["filename"].endswith(".whl") and version_from_filename(f["filename"]) == version
+    ]
+    for entry in wheels:
+        if not _metadata_available(entry):
+            continue
+        text = _fetch_immutable_text(entry["url"] + ".metadata")
+        if text is not None:
+            return text
+        break  # same metadata for every wheel of a release; don't probe them all
+    return _legacy_requires_dist(package_name, version)
+
+
+def get_pypi_releases_many(
+    package_names: Iterable[str],
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, List[str]]:
+    """
+    Return available versions for several packages at once.
+
+    Lookups run concurrently (bounded by ``max_workers``) over the pooled
+    session, so connections and TLS sessions are reused between projects.
+
+    Returns
+    -------
+    dict : {package_name: [versions]} in the order the names were given.
+    """
+    names = list(dict.fromkeys(package_names))
+    if len(names) <= 1:
+        return {name: get_pypi_releases(name) for name in names}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+        return dict(zip(names, pool.map(get_pypi_releases, names)))
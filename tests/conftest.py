@@ -0,0 +1,47 @@
+import hashlib
+import zipfile
+
+import pytest
+
+
+def _make_wheel(directory, name, version, files=None, tag="py3-none-any"):
+    """
+    Build a minimal wheel in ``directory``.
+
+    ``files`` maps archive paths to their contents (str or bytes); by
+    default the wheel holds an empty ``{name}/__init__.py``.
+    """
+    dist = name.replace("-", "_")
+    path = directory / f"{dist}-{version}-{tag}.whl"
+    info = f"{dist}-{version}.dist-info"
+    with zipfile.ZipFile(path, "w") as zf:
+        for member, content in (files or {f"{name}/__init__.py": ""}).items():
+            zf.writestr(member, content)
+        zf.writestr(f"{info}/METADATA", f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+        zf.writestr(f"{info}/WHEEL", f"Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: {tag}\n")
+        zf.writestr(f"{info}/RECORD", "")
+    return path
+
+
+def _plan_entry(path, sha256=True):
+    """
+    A plan_downloads() entry for a local file.
+
+    ``sha256`` is the published digest: True (default) publishes the
+    file's real digest, None publishes none.
+    """
+    name, version = path.name.split("-")[:2]
+    if sha256 is True:
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+    return {"name": name, "version": version, "url": path.as_uri(),
+            "filename": path.name, "sha256": sha256}
+
+
+@pytest.fixture
+def make_wheel():
+    return _make_wheel
+
+
+@pytest.fixture
+def plan_entry():
+    return _plan_entry
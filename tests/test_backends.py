@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+
+from missionimpossible.core import backends
+
+PIP_LOG = """\
+2024-05-01T10:00:00,000 Using pip 24.0 from /venv/lib/python3.11/site-packages/pip (python 3.11)
+2024-05-01T10:00:00,500 Collecting torch==2.1.0
+2024-05-01T10:00:02,000   Downloading torch-2.1.0-cp311-cp311-manylinux1_x86_64.whl (670.2 MB)
+2024-05-01T10:00:32,000 Collecting legacy==1.0
+2024-05-01T10:00:33,000   Downloading legacy-1.0.tar.gz (10 kB)
+2024-05-01T10:00:33,250   Preparing metadata (setup.py): started
+2024-05-01T10:00:35,250 Building wheels for collected packages: legacy
+2024-05-01T10:00:38,250 Installing collected packages: legacy, torch
+
+2024-05-01T10:00:50,250 Successfully installed legacy-1.0 torch-2.1.0
+2024-05-01T10:00:50,300 Removed build tracker: '/tmp/pip-build-tracker'
+"""
+
+UV_OUTPUT = """\
+Resolved 12 packages in 1.20s
+Prepared 3 packages in 1m 05s
+Uninstalled 1 package in 15ms
+Installed 12 packages in 230ms
+ + torch==2.1.0
+"""
+
+
+def test_pip_log_phases():
+    phases = backends.parse_pip_log(PIP_LOG)
+    assert phases == {
+        "resolve": pytest.approx(0.5 + 1.5 + 1.0),
+        "download": pytest.approx(30.0 + 0.25),
+        "build": pytest.approx(5.0),
+        "install": pytest.approx(12.0),
+    }
+
+
+def test_uv_summary_phases():
+    phases = backends.parse_uv_output(UV_OUTPUT)
+    assert phases == {
+        "resolve": pytest.approx(1.2),
+        "download": pytest.approx(65.0),
+        "build": None,
+        "install": pytest.approx(0.245),
+    }
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.delenv("MISSIONIMPOSSIBLE_INSTALLER", raising=False)
+    monkeypatch.setattr(backends.shutil, "which", lambda name: None)
+    assert backends.get_backend().name == "pip"
+    with pytest.raises(RuntimeError):
+        backends.get_backend("uv")
+
+    monkeypatch.setattr(backends.shutil, "which", lambda name: f"/usr/bin/{name}")
+    assert backends.get_backend().name == "uv"
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_INSTALLER", "pip")
+    assert backends.get_backend().name == "pip"
+    assert backends.get_backend("uv").command("/venv/bin/python", ["six"]) == [
+        "/usr/bin/uv", "pip", "install", "--python", "/venv/bin/python", "six"]
+
+
+def test_wheelhouse_args_per_backend(tmp_path, monkeypatch):
+    store = tmp_path / "store"
+    stored = store / "sha256" / "ab" / ("ab" * 32) / "six-1.16.0-py2.py3-none-any.whl"
+    stored.parent.mkdir(parents=True)
+    stored.write_bytes(b"wheel")
+    monkeypatch.setattr(backends.shutil, "which", lambda name: f"/usr/bin/{name}")
+    pip, uv = backends.get_backend("pip"), backends.get_backend("uv")
+
+    with pip.wheelhouse_args(None) as args:
+        assert args == []
+
+    # pip reads an HTML page of file:// links
+    with pip.wheelhouse_args(str(store)) as args:
+        cmd = pip.command("/venv/bin/python", ["six"], args)
+        assert cmd[:6] == ["/venv/bin/python", "-m", "pip", "install", "--no-index", "--find-links"]
+        page = Path(cmd[6])
+        assert page.suffix == ".html"
+        assert stored.resolve().as_uri() in page.read_text(encoding="utf-8")
+    assert not page.exists()
+
+    # uv only takes directories: a flat one linking the stored files
+    with uv.wheelhouse_args(str(store)) as args:
+        cmd = uv.command("/venv/bin/python", ["six"], args)
+        assert cmd[:7] == ["/usr/bin/uv", "pip", "install", "--python", "/venv/bin/python",
+                           "--no-index", "--find-links"]
+        flat = Path(cmd[7])
+        assert flat.is_dir()
+        assert (flat / stored.name).read_bytes() == b"wheel"
+        assert cmd[8:] == ["six"]
+    assert not flat.exists()
+
+
+def test_incomplete_backend_is_rejected(monkeypatch):
+    class NoCommand(backends.InstallerBackend):
+        name = "nocommand"
+
+        @classmethod
+        def available(cls):
+            return True
+
+    monkeypatch.setattr(backends, "BACKENDS", dict(backends.BACKENDS))
+    with pytest.raises(TypeError, match="command"):
+        backends.register_backend(NoCommand)
+    with pytest.raises(TypeError):
+        NoCommand()
+    assert "nocommand" not in backends.BACKENDS
@@ -0,0 +1,122 @@
+import random
+import sys
+
+import pytest
+
+from packaging.version import Version
+
+from missionimpossible.resolvers.compatibility import CompatibilityIndex, build_pin, load_index
+from missionimpossible.resolvers.context import ResolutionContext
+from missionimpossible.resolvers.dependency_solver import ResolutionImpossible
+from missionimpossible.resolvers.framework_resolver import select_framework_version
+
+BUILD_COLUMNS = ["framework", "version", "build", "cuda", "cudnn", "python_min", "python_max"]
+
+
+def _data(builds, drivers=(), arches=()):
+    return {
+        "schema": 1,
+        "builds": {"columns": BUILD_COLUMNS, "rows": list(builds)},
+        "drivers": {"columns": ["cuda", "min_driver"], "rows": list(drivers)},
+        "architectures": {"columns": ["compute_capability", "min_cuda", "max_cuda"], "rows": list(arches)},
+    }
+
+
+def test_cuda_versions_compare_numerically():
+    index = CompatibilityIndex(_data([
+        ["torch", "2.1.0", "cu121", "12.1", "8.9", "3.8", "3.11"],
+        ["torch", "2.9.0", "cu1210", "12.10", "9.9", "3.8", "3.11"],
+    ]))
+    # "12.10" is newer than "12.1", not a prefix match of it
+    assert build_pin(index.newest_build("torch", "3.10", "12.1")) == "2.1.0+cu121"
+    assert build_pin(index.newest_build("torch", "3.10", "12.10")) == "2.9.0+cu1210"
+    assert index.newest_build("torch", "3.10", "11.8") is None
+
+
+def test_driver_python_and_architecture_limits():
+    index = CompatibilityIndex(_data(
+        [
+            ["torch", "1.13.1", "cu117", "11.7", "8.5", "3.7", "3.10"],
+            ["torch", "2.1.0", "cu118", "11.8", "8.7", "3.8", "3.11"],
+            ["torch", "2.1.0", "cu121", "12.1", "8.9", "3.8", "3.11"],
+            ["torch", "2.5.0", "cu124", "12.4", "9.1", "3.9", "3.12"],
+        ],
+        drivers=[["11.7", "515.43.04"], ["11.8", "520.61.05"], ["12.1", "530.30.02"], ["12.4", "550.54.14"]],
+        arches=[["1.0", None, "11.8"], ["5.0", None, None], ["9.0", "11.8", None]],
+    ))
+    assert index.max_cuda_for_driver("535.104.05") == Version("12.1")
+    assert index.max_cuda_for_driver("470.0") is None
+    assert build_pin(index.newest_build("torch", "3.11", driver_version="535.104.05")) == "2.1.0+cu121"
+    assert build_pin(index.newest_build("torch", "3.12", driver_version="560.1")) == "2.5.0+cu124"
+    assert index.newest_build("torch", "3.12", driver_version="535.104.05") is None
+    # Kepler (3.7) cannot use toolkits newer than 11.8
+    assert build_pin(index.newest_build("torch", "3.10", "12.4", compute_capability="3.7")) == "2.1.0+cu118"
+    assert build_pin(index.newest_build("torch", "3.10", "12.4", compute_capability="9.0")) == "2.5.0+cu124"
+    assert index.newest_release("torch", "3.7") == "1.13.1"
+    assert index.newest_release("torch", "3.12") == "2.5.0"
+    assert index.releases("torch") == ["1.13.1", "2.1.0", "2.5.0"]
+
+
+def test_range_lookup_matches_brute_force_on_large_matrix():
+    rng = random.Random(7)
+    rows = []
+    for _ in range(3000):
+        cuda = f"{rng.randint(10, 13)}.{rng.randint(0, 12)}"
+        low = rng.randint(7, 11)
+        rows.append(["torch", f"{rng.randint(1, 3)}.{rng.randint(0, 20)}.{rng.randint(0, 3)}",
+                     "cu" + cuda.replace(".", ""), cuda, "9.0", f"3.{low}", f"3.{low + rng.randint(0, 3)}"])
+    index = CompatibilityIndex(_data(rows))
+    parsed = [(Version(r[5]), Version(r[6]), Version(r[3]), Version(r[1])) for r in rows]
+
+    for _ in range(200):
+        python = f"3.{rng.randint(7, 14)}"
+        cuda = f"{rng.randint(10, 13)}.{rng.randint(0, 12)}"
+        py, limit = Version(python), Version(cuda)
+        expected = max(
+            ((release, build_cuda) for low, high, build_cuda, release in parsed
+             if low <= py <= high and build_cuda <= limit),
+            default=None,
+        )
+        found = index.newest_build("torch", python, cuda)
+        assert (None if found is None else (Version(found["version"]), Version(found["cuda"]))) == expected
+
+
+def test_bundled_dataset_loads_once():
+    index = load_index()
+    assert index is load_index()
+    assert index.dataset
+    assert index.yolo_torch("8") == "2.1.0"
+    assert "2.1.0" in index.releases("torch")
+    assert index.max_cuda_for_driver("535.104.05") == Version("12.2")
+
+
+def test_no_gpu_build_for_this_python_is_reported():
+    gpu = {"cuda_version": "12.2", "driver_version": "535.104.05", "compute_capability": "8.6"}
+    assert select_framework_version("tensorflow", gpu, python_version="3.11") == "2.15.0"
+    # every TensorFlow with Python 3.12 wheels needs CUDA >= 12.3
+    with pytest.raises(ResolutionImpossible) as excinfo:
+        select_framework_version("tensorflow", gpu, python_version="3.12")
+    message = str(excinfo.value)
+    assert "Python 3.12" in message
+    assert "CUDA <= 12.2  (required by NVIDIA driver 535.104.05)" in message
+
+
+@pytest.mark.parametrize("action", ["prefetch", "install", "footprint"])
+def test_cli_reports_no_gpu_build_for_every_action(action, tmp_path, monkeypatch, capsys):
+    from missionimpossible import cli
+    from missionimpossible.core import wheelhouse
+
+    # CUDA 11.0 / driver 450.80 predates every bundled PyTorch GPU build
+    context = ResolutionContext(
+        diagnostics={},
+        gpu_info={"cuda_version": "11.0", "driver_version": "450.80.02", "compute_capability": "7.5"},
+        releases={"ultralytics": ["8.3.0"]},
+    )
+    monkeypatch.setattr(cli, "_daemon_context", lambda args: context)
+    monkeypatch.setattr(wheelhouse, "prefetch", lambda *a, **k: pytest.fail("prefetched"))
+    monkeypatch.setattr(sys, "argv", ["missionimpossible", action, "--framework", "pytorch",
+                                      "--no-cache", "--wheelhouse", str(tmp_path)])
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main()
+    assert excinfo.value.code == 1
+    assert capsys.readouterr().err.startswith("[MissionImPossible] ")
@@ -0,0 +1,45 @@
+from missionimpossible.core import detector
+from missionimpossible.resolvers import context as context_module
+from missionimpossible.resolvers.context import ResolutionContext
+from missionimpossible.resolvers.stack_resolver import resolve_cnn_nlp_stack
+
+GPU = {"cuda_version": "12.2", "compute_capability": "8.6", "torch_gpu_visible": True}
+
+
+def _counting_probe(calls):
+    def probe(import_frameworks=False, partial=None):
+        calls.append(import_frameworks)
+        return dict(GPU)
+    return probe
+
+
+def test_gpu_probe_runs_once_per_resolution(monkeypatch):
+    calls = []
+    monkeypatch.setattr(detector, "detect_gpu_status", _counting_probe(calls))
+    monkeypatch.setattr(context_module, "detect_gpu_status", _counting_probe(calls))
+    ctx = ResolutionContext(
+        presets={"research": {"nltk": "3.8.1"}},
+        releases={"ultralytics": ["8.3.0", "11.0.0rc1"]},
+    )
+
+    assert ctx.diagnostics()["gpu"]["status"] == "ok"
+    stack = resolve_cnn_nlp_stack(use_case="research", framework="auto", context=ctx)
+
+    assert len(calls) == 1
+    assert stack["torch"] == "2.1.0" and stack["nltk"] == "3.8.1"
+    assert stack["ultralytics"] == "ultralytics>=8.3.0"
+
+
+def test_injected_gpu_info_is_reported_by_diagnostics(monkeypatch):
+    def fail(**_):
+        raise AssertionError("GPU probed despite injected state")
+    monkeypatch.setattr(detector, "detect_gpu_status", fail)
+    monkeypatch.setattr(context_module, "detect_gpu_status", fail)
+    ctx = ResolutionContext(gpu_info=dict(GPU))
+
+    assert ctx.diagnostics()["gpu"]["cuda_version"] == "12.2"
+    assert ctx.gpu_info() is ctx.gpu_info()
+    # presets are handed out as copies
+    ctx = ResolutionContext(presets={"p": {"a": "1"}})
+    ctx.preset("p")["a"] = "2"
+    assert ctx.preset("p") == {"a": "1"}
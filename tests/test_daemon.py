@@ -0,0 +1,104 @@
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from missionimpossible import cli
+from missionimpossible.core import daemon as daemon_mod
+from missionimpossible.core.daemon import DetectionDaemon, EnvironmentWatcher, query_daemon, socket_path
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.02)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    passes = []
+
+    def detect():
+        passes.append(sorted(p.name for p in site.iterdir()))
+        return {"pip": {"status": "ok", "installed": passes[-1]}}
+
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_DAEMON_SOCKET", str(path))
+    server = DetectionDaemon(
+        path, detect=detect, watcher=EnvironmentWatcher([str(site)]),
+        poll_interval=0.1, settle=0.05,
+    )
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, site, passes
+    server.shutdown()
+    thread.join(5)
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_sees_new_distributions(tmp_path, monkeypatch, use_inotify):
+    monkeypatch.setattr(daemon_mod, "DEV_DIR", tmp_path / "dev")
+    watcher = EnvironmentWatcher([str(tmp_path)], use_inotify=use_inotify)
+    try:
+        assert not watcher.wait(0.05)
+        if watcher.mode == "inotify":
+            (tmp_path / "notes.txt").write_text("unrelated")
+            assert not watcher.wait(0.05)
+        (tmp_path / "demo-1.0.dist-info").mkdir()
+        assert watcher.wait(0.3)
+        assert not watcher.wait(0.05)
+    finally:
+        watcher.close()
+
+
+def test_daemon_recomputes_only_on_change(running_daemon):
+    server, site, passes = running_daemon
+    first = query_daemon()
+    assert first["generation"] == 1
+    assert first["result"] == {"pip": {"status": "ok", "installed": []}}
+    for _ in range(20):
+        assert query_daemon()["generation"] == 1
+    assert len(passes) == 1
+
+    (site / "demo-1.0.dist-info").mkdir()
+    fresh = _wait_for(lambda: (query_daemon() or {}).get("generation", 0) > 1 and query_daemon())
+    assert fresh["result"]["pip"]["installed"] == ["demo-1.0.dist-info"]
+    assert query_daemon("status")["watch"] in ("inotify", "poll")
+    assert query_daemon("bogus") is None
+
+
+def test_cli_detect_uses_running_daemon(running_daemon, monkeypatch, capsys):
+    def local_detect(**kwargs):
+        raise AssertionError("detected in-process although the daemon is running")
+
+    monkeypatch.setattr("missionimpossible.detect_all_conflicts", local_detect, raising=False)
+    monkeypatch.setattr(sys, "argv", ["missionimpossible", "detect"])
+    cli.main()
+    assert "'installed': []" in capsys.readouterr().out
+
+    query_daemon("stop")
+    _wait_for(lambda: not running_daemon[0].path.exists())
+    assert query_daemon() is None
+
+
+def test_socket_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("MISSIONIMPOSSIBLE_DAEMON_SOCKET", raising=False)
+    library = sys.path[1:]
+    monkeypatch.setattr(sys, "path", ["/srv/job-a"] + library)
+    job_a = socket_path()
+    monkeypatch.setattr(sys, "path", ["/home/user/job-b"] + library)
+    assert socket_path() == job_a
+    monkeypatch.setattr(sys, "path", ["/srv/job-a"] + library + [str(tmp_path / "extra")])
+    assert socket_path() != job_a
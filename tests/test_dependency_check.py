@@ -0,0 +1,56 @@
+from missionimpossible.utils import dependency_check, metadata
+
+
+def _make_dist(root, name, version, requires=()):
+    info = root / f"{name}-{version}.dist-info"
+    info.mkdir()
+    lines = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+    lines += [f"Requires-Dist: {r}" for r in requires]
+    (info / "METADATA").write_text("\n".join(lines) + "\n\n")
+    (info / "RECORD").write_text(f"{name}/__init__.py,,\n")
+    return info
+
+
+def test_reports_version_and_missing_conflicts(tmp_path):
+    _make_dist(tmp_path, "tensorflow", "2.15.0", ["numpy<2.0.0,>=1.23.5", "keras>=2.15"])
+    _make_dist(tmp_path, "numpy", "2.0.0")
+    _make_dist(tmp_path, "torch", "2.1.0", ['pywin32; sys_platform == "nt-never"', "rich; extra == 'dev'"])
+    index = metadata._scan([str(tmp_path)])
+
+    records = dependency_check.check_distribution(index["tensorflow"], index)
+    assert {r["dependency"]: r["installed"] for r in records} == {"numpy": "2.0.0", "keras": None}
+    assert dependency_check.check_distribution(index["torch"], index) == []
+
+    text = dependency_check.format_conflicts(records)
+    assert "tensorflow 2.15.0 has requirement numpy<2.0.0,>=1.23.5, but you have numpy 2.0.0." in text
+    assert "tensorflow 2.15.0 requires keras, which is not installed." in text
+
+
+def test_check_dependencies_is_cached():
+    first = dependency_check.check_dependencies(refresh=True)
+    assert dependency_check.check_dependencies() is first
+
+
+def test_incremental_check_reexamines_only_changes(tmp_path):
+    site, snapshot = tmp_path / "site", tmp_path / "snapshot.json"
+    site.mkdir()
+    _make_dist(site, "tensorflow", "2.15.0", ["numpy<2.0.0,>=1.23.5"])
+    numpy_info = _make_dist(site, "numpy", "1.26.4")
+    _make_dist(site, "nltk", "3.8.1", ["regex>=2021.8.3"])
+    _make_dist(site, "regex", "2024.4.16")
+
+    records, stats = dependency_check.incremental_check(metadata._scan([str(site)]), snapshot)
+    assert records == []
+    assert stats["rechecked"] == ["nltk", "numpy", "regex", "tensorflow"]
+
+    records, stats = dependency_check.incremental_check(metadata._scan([str(site)]), snapshot)
+    assert stats == {"changed": [], "rechecked": []}
+
+    # upgrade numpy: only numpy and its dependent tensorflow are re-checked
+    for f in numpy_info.iterdir():
+        f.unlink()
+    numpy_info.rmdir()
+    _make_dist(site, "numpy", "2.0.0")
+    records, stats = dependency_check.incremental_check(metadata._scan([str(site)]), snapshot)
+    assert stats == {"changed": ["numpy"], "rechecked": ["numpy", "tensorflow"]}
+    assert [(r["package"], r["installed"]) for r in records] == [("tensorflow", "2.0.0")]
@@ -1,6 +1,9 @@
+import time
 import types
 
+from missionimpossible.core import detector
 from missionimpossible.detectors import cnn_detector, nlp_detector, vision_detector, gpu_detector
+from missionimpossible.utils import metadata
 
 
 def test_cnn_detector_runs():
@@ -25,3 +28,65 @@ def test_gpu_detector_runs():
     info = gpu_detector.detect_gpu_status()
     assert isinstance(info, dict)
     assert "cuda_version" in info
+    assert info["probe"] == "static"
+
+
+def test_gpu_detector_reads_framework_build_info(tmp_path, monkeypatch):
+    site = tmp_path / "site-packages"
+    (site / "torch").mkdir(parents=True)
+    (site / "torch" / "version.py").write_text(
+        "__version__ = '2.1.0+cu121'\ncuda: Optional[str] = '12.1'\n"
+    )
+    (site / "torch-2.1.0+cu121.dist-info").mkdir()
+    tf_platform = site / "tensorflow" / "python" / "platform"
+    tf_platform.mkdir(parents=True)
+    (tf_platform / "build_info.py").write_text(
+        "build_info = {'cuda_version': '12.2', 'is_cuda_build': True}\n"
+    )
+    (site / "tensorflow-2.15.0.dist-info").mkdir()
+    index = metadata._scan([str(site)])
+    monkeypatch.setattr(gpu_detector, "installed_distributions", lambda: index)
+
+    assert gpu_detector.torch_cuda_build() == "12.1"
+    assert gpu_detector.tf_cuda_build() == "12.2"
+
+    proc = tmp_path / "proc"
+    (proc / "gpus" / "0000:01:00.0").mkdir(parents=True)
+    (proc / "version").write_text(
+        "NVRM version: NVIDIA UNIX x86_64 Kernel Module  535.104.05  Sat Aug 19 01:15:15 UTC 2023\n"
+    )
+    assert gpu_detector._driver_info(proc) == {"driver_version": "535.104.05", "gpu_count": 1}
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "-1")
+    assert gpu_detector._cuda_visible(1) is False
+
+
+def test_detect_all_conflicts_times_out_slow_probe(monkeypatch):
+    def hanging_gpu_probe(**kwargs):
+        time.sleep(5)
+        return {}
+
+    def broken_nlp_probe():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(detector, "detect_gpu_status", hanging_gpu_probe)
+    monkeypatch.setattr(detector, "detect_nlp_conflicts", broken_nlp_probe)
+    start = time.monotonic()
+    result = detector.detect_all_conflicts(timeouts={"gpu": 0.2})
+    assert time.monotonic() - start < 3
+    assert result["gpu"]["status"] == "timeout"
+    assert result["nlp"] == {"status": "error", "error": "RuntimeError: boom"}
+    assert result["cnn"]["status"] == "ok"
+    assert "pip_conflicts" in result["cnn"]
+
+
+def test_timed_out_gpu_probe_keeps_partial_result(monkeypatch):
+    inventory = {"cuda_driver_version": "12.2", "driver_version": "535.104.05",
+                 "devices": [{"index": 0, "name": "GPU", "memory_total": 1, "compute_capability": "8.6"}]}
+    monkeypatch.setattr(gpu_detector, "gpu_inventory", lambda: inventory)
+    monkeypatch.setattr(gpu_detector, "_framework_visibility_static", lambda visible: time.sleep(5))
+    monkeypatch.setattr(detector, "detect_gpu_status", gpu_detector.detect_gpu_status)
+    result = detector.detect_all_conflicts(timeouts={"gpu": 0.2})
+    assert result["gpu"]["status"] == "timeout" and result["gpu"]["timeout"] == 0.2
+    assert result["gpu"]["driver_version"] == "535.104.05"
+    assert result["gpu"]["compute_capability"] == "8.6"
+    assert "torch_gpu_visible" not in result["gpu"]
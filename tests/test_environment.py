@@ -0,0 +1,59 @@
+from missionimpossible.core.resolver import resolve_universal_stack
+from missionimpossible.resolvers.context import ResolutionContext
+from missionimpossible.utils.environment import dockerfile_layers, render_dockerfile, write_dockerfile
+
+STACK = {
+    "ultralytics": "ultralytics>=8.3.234",
+    "opencv-python": ">=4.9.0",
+    "tensorflow": "2.17.0",
+    "torch": "2.1.0",
+    "nltk": "3.8.1",
+}
+
+
+def test_heavy_packages_get_the_first_layers():
+    assert dockerfile_layers(STACK) == [
+        ("torch", ["torch==2.1.0"]),
+        ("tensorflow", ["tensorflow==2.17.0"]),
+        ("scientific", ["opencv-python>=4.9.0"]),
+        ("application", ["nltk==3.8.1", "ultralytics>=8.3.234"]),
+    ]
+
+
+def test_small_change_keeps_heavy_layers():
+    before = render_dockerfile(STACK)
+    after = render_dockerfile(dict(STACK, nltk="3.9.1"))
+    assert "--mount=type=cache,target=/root/.cache/pip" in before
+    assert "    nltk==3.8.1 'ultralytics>=8.3.234'\n" in before  # quoted for the shell
+    # everything up to the application layer is byte-identical, so cached
+    common = before[:before.index("# application")]
+    assert after.startswith(common) and "torch==2.1.0" in common
+
+
+def test_later_layers_keep_earlier_pins():
+    text = render_dockerfile(STACK)
+    runs = [block.splitlines()[1:] for block in text.split("\n\n# ")[1:]]
+    assert runs[0] == ["RUN --mount=type=cache,target=/root/.cache/pip \\", "    pip install torch==2.1.0"]
+    assert runs[1][1:] == ["    pip install torch==2.1.0 \\", "        tensorflow==2.17.0"]
+    assert runs[3][1:3] == [
+        "    pip install torch==2.1.0 tensorflow==2.17.0 'opencv-python>=4.9.0' \\",
+        "        nltk==3.8.1 'ultralytics>=8.3.234'",
+    ]
+    assert runs[3][3] == "RUN pip check"
+
+
+def test_resolve_does_not_write_a_dockerfile(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    context = ResolutionContext(
+        diagnostics={"gpu": {"status": "unavailable"}},
+        gpu_info={},
+        presets={"research": {"nltk": "3.8.1"}},
+        releases={"ultralytics": ["8.3.0"]},
+    )
+    result = resolve_universal_stack("research", gpu=False, framework="pytorch",
+                                     use_cache=False, context=context)
+    assert "dockerfile" not in result
+    assert list(tmp_path.iterdir()) == []
+
+    path = write_dockerfile(result["preset"], str(tmp_path / "Dockerfile"))
+    assert path.read_text(encoding="utf-8") == render_dockerfile(result["preset"])
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from missionimpossible.core import footprint
+from missionimpossible.resolvers import dependency_solver
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch, make_wheel):
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_CACHE_DIR", str(tmp_path / "cache"))
+    files = {
+        "tensorflow": [make_wheel(tmp_path, "tensorflow", "2.15.0", {"tensorflow/data.bin": os.urandom(60000)})],
+        "tensorflow-cpu": [make_wheel(tmp_path, "tensorflow-cpu", "2.15.0", {"tensorflow-cpu/data.bin": os.urandom(20000)})],
+        "nltk": [make_wheel(tmp_path, "nltk", v, {"nltk/data.bin": b"a" * 50000}) for v in ("3.8.1", "3.9.0", "4.0rc1")],
+    }
+    sdist = tmp_path / "tinysrc-1.0.tar.gz"
+    sdist.write_bytes(b"x" * 1000)
+    files["tinysrc"] = [sdist]
+    pages = {name: {"files": [{"filename": p.name, "url": p.as_uri()} for p in paths]}
+             for name, paths in files.items()}
+    monkeypatch.setattr(dependency_solver, "get_project_page", lambda name: pages[name])
+    return files
+
+
+def test_sizes_and_smaller_equivalents(index):
+    report = footprint.estimate_footprint({"tensorflow": "2.15.0", "nltk": ">=3.8", "tinysrc": "1.0"})
+    by_name = {p["name"]: p for p in report["packages"]}
+
+    assert by_name["nltk"]["version"] == "3.9.0"  # newest final release in range
+    tf = by_name["tensorflow"]
+    assert tf["download"] == index["tensorflow"][0].stat().st_size
+    assert tf["installed"] > 60000 and not tf["estimated"]
+    # sdists cannot be measured without building them
+    assert by_name["tinysrc"]["estimated"] and by_name["tinysrc"]["installed"] == 2500
+    assert report["download"] == sum(p["download"] for p in report["packages"])
+    assert not report["complete"]
+
+    [suggestion] = report["suggestions"]  # tensorflow-cpu is used by the lightweight preset
+    assert suggestion["replacement"] == "tensorflow-cpu" and "lightweight" in suggestion["presets"]
+    assert suggestion["download_saved"] > 39000 and suggestion["installed_saved"] > 39000
+
+
+def test_unknown_release_is_reported(index):
+    report = footprint.estimate_footprint({"nltk": "9.9"}, suggest=False)
+    assert "no file of nltk==9.9" in report["packages"][0]["error"]
+
+
+class _Response:
+    def __init__(self, body, status):
+        self.content, self.status_code = body, status
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def test_range_reader_reads_only_the_central_directory(index, monkeypatch):
+    data = index["tensorflow"][0].read_bytes()
+    requested = []
+
+    class Session:
+        def get(self, url, headers, timeout):
+            start, end = headers["Range"][len("bytes="):].split("-")
+            requested.append(int(end) - int(start) + 1)
+            return _Response(data[int(start):int(end) + 1], 206)
+
+    monkeypatch.setattr(footprint, "get_session", lambda: Session())
+    entry = {"url": "https://files.example/tf.whl", "filename": "tf-1-py3-none-any.whl", "size": len(data)}
+    download, installed = footprint._file_sizes(entry)
+    assert download == len(data) and installed > 60000
+    assert sum(requested) < len(data) // 10
+    # published files never change: the second lookup is served from the cache
+    assert footprint._file_sizes(entry) == (download, installed) and len(requested) < 5
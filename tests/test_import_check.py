@@ -0,0 +1,42 @@
+from missionimpossible.core.installer import check_imports
+
+
+def _dist(site, name, files, top_level=None):
+    info = site / f"{name.replace('-', '_')}-1.0.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n")
+    if top_level is not None:
+        (info / "top_level.txt").write_text(top_level)
+    record = []
+    for path, body in files.items():
+        target = site / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(body)
+        record.append(f"{path},,")
+    record.append(f"{info.name}/METADATA,,")
+    (info / "RECORD").write_text("\n".join(record) + "\n")
+
+
+def test_module_names_crashes_and_failures_in_one_report(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    # module name differs from the distribution name, found via top_level.txt
+    _dist(site, "fake-learn", {"fakesk/__init__.py": "print('noise on stdout')\n"}, "fakesk\n")
+    # no top_level.txt: names come from RECORD
+    _dist(site, "fake-cv", {"fakecv2/__init__.py": "", "fakecv2/data.py": ""})
+    _dist(site, "crashy", {"crashy.py": "import os\nos._exit(3)\n", "crashy_ok.py": ""}, "crashy\ncrashy_ok\n")
+    _dist(site, "broken", {"broken.py": "raise ImportError('missing libGL')\n"})
+    _dist(site, "after-crash", {"aftercrash.py": ""})
+    monkeypatch.setenv("PYTHONPATH", str(site))
+
+    records = check_imports(["fake-learn", "fake-cv", "crashy", "broken", "after-crash", "absent"])
+    by_module = {(r["package"], r["module"]): r for r in records}
+
+    assert by_module[("fake-learn", "fakesk")]["ok"]
+    assert by_module[("fake-cv", "fakecv2")]["ok"]
+    assert "exit code 3" in by_module[("crashy", "crashy")]["error"]
+    assert by_module[("crashy", "crashy_ok")]["ok"]
+    assert "missing libGL" in by_module[("broken", "broken")]["error"]
+    assert by_module[("after-crash", "aftercrash")]["ok"]
+    assert by_module[("absent", None)]["error"] == "distribution not installed"
+    assert len(records) == 7
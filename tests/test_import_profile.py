@@ -0,0 +1,51 @@
+import json
+
+from missionimpossible.core import import_profile
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       149 |        149 |       _json
+import time:       359 |        507 |     json.scanner
+import time:       361 |        868 |   json.decoder
+import time:       416 |        416 |   json.encoder
+import time:       198 |       1481 | json
+import time:        50 |         50 | heavy
+"""
+
+
+def test_parse_importtime_rebuilds_tree():
+    roots = import_profile.parse_importtime(IMPORTTIME.splitlines())
+    assert [r["name"] for r in roots] == ["json", "heavy"]
+    json_node = roots[0]
+    assert json_node["cumulative_us"] == 1481
+    assert [c["name"] for c in json_node["children"]] == ["json.decoder", "json.encoder"]
+    assert json_node["children"][0]["children"][0]["children"][0]["name"] == "_json"
+
+
+def test_profile_imports_sorted_report_and_trace(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    for name, body in {"slowpkg": "import time\ntime.sleep(0.05)\nimport slowpkg_dep\n",
+                       "slowpkg_dep": "", "fastpkg": ""}.items():
+        (site / name).mkdir(parents=True)
+        (site / name / "__init__.py").write_text(body)
+    for dist, modules in {"slow-pkg": "slowpkg\n", "fast-pkg": "fastpkg\n"}.items():
+        info = site / f"{dist.replace('-', '_')}-1.0.dist-info"
+        info.mkdir()
+        (info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {dist}\nVersion: 1.0\n")
+        (info / "top_level.txt").write_text(modules)
+    monkeypatch.setenv("PYTHONPATH", str(site))
+
+    report = import_profile.profile_imports(["fast-pkg", "slow-pkg", "absent"])
+    assert [e["package"] for e in report][0] == "slow-pkg"
+    slow = report[0]
+    assert slow["ok"] and slow["modules"] == ["slowpkg"]
+    assert slow["import_time"] >= 0.05
+    [root] = slow["imports"]
+    assert root["name"] == "slowpkg"
+    assert [c["name"] for c in root["children"]] == ["slowpkg_dep"]
+    assert not report[-1]["ok"]
+
+    trace = json.loads(json.dumps(import_profile.to_chrome_trace(report)))
+    names = {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert {"slow-pkg", "slowpkg", "slowpkg_dep", "fastpkg"} <= names
+    assert "slow-pkg" in import_profile.format_report(report).splitlines()[1]
@@ -0,0 +1,94 @@
+import hashlib
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from missionimpossible.core import backends, lockfile
+from missionimpossible.core.installer import venv_python
+
+
+def _lock(tmp_path, monkeypatch, plans):
+    calls = []
+
+    def plan_downloads(requirements, index_url=None, target=None):
+        calls.append(target)
+        return plans[target["platform"] if target else None]
+
+    monkeypatch.setattr(lockfile, "plan_downloads", plan_downloads)
+    lock = lockfile.lock_stack({"lockpkg": "1.0"}, targets=[lockfile.parse_target("3.10:win_amd64")],
+                               index_url="https://example.invalid/simple")
+    return lock, calls
+
+
+def test_lock_roundtrip_hashes_every_file(tmp_path, monkeypatch, make_wheel, plan_entry):
+    native = make_wheel(tmp_path, "lockpkg", "1.0")
+    foreign = make_wheel(tmp_path, "lockpkg", "1.0", tag="cp310-cp310-win_amd64")
+    lock, calls = _lock(tmp_path, monkeypatch, {None: [plan_entry(native, sha256=None)],
+                                                "win_amd64": [plan_entry(foreign)]})
+
+    assert calls == [None, {"python_version": "3.10", "platform": "win_amd64", "implementation": "cp"}]
+    assert lock["requirements"] == ["lockpkg==1.0"]
+    native_env, foreign_env = lock["environments"]
+    # the mirror published no hash, so the file itself was hashed
+    assert native_env["packages"][0]["sha256"] == hashlib.sha256(native.read_bytes()).hexdigest()
+    assert foreign_env["platform"] == "win_amd64"
+
+    path = lockfile.write_lockfile(lock, str(tmp_path / "stack.lock.json"))
+    assert lockfile.read_lockfile(str(path)) == lock
+    assert lockfile.select_environment(lock) is native_env
+
+
+def test_select_environment_rejects_foreign_lock(tmp_path, monkeypatch, make_wheel, plan_entry):
+    foreign = make_wheel(tmp_path, "lockpkg", "1.0", tag="cp310-cp310-win_amd64")
+    lock, _ = _lock(tmp_path, monkeypatch, {None: [plan_entry(foreign, "0" * 64)],
+                                            "win_amd64": [plan_entry(foreign, "0" * 64)]})
+    with pytest.raises(RuntimeError, match="no environment"):
+        lockfile.select_environment(lock)
+    with pytest.raises(ValueError):
+        lockfile.parse_target("manylinux2014_x86_64")
+
+
+def test_install_lock_checks_hashes(tmp_path, monkeypatch, make_wheel, plan_entry):
+    wheel = make_wheel(tmp_path, "lockpkg", "1.0", {"lockpkg/__init__.py": "VERSION = '1.0'\n"})
+    lock, _ = _lock(tmp_path, monkeypatch, {None: [plan_entry(wheel)], "win_amd64": []})
+    lock["environments"].pop()
+    venv = tmp_path / "env"
+
+    result = lockfile.install_lock(lock, use_venv=True, venv_path=str(venv), backend="pip")
+    assert "--require-hashes" in result["command"] and "--no-deps" in result["command"]
+    out = subprocess.run([venv_python(venv), "-c", "import lockpkg; print(lockpkg.VERSION)"],
+                         capture_output=True, text=True)
+    assert out.stdout.strip() == "1.0", out.stderr
+
+    lock["environments"][0]["packages"][0]["sha256"] = "0" * 64
+    with pytest.raises(RuntimeError, match="Installation failed"):
+        lockfile.install_lock(lock, use_venv=True, venv_path=str(venv), backend="pip")
+
+
+def test_install_lock_uses_backend_wheelhouse_options(tmp_path, monkeypatch, make_wheel, plan_entry):
+    from missionimpossible.core import wheelhouse
+
+    wheel = make_wheel(tmp_path, "lockpkg", "1.0")
+    monkeypatch.setattr(wheelhouse, "plan_downloads", lambda reqs, python_exe=None: [plan_entry(wheel)])
+    wheelhouse.prefetch(["lockpkg==1.0"], root=tmp_path / "store")
+    lock, _ = _lock(tmp_path, monkeypatch, {None: [plan_entry(wheel)], "win_amd64": []})
+    lock["environments"].pop()
+
+    seen = {}
+
+    def execute(self, cmd):
+        flat = Path(cmd[cmd.index("--find-links") + 1])
+        seen["cmd"], seen["files"] = cmd, sorted(p.name for p in flat.iterdir())
+        return 0, backends._empty_phases()
+
+    monkeypatch.setattr(backends.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(backends.UvBackend, "_execute", execute)
+    monkeypatch.setattr(lockfile, "validate_environment", lambda names, python_exe: None)
+    lockfile.install_lock(lock, wheelhouse=str(tmp_path / "store"), backend="uv")
+
+    cmd = seen["cmd"]
+    assert cmd[:3] == ["/usr/bin/uv", "pip", "install"]
+    assert "--no-index" in cmd and "--require-hashes" in cmd
+    # uv gets a directory of the stored files, not pip's HTML page
+    assert seen["files"] == [wheel.name]
@@ -0,0 +1,52 @@
+import os
+import subprocess
+
+from missionimpossible.core import materialize
+
+
+def test_two_venvs_share_store_files(tmp_path, monkeypatch, make_wheel):
+    wheel = make_wheel(tmp_path, "linkpkg", "1.0", {
+        "linkpkg/__init__.py": "def main():\n    print('hello from tool')\n",
+        "linkpkg-1.0.data/purelib/linkpkg_extra.py": "VALUE = 42\n",
+        "linkpkg-1.0.dist-info/entry_points.txt": "[console_scripts]\nlinkpkg-tool = linkpkg:main\n",
+    })
+    stored = tmp_path / "wheelhouse" / "sha256" / "ab" / ("ab" + "0" * 62)
+    stored.mkdir(parents=True)
+    stored_wheel = stored / wheel.name
+    wheel.rename(stored_wheel)
+    monkeypatch.setattr(materialize, "prefetch",
+                        lambda reqs, root=None, plan=None: {"files": [stored_wheel], "downloaded": 0, "evicted": []})
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_STORE", str(tmp_path / "store"))
+
+    first = materialize.materialize(["linkpkg==1.0"], str(tmp_path / "env1"))
+    second = materialize.materialize(["linkpkg==1.0"], str(tmp_path / "env2"))
+    assert second["placed"]["copy"] == 0
+    assert second["placed"]["scripts"] == 1
+
+    python = materialize.venv_python(tmp_path / "env2")
+    out = subprocess.run([python, "-c", "import linkpkg, linkpkg_extra; print(linkpkg_extra.VALUE)"],
+                         capture_output=True, text=True)
+    assert out.stdout.strip() == "42", out.stderr
+
+    site1 = materialize._venv_paths(tmp_path / "env1")["purelib"]
+    site2 = materialize._venv_paths(tmp_path / "env2")["purelib"]
+    # linked into the directory the venv imports from, whatever the host's default scheme
+    out = subprocess.run([python, "-c", "import site; print(site.getsitepackages()[0])"],
+                         capture_output=True, text=True)
+    assert os.path.samefile(out.stdout.strip(), site2)
+    a, b = site1 / "linkpkg" / "__init__.py", site2 / "linkpkg" / "__init__.py"
+    if first["placed"]["hardlink"]:
+        assert os.path.samefile(a, b)
+
+    tool = materialize._venv_paths(tmp_path / "env2")["scripts"] / "linkpkg-tool"
+    assert subprocess.run([python, str(tool)], capture_output=True, text=True).stdout == "hello from tool\n"
+
+
+def test_place_file_never_writes_through_existing_link(tmp_path):
+    src, other = tmp_path / "src", tmp_path / "other"
+    src.write_text("store")
+    other.write_text("new")
+    dst = tmp_path / "dst"
+    materialize.place_file(src, dst)
+    materialize.place_file(other, dst)
+    assert src.read_text() == "store" and dst.read_text() == "new"
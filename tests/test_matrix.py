@@ -0,0 +1,52 @@
+import pytest
+
+from missionimpossible.core import matrix
+from missionimpossible.resolvers.context import ResolutionContext
+
+GPU = {"cuda_version": "12.2", "compute_capability": "8.6", "torch_gpu_visible": False}
+
+
+def test_expand_matrix_grid_list_and_aliases():
+    combos = matrix.expand_matrix([
+        {"preset": ["research", "production"], "gpu": [True, False]},
+        {"use_case": "research", "gpu": True},  # duplicate of the first combination
+        {"use_case": "lightweight", "yolo": "v8"},
+    ])
+    assert len(combos) == 5
+    assert combos[0] == {"use_case": "research", "yolo_family": "latest", "gpu": True, "framework": "auto"}
+    assert combos[-1]["yolo_family"] == "v8"
+    with pytest.raises(ValueError):
+        matrix.expand_matrix({"python": ["3.11"]})
+
+
+def test_matrix_shares_probes_and_lookups(monkeypatch):
+    calls = {"diagnostics": 0, "releases": 0}
+
+    def diagnostics(**kwargs):
+        calls["diagnostics"] += 1
+        return {"gpu": dict(GPU, status="ok")}
+
+    def releases(name):
+        calls["releases"] += 1
+        return ["8.3.0", "11.0.0"]
+
+    from missionimpossible.resolvers import context as context_module
+    monkeypatch.setattr(context_module, "detect_all_conflicts", diagnostics)
+    monkeypatch.setattr(context_module, "get_pypi_releases", releases)
+
+    spec = {"use_case": ["research", "production", "nope"], "yolo_family": ["v8", "latest"],
+            "framework": ["auto", "pytorch"]}
+    lines = list(matrix.resolve_matrix(spec, use_cache=False, context=ResolutionContext()))
+
+    assert len(lines) == 12
+    assert sorted(line["index"] for line in lines) == list(range(12))
+    assert calls == {"diagnostics": 1, "releases": 1}
+    ok = [line for line in lines if line["status"] == "ok"]
+    errors = [line for line in lines if line["status"] == "error"]
+    assert len(ok) == 8 and all(line["params"]["use_case"] == "nope" for line in errors)
+    assert "KeyError" in errors[0]["error"]
+    research_v8 = next(line for line in ok if line["params"]["use_case"] == "research"
+                       and line["params"]["yolo_family"] == "v8"
+                       and line["params"]["framework"] == "pytorch")
+    assert research_v8["result"]["preset"]["ultralytics"] == "ultralytics>=8.0.0,<9.0.0"
+    assert "torch" in research_v8["result"]["preset"]
@@ -0,0 +1,34 @@
+from missionimpossible.utils import metadata
+
+
+def _make_dist(root, dirname, name=None, version=None):
+    info = root / dirname
+    info.mkdir()
+    if name:
+        (info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\n")
+    return info
+
+
+def test_scan_normalizes_names(tmp_path):
+    _make_dist(tmp_path, "scikit_learn-1.4.0.dist-info")
+    _make_dist(tmp_path, "opencv_python-4.9.0.80.dist-info")
+    _make_dist(tmp_path, "legacy-2.0-py3.11.egg-info", "Legacy.Pkg", "2.0")
+    index = metadata._scan([str(tmp_path)])
+    assert index["scikit-learn"]["version"] == "1.4.0"
+    assert index["opencv-python"]["version"] == "4.9.0.80"
+    assert index["legacy-pkg"]["version"] == "2.0"
+
+
+def test_first_path_entry_wins(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    _make_dist(first, "numpy-1.26.4.dist-info")
+    _make_dist(second, "numpy-2.0.0.dist-info")
+    index = metadata._scan([str(first), str(second)])
+    assert index["numpy"]["version"] == "1.26.4"
+
+
+def test_installed_version_lookup():
+    assert metadata.get_installed_version("Packaging") is not None
+    assert metadata.get_installed_version("definitely-not-installed-pkg") is None
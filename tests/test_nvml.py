@@ -0,0 +1,100 @@
+from missionimpossible.detectors import gpu_detector
+from missionimpossible.resolvers.compatibility import CompatibilityIndex, build_pin, load_index
+from missionimpossible.resolvers.framework_resolver import select_framework_version
+from missionimpossible.utils import nvml
+
+
+class FakeNVML:
+    """Stand-in for libnvidia-ml exposing the C entry points nvml.py uses."""
+
+    def __init__(self, devices, driver=b"550.54.15", cuda=12040, init_status=0):
+        self.devices = devices
+        self.driver = driver
+        self.cuda = cuda
+        self.init_status = init_status
+        self.shutdown_calls = 0
+
+    def nvmlInit_v2(self):
+        return self.init_status
+
+    def nvmlShutdown(self):
+        self.shutdown_calls += 1
+        return 0
+
+    def nvmlSystemGetDriverVersion(self, buf, length):
+        buf.value = self.driver
+        return 0
+
+    def nvmlSystemGetCudaDriverVersion_v2(self, ref):
+        ref._obj.value = self.cuda
+        return 0
+
+    def nvmlDeviceGetCount_v2(self, ref):
+        ref._obj.value = len(self.devices)
+        return 0
+
+    def nvmlDeviceGetHandleByIndex_v2(self, index, ref):
+        ref._obj.value = index.value + 1
+        return 0
+
+    def _device(self, handle):
+        return self.devices[handle.value - 1]
+
+    def nvmlDeviceGetName(self, handle, buf, length):
+        buf.value = self._device(handle)[0]
+        return 0
+
+    def nvmlDeviceGetMemoryInfo(self, handle, ref):
+        ref._obj.total = self._device(handle)[1]
+        return 0
+
+    def nvmlDeviceGetCudaComputeCapability(self, handle, major, minor):
+        major._obj.value, minor._obj.value = self._device(handle)[2]
+        return 0
+
+
+def test_gpu_inventory_reads_all_devices():
+    lib = FakeNVML([
+        (b"NVIDIA A100-SXM4-80GB", 80 * 1024**3, (8, 0)),
+        (b"Tesla T4", 16 * 1024**3, (7, 5)),
+    ])
+    inv = nvml.gpu_inventory(lib)
+    assert inv["driver_version"] == "550.54.15"
+    assert inv["cuda_driver_version"] == "12.4"
+    assert [d["name"] for d in inv["devices"]] == ["NVIDIA A100-SXM4-80GB", "Tesla T4"]
+    assert inv["devices"][1]["memory_total"] == 16 * 1024**3
+    assert nvml.lowest_compute_capability(inv["devices"]) == "7.5"
+    assert lib.shutdown_calls == 1
+
+
+def test_gpu_inventory_falls_back_when_unavailable():
+    assert nvml.gpu_inventory(FakeNVML([], init_status=9)) is None
+
+
+def test_gpu_status_uses_nvml_inventory(monkeypatch):
+    inv = nvml.gpu_inventory(FakeNVML([(b"NVIDIA H100", 80 * 1024**3, (9, 0))]))
+    monkeypatch.setattr(gpu_detector, "gpu_inventory", lambda: inv)
+    info = gpu_detector.detect_gpu_status()
+    assert info["cuda_version"] == "12.4"
+    assert info["nvidia_smi_ok"] is None
+    assert info["gpu_count"] == 1
+    assert info["compute_capability"] == "9.0"
+
+
+def test_best_match_skips_builds_that_cannot_target_gpu():
+    columns = ["framework", "version", "build", "cuda", "cudnn", "python_min", "python_max"]
+    index = CompatibilityIndex({
+        "schema": 1,
+        "builds": {"columns": columns, "rows": [
+            ["torch", "2.0.1", "cu117", "11.7", "8.5", "3.8", "3.11"],
+            ["torch", "2.1.0", "cu121", "12.1", "8.9", "3.8", "3.11"],
+        ]},
+        "drivers": {"columns": ["cuda", "min_driver"], "rows": [["11.7", "515.43.04"], ["12.1", "530.30.02"]]},
+        "architectures": {"columns": ["compute_capability", "min_cuda", "max_cuda"],
+                          "rows": [["8.0", "11.0", None], ["9.0", "11.8", None]]},
+    })
+    # Hopper needs CUDA >= 11.8, so the cu117 build is not usable
+    assert build_pin(index.newest_build("torch", "3.10", "12.4", compute_capability="9.0")) == "2.1.0+cu121"
+    assert index.newest_build("torch", "3.10", "11.8", compute_capability="9.0") is None
+    # without a CUDA runtime the plain release is pinned
+    assert select_framework_version("torch", {"compute_capability": "8.6"}) == load_index().newest_release("torch")
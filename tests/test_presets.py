@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from missionimpossible.utils import preset_manager
+from missionimpossible.utils.preset_manager import PresetRegistry
+
+
+def test_bundled_presets_found_recursively():
+    presets = preset_manager.list_presets()
+    assert {"research", "production", "lightweight", "my_thesis"} <= set(presets)
+    assert presets["my_thesis"].parent.name == "custom"
+    assert preset_manager.get_preset("my_thesis")["pandas"] == "2.2.0"
+
+
+def test_env_presets_take_precedence(tmp_path, monkeypatch):
+    (tmp_path / "team" / "vision").mkdir(parents=True)
+    (tmp_path / "team" / "vision" / "override.toml").write_text('[stacks.research]\ntorch = "9.9"\n')
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_PRESETS", str(tmp_path / "team"))
+    assert preset_manager.get_preset("research") == {"torch": "9.9"}
+    monkeypatch.delenv("MISSIONIMPOSSIBLE_PRESETS")
+    assert preset_manager.get_preset("research")["torch"] == "2.1.0"
+
+
+def test_index_invalidated_by_file_and_directory_changes(tmp_path, monkeypatch):
+    parsed = []
+    load = preset_manager._load_toml
+    monkeypatch.setattr(preset_manager, "_load_toml", lambda p: parsed.append(p.name) or load(p))
+    for i in range(50):
+        (tmp_path / f"team{i}.toml").write_text(f'[stacks.team{i}]\nnltk = "3.8.{i}"\n')
+    registry = PresetRegistry(roots=[tmp_path])
+
+    assert registry.lookup("team7")[1] == {"nltk": "3.8.7"}
+    assert len(parsed) == 50
+    registry.lookup("team8")
+    assert len(parsed) == 50  # served from the index
+
+    # edited file (size changes) is re-parsed, alone
+    (tmp_path / "team7.toml").write_text('[stacks.team7]\nnltk = "3.9.0rc1"\n')
+    assert registry.lookup("team7")[1] == {"nltk": "3.9.0rc1"}
+    assert parsed[50:] == ["team7.toml"]
+
+    # new file in a new subdirectory
+    (tmp_path / "custom").mkdir()
+    (tmp_path / "custom" / "thesis.toml").write_text('[stacks.thesis]\ntorch = "2.3.0"\n')
+    assert registry.lookup("thesis")[0] == tmp_path / "custom" / "thesis.toml"
+
+    os.remove(tmp_path / "team3.toml")
+    with pytest.raises(KeyError):
+        registry.lookup("team3")
+
+
+def test_broken_file_does_not_hide_others(tmp_path, capsys):
+    (tmp_path / "bad.toml").write_text("[stacks.bad\n")
+    (tmp_path / "good.toml").write_text('[stacks.good]\nnumpy = "1.26.4"\n')
+    registry = PresetRegistry(roots=[tmp_path])
+    assert registry.lookup("good")[1] == {"numpy": "1.26.4"}
+    assert "skipping preset file" in capsys.readouterr().out
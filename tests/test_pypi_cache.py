@@ -0,0 +1,153 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from missionimpossible.utils import pypi_api
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(pypi_api, "_OFFLINE", False)
+    return tmp_path
+
+
+def test_cache_revalidates_with_etag(cache_root, monkeypatch):
+    calls = []
+
+    def fake_get(url, headers=None):
+        calls.append(dict(headers or {}))
+        if len(calls) == 1:
+            return FakeResponse(data={"versions": ["8.0.0", "8.1.0"], "files": []},
+                                headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        return FakeResponse(status_code=304)
+
+    monkeypatch.setattr(pypi_api, "_http_get", fake_get)
+    assert pypi_api.get_pypi_releases("ultralytics") == ["8.0.0", "8.1.0"]
+    # fresh entry: no network at all
+    assert pypi_api.get_pypi_releases("ultralytics") == ["8.0.0", "8.1.0"]
+    assert len(calls) == 1
+    # expired entry: conditional request, 304 keeps cached data
+    monkeypatch.setattr(pypi_api, "CACHE_TTL", 0)
+    assert pypi_api.get_pypi_releases("ultralytics") == ["8.0.0", "8.1.0"]
+    assert calls[1] == {"Accept": pypi_api._ACCEPT, "If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def test_offline_mode_uses_only_cache(cache_root, monkeypatch):
+    monkeypatch.setattr(pypi_api, "_http_get",
+                        lambda url, headers: FakeResponse(data={"versions": ["1.0"], "files": []}))
+    pypi_api.get_pypi_releases("nltk")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("network used in offline mode")
+
+    monkeypatch.setattr(pypi_api, "_http_get", no_network)
+    pypi_api.set_offline(True)
+    assert pypi_api.get_pypi_releases("nltk") == ["1.0"]
+    with pytest.raises(pypi_api.PyPIUnavailableError):
+        pypi_api.get_pypi_releases("spacy")
+
+
+@pytest.fixture
+def local_index(cache_root, monkeypatch):
+    """Serve /simple/<name>/ from a local HTTP server; first hit per name is a 503."""
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.split("/")[2]
+            hits[name] = hits.get(name, 0) + 1
+            if hits[name] == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            assert pypi_api.SIMPLE_JSON in self.headers["Accept"]
+            page = {
+                "meta": {"api-version": "1.0"},
+                "name": name,
+                "files": [
+                    {"filename": f"{name}-1.0.tar.gz", "url": f"../../files/{name}-1.0.tar.gz",
+                     "hashes": {"sha256": "00"}, "data-dist-info-metadata": False},
+                    {"filename": f"{name}-1.1-py3-none-any.whl", "url": f"/files/{name}-1.1-py3-none-any.whl",
+                     "hashes": {}},
+                ],
+            }
+            body = json.dumps(page).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", pypi_api.SIMPLE_JSON)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(pypi_api, "_INDEX_URL", f"http://127.0.0.1:{server.server_port}/simple")
+    monkeypatch.setattr(pypi_api, "RETRY_BACKOFF", 0)
+    monkeypatch.setattr(pypi_api, "_SESSION", None)
+    yield hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_bulk_fetch_retries_and_reuses_session(local_index):
+    names = ["torch", "nltk", "spacy", "torch"]
+    result = pypi_api.get_pypi_releases_many(names, max_workers=3)
+    assert list(result) == ["torch", "nltk", "spacy"]
+    assert result["spacy"] == ["1.0", "1.1"]
+    files = pypi_api.get_project_page("spacy")["files"]
+    assert files[0] == {"filename": "spacy-1.0.tar.gz", "hashes": {"sha256": "00"},
+                        "data-dist-info-metadata": False,
+                        "url": pypi_api.get_index_url().replace("/simple", "/files/spacy-1.0.tar.gz")}
+    # one failed attempt plus one retry per project
+    assert local_index == {"torch": 2, "nltk": 2, "spacy": 2}
+
+
+def test_html_project_page_fallback():
+    html = (
+        '<html><body>'
+        '<a href="https://mirror/pkgs/torch-2.1.0-cp311-cp311-linux_x86_64.whl#sha256=ab12">'
+        'torch-2.1.0-cp311-cp311-linux_x86_64.whl</a>'
+        '<a href="../../pkgs/torch-2.0.1.tar.gz">torch-2.0.1.tar.gz</a>'
+        '</body></html>'
+    )
+    page = pypi_api._parse_html_page(html, "https://mirror/simple/torch/")
+    assert page["files"][0]["hashes"] == {"sha256": "ab12"}
+    assert page["files"][1]["url"] == "https://mirror/pkgs/torch-2.0.1.tar.gz"
+    assert pypi_api.versions_from_page(page) == ["2.1.0", "2.0.1"]
+
+
+def test_immutable_files_are_cached_and_http_errors_wrapped(cache_root, monkeypatch):
+    responses = {"https://files/ok.json": FakeResponse(200), "https://files/gone.json": FakeResponse(404),
+                 "https://files/broken.json": FakeResponse(503)}
+    responses["https://files/ok.json"].text = '{"info": {}}'
+    monkeypatch.setattr(pypi_api, "_http_get", lambda url, headers: responses[url])
+
+    assert pypi_api._fetch_immutable_text("https://files/ok.json") == '{"info": {}}'
+    assert pypi_api._fetch_immutable_text("https://files/gone.json") is None
+    with pytest.raises(pypi_api.PyPIUnavailableError, match="503"):
+        pypi_api._fetch_immutable_text("https://files/broken.json")
+
+    responses.clear()  # served from the cache from now on
+    assert pypi_api._fetch_immutable_text("https://files/ok.json") == '{"info": {}}'
+    assert not list((cache_root / "metadata").glob(".tmp-*"))
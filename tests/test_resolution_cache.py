@@ -0,0 +1,67 @@
+import pytest
+
+from missionimpossible.core import resolution_cache
+from missionimpossible.resolvers import compatibility
+from missionimpossible.utils import pypi_api
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_CACHE_DIR", str(tmp_path / "cache"))
+    preset = tmp_path / "presets" / "research.toml"
+    preset.parent.mkdir()
+    preset.write_text('[stacks.research]\ntorch = "2.1.0"\n')
+    monkeypatch.setenv("MISSIONIMPOSSIBLE_PRESETS", str(preset.parent))
+    monkeypatch.setattr(resolution_cache, "gpu_fingerprint", lambda: "gpu-a")
+    digests = {"https://index/simple/ultralytics/": "d1"}
+    monkeypatch.setattr(resolution_cache, "page_digest", lambda url: digests[url])
+    return preset, digests
+
+
+def test_hit_until_an_input_changes(isolated, monkeypatch):
+    preset, digests = isolated
+    key = resolution_cache.resolution_key(use_case="research", gpu=True)
+    resolution_cache.store_resolution(key, {"preset": {"torch": "2.1.0"}}, digests)
+    assert resolution_cache.load_resolution(key) == {"preset": {"torch": "2.1.0"}}
+
+    # other arguments, preset contents or GPU state -> different key
+    assert resolution_cache.resolution_key(use_case="research", gpu=False) != key
+    preset.write_text('[stacks.research]\ntorch = "2.3.0"\n')
+    assert resolution_cache.resolution_key(use_case="research", gpu=True) != key
+    preset.write_text('[stacks.research]\ntorch = "2.1.0"\n')
+    monkeypatch.setattr(resolution_cache, "gpu_fingerprint", lambda: "gpu-b")
+    assert resolution_cache.resolution_key(use_case="research", gpu=True) != key
+
+
+def test_index_change_invalidates(isolated):
+    _, digests = isolated
+    key = resolution_cache.resolution_key(use_case="research")
+    resolution_cache.store_resolution(key, {"preset": {}}, digests)
+    digests["https://index/simple/ultralytics/"] = "d2"
+    assert resolution_cache.load_resolution(key) is None
+
+
+def test_index_url_and_offline_mode_are_part_of_the_key(isolated, monkeypatch):
+    _, digests = isolated
+    monkeypatch.setattr(pypi_api, "_INDEX_URL", "https://pypi.org/simple")
+    monkeypatch.setattr(pypi_api, "_OFFLINE", False)
+    key = resolution_cache.resolution_key(use_case="research")
+    resolution_cache.store_resolution(key, {"preset": {"torch": "2.1.0"}}, digests)
+
+    pypi_api.set_index_url("https://mirror.example/simple")
+    mirror_key = resolution_cache.resolution_key(use_case="research")
+    assert mirror_key != key
+    assert resolution_cache.load_resolution(mirror_key) is None
+
+    pypi_api.set_index_url("https://pypi.org/simple")
+    assert resolution_cache.resolution_key(use_case="research") == key
+    pypi_api.set_offline(True)
+    assert resolution_cache.resolution_key(use_case="research") != key
+
+
+def test_compatibility_data_is_part_of_the_key(isolated, monkeypatch, tmp_path):
+    key = resolution_cache.resolution_key(use_case="research")
+    data = tmp_path / "compatibility.json"
+    data.write_bytes(compatibility.DATA_FILE.read_bytes() + b"\n")  # e.g. an updated dataset
+    monkeypatch.setattr(compatibility, "DATA_FILE", data)
+    assert resolution_cache.resolution_key(use_case="research") != key
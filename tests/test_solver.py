@@ -0,0 +1,85 @@
+import pytest
+
+from missionimpossible.resolvers.dependency_solver import (
+    BacktrackingSolver,
+    ResolutionImpossible,
+    solve_stack,
+    spec_to_requirement,
+)
+
+
+class FakeProvider:
+    def __init__(self, index):
+        # {name: {version: [requirement strings]}}
+        self.index = index
+        self.dependency_calls = 0
+
+    def get_versions(self, name):
+        return list(self.index.get(name, {}))
+
+    def get_dependencies(self, name, version):
+        self.dependency_calls += 1
+        return self.index[name][version]
+
+
+INDEX = {
+    "ultralytics": {
+        "8.3.0": ["torch>=2.2", "opencv-python>=4.6"],
+        "8.2.0": ["torch>=1.8", "opencv-python>=4.6"],
+    },
+    "torch": {"2.3.0": ["numpy"], "2.1.0": ["numpy<2"]},
+    "numpy": {"2.0.0": [], "1.26.4": []},
+    "opencv-python": {"4.9.0": ["numpy>=1.21"], "4.10.0": ["numpy>=2"]},
+    "transformers": {
+        "4.36.0": ['tokenizers; extra == "torch"', 'sentencepiece; python_version < "3"'],
+    },
+    "tokenizers": {"0.15.0": []},
+}
+
+
+def test_spec_to_requirement_forms():
+    assert str(spec_to_requirement("torch", "2.1.0")) == "torch==2.1.0"
+    assert str(spec_to_requirement("albumentations", ">=1.4.6")) == "albumentations>=1.4.6"
+    assert str(spec_to_requirement("ultralytics", "ultralytics>=8.3.234")) == "ultralytics>=8.3.234"
+
+
+def test_backtracks_to_consistent_set():
+    provider = FakeProvider(INDEX)
+    pins = solve_stack(
+        [("preset:research", {"torch": "2.1.0", "ultralytics": ">=8.0"}),
+         ("yolo", {"opencv-python": ">=4.9"})],
+        provider=provider,
+    )
+    # ultralytics 8.3.0 needs torch>=2.2 -> falls back to 8.2.0;
+    # torch 2.1.0 needs numpy<2 -> opencv 4.10.0 is rejected
+    assert pins == {
+        "numpy": "1.26.4",
+        "opencv-python": "4.9.0",
+        "torch": "2.1.0",
+        "ultralytics": "8.2.0",
+    }
+
+
+def test_extras_and_markers():
+    pins = solve_stack([("preset", {"transformers": "transformers[torch]==4.36.0"})],
+                       provider=FakeProvider(INDEX))
+    assert pins == {"tokenizers": "0.15.0", "transformers": "4.36.0"}
+
+
+def test_conflicting_layers_are_explained():
+    with pytest.raises(ResolutionImpossible) as info:
+        solve_stack(
+            [("preset:research", {"torch": "2.1.0"}), ("yolo", {"torch": "2.3.0"})],
+            provider=FakeProvider(INDEX),
+        )
+    assert info.value.name == "torch"
+    assert ("torch==2.1.0", "preset:research") in info.value.causes
+    assert ("torch==2.3.0", "yolo") in info.value.causes
+
+
+def test_dependencies_are_memoized():
+    provider = FakeProvider(INDEX)
+    solver = BacktrackingSolver(provider)
+    solver.solve([(spec_to_requirement("ultralytics", ">=8.0"), "root"),
+                  (spec_to_requirement("torch", "2.1.0"), "root")])
+    assert provider.dependency_calls <= 6
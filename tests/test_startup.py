@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import budget (microseconds) for `missionimpossible --help`,
+# interpreter startup (site) excluded.
+HELP_IMPORT_BUDGET_US = 100_000
+HEAVY_MODULES = {"requests", "packaging", "tomllib", "missionimpossible.detectors", "missionimpossible.core"}
+
+
+def _importtime(*args):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    )
+    assert proc.returncode == 0, proc.stderr
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        top_level[name] = int(cumulative)
+    return top_level
+
+
+def test_help_does_not_import_subsystems():
+    imported = _importtime("-m", "missionimpossible.cli", "--help")
+    assert not HEAVY_MODULES & set(imported)
+    ours = sum(us for name, us in imported.items()
+               if name in ("missionimpossible", "argparse"))
+    assert ours < HELP_IMPORT_BUDGET_US
+
+
+def test_package_attributes_load_lazily():
+    imported = _importtime("-c", "import missionimpossible")
+    assert not HEAVY_MODULES & set(imported)
+    import missionimpossible
+    assert callable(missionimpossible.detect_all_conflicts)
+    assert "resolve_universal_stack" in dir(missionimpossible)
@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from missionimpossible.core import wheelhouse
+
+
+def test_prefetch_dedupes_and_evicts(tmp_path, monkeypatch, make_wheel, plan_entry):
+    src, store = tmp_path / "src", tmp_path / "store"
+    src.mkdir()
+    old = make_wheel(src, "oldpkg", "1.0", {"oldpkg/__init__.py": b"x" * 4000})
+    new = make_wheel(src, "newpkg", "2.0", {"newpkg/__init__.py": b"y" * 4000})
+
+    monkeypatch.setattr(wheelhouse, "plan_downloads", lambda reqs, python_exe=None: [plan_entry(old)])
+    first = wheelhouse.prefetch(["oldpkg==1.0"], root=store, max_size=10**9)
+    again = wheelhouse.prefetch(["oldpkg==1.0"], root=store, max_size=10**9)
+    assert first["downloaded"] == 1 and again["downloaded"] == 0
+    assert first["files"] == again["files"]
+    assert first["files"][0].parent.name == plan_entry(old)["sha256"]
+
+    # a limit that only fits one file evicts the one not just prefetched
+    monkeypatch.setattr(wheelhouse, "plan_downloads", lambda reqs, python_exe=None: [plan_entry(new)])
+    result = wheelhouse.prefetch(["newpkg==2.0"], root=store, max_size=new.stat().st_size)
+    assert result["evicted"] == first["files"]
+    assert [p.name for p in wheelhouse.stored_files(store)] == [new.name]
+
+
+def test_prefetch_rejects_hash_mismatch(tmp_path, monkeypatch, make_wheel, plan_entry):
+    wheel = make_wheel(tmp_path, "pkg", "1.0")
+    monkeypatch.setattr(wheelhouse, "plan_downloads",
+                        lambda reqs, python_exe=None: [plan_entry(wheel, "0" * 64)])
+    with pytest.raises(RuntimeError, match="sha256 mismatch"):
+        wheelhouse.prefetch(["pkg==1.0"], root=tmp_path / "store")
+    assert wheelhouse.stored_files(tmp_path / "store") == []
+
+
+def test_find_links_page_resolves_offline(tmp_path, monkeypatch, make_wheel, plan_entry):
+    wheel = make_wheel(tmp_path, "tinypkg", "0.1")
+    monkeypatch.setattr(wheelhouse, "plan_downloads", lambda reqs, python_exe=None: [plan_entry(wheel)])
+    wheelhouse.prefetch(["tinypkg==0.1"], root=tmp_path / "store")
+
+    page = wheelhouse.find_links_page(tmp_path / "store")
+    proc = subprocess.run(
+        [sys.executable, "-m", "pip", "install", "--dry-run", "--ignore-installed",
+         "--quiet", "--report", "-", "--no-index", "--find-links", str(page), "tinypkg==0.1"],
+        capture_output=True, text=True,
+    )
+    page.unlink()
+    assert proc.returncode == 0, proc.stderr
+    [item] = json.loads(proc.stdout)["install"]
+    assert item["metadata"]["name"] == "tinypkg"
+
+
+def test_parse_size():
+    assert wheelhouse.parse_size("50G") == 50 << 30
+    assert wheelhouse.parse_size("1.5M") == 3 << 19
+    assert wheelhouse.parse_size("1024") == 1024
+    with pytest.raises(ValueError):
+        wheelhouse.parse_size("lots")